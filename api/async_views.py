@@ -0,0 +1,181 @@
+"""
+Async serving of the read-only public endpoints, for the ASGI entry point.
+
+``AsyncPublicView`` wraps one of the public DRF views and answers plain JSON
+GETs itself: the view's own queryset (with its select/prefetch plan) is
+loaded through the async ORM, serialized with the view's serializer and
+rendered with DRF's JSONRenderer, so responses, ETags and cached bodies
+match the sync view byte for byte. No thread is held while the database or
+cache is awaited, so one ASGI process can keep many slow clients open.
+
+Anything else (pagination, the browsable API, OPTIONS, a missing object,
+...) is handed to the wrapped DRF view through ``sync_to_async``.
+
+These endpoints are public, so no authentication runs on the async path;
+the sync view would reject a malformed token with 401 where this one just
+answers the request.
+
+``urls.py`` routes the public endpoints here when ``ASYNC_PUBLIC_VIEWS`` is
+on. Under WSGI (Passenger) every async view would need an event loop of its
+own, so leave it off there.
+"""
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from django.views import View
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+
+from .cache import (
+    CachedResponseMixin,
+    _cache,
+    acached_validators,
+    aget_model_version,
+    response_cache_key,
+)
+from .mixins import (
+    ConditionalGetMixin,
+    conditional_validators,
+    last_modified_timestamp,
+)
+from .pagination import KeysetCursorPagination
+
+
+def _wants_json(request):
+    fmt = request.GET.get("format")
+    if fmt is not None:
+        return fmt == "json"
+    # browsers ask for the browsable API
+    return "text/html" not in request.headers.get("Accept", "")
+
+
+def _lookup_url_kwarg(view):
+    return view.lookup_url_kwarg or view.lookup_field
+
+
+class AsyncPublicView(View):
+    view_class = None
+
+    http_method_names = ["get", "head", "options"]
+
+    def setup(self, request, *args, **kwargs):
+        super().setup(request, *args, **kwargs)
+        self.renderer = JSONRenderer()
+
+    async def dispatch(self, request, *args, **kwargs):
+        response = None
+        if request.method in ("GET", "HEAD") and _wants_json(request):
+            response = await self.get(request, *args, **kwargs)
+        if response is None:
+            response = await self.fallback(request, *args, **kwargs)
+        return response
+
+    async def get(self, request, *args, **kwargs):
+        """The JSON response, or None when the sync view has to answer."""
+        view = self.drf_view(request, args, kwargs)
+        if self.is_paginated(view, request):
+            return None
+        if isinstance(view, ConditionalGetMixin):
+            etag, last_modified = await self.validators(request, view)
+            response = get_conditional_response(
+                request, etag=etag, last_modified=last_modified
+            )
+            if response is None:
+                response = await self.content(request, view)
+                if response is None:
+                    return None
+            response["ETag"] = etag
+            if last_modified is not None:
+                response["Last-Modified"] = http_date(last_modified)
+            return response
+        return await self.content(request, view)
+
+    async def validators(self, request, view):
+        async def stats():
+            return (
+                await view.get_validator_queryset()
+                .order_by()
+                .aaggregate(**view.get_validator_aggregates())
+            )
+
+        if isinstance(view, CachedResponseMixin):
+
+            async def last_modified():
+                return last_modified_timestamp(await stats())
+
+            return await acached_validators(
+                await self.cache_key(request, view), self.renderer.format, last_modified
+            )
+        return conditional_validators(
+            request.get_full_path(), self.renderer.format, await stats()
+        )
+
+    async def cache_key(self, request, view):
+        versions = [await aget_model_version(m) for m in view.cache_models]
+        return response_cache_key(request.get_full_path(), versions)
+
+    async def content(self, request, view):
+        if not isinstance(view, CachedResponseMixin):
+            return await self.render(view)
+
+        cache = _cache()
+        key = await self.cache_key(request, view)
+        content = await cache.aget(key)
+        if content is not None:
+            return HttpResponse(content, content_type="application/json")
+        response = await self.render(view)
+        if response is not None:
+            await cache.aset(key, response.content, settings.CONTENT_CACHE_TIMEOUT)
+        return response
+
+    async def render(self, view):
+        """The serialized queryset/object, or None to let the sync view answer."""
+        queryset = view.filter_queryset(view.get_queryset())
+        lookup_url_kwarg = _lookup_url_kwarg(view)
+        if lookup_url_kwarg in view.kwargs:
+            instance = await queryset.filter(
+                **{view.lookup_field: view.kwargs[lookup_url_kwarg]}
+            ).afirst()
+            if instance is None:
+                return None
+            data = view.get_serializer(instance).data
+        else:
+            # prefetches run inside the same (threaded) fetch
+            data = view.get_serializer([obj async for obj in queryset], many=True).data
+
+        response = HttpResponse(
+            self.renderer.render(data, self.renderer.media_type),
+            content_type=self.renderer.media_type,
+        )
+        response["Vary"] = "Accept"
+        response["Allow"] = ", ".join(view.allowed_methods)
+        return response
+
+    def drf_view(self, request, args, kwargs):
+        """An instance of the DRF view, set up as its dispatch() would."""
+        view = self.view_class(args=args, kwargs=kwargs, format_kwarg=None)
+        view.request = Request(request)
+        view.request.accepted_renderer = self.renderer
+        view.request.accepted_media_type = self.renderer.media_type
+        return view
+
+    def is_paginated(self, view, request):
+        paginator = view.paginator
+        if paginator is None or _lookup_url_kwarg(view) in view.kwargs:
+            return False
+        if isinstance(paginator, KeysetCursorPagination):
+            return paginator.is_requested(request.GET)
+        return True
+
+    async def fallback(self, request, *args, **kwargs):
+        return await sync_to_async(self.view_class.as_view())(request, *args, **kwargs)
+
+
+def public_view(view_class):
+    """``view_class.as_view()``, async when ASYNC_PUBLIC_VIEWS is on."""
+    if settings.ASYNC_PUBLIC_VIEWS:
+        return AsyncPublicView.as_view(view_class=view_class)
+    return view_class.as_view()
@@ -0,0 +1,224 @@
+"""
+In-process benchmarks of the public, donation and admin APIs.
+
+Each scenario is one request made through the full middleware stack with
+DRF's test client (no network, no server), so timings compare code, not
+deployments. A scenario is measured in two passes:
+
+- ``iterations`` timed requests after ``warmup`` untimed ones, recording
+  wall time and the number of SQL queries of each request;
+- a few more requests under ``tracemalloc`` (too slow to leave on while
+  timing) for peak and retained Python memory.
+
+Scenarios that write (converting due interests) run every request inside a
+transaction that is rolled back, so each iteration sees the same rows.
+Results are plain JSON; ``compare`` lines two of them up.
+"""
+
+import platform
+import statistics
+import subprocess
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+import django
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Count
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from core.models import BloodDonation, User
+from core.seeding import MODELS
+
+ADMIN_EMAIL = "benchmark-admin@example.com"
+MEMORY_ITERATIONS = 3
+# (result key, "time" or "count") compared by ``compare``
+COMPARED = [
+    ("p50_ms", "time"),
+    ("p95_ms", "time"),
+    ("queries", "count"),
+    ("peak_kib", "time"),
+]
+
+
+class Scenario:
+    def __init__(self, name, url_name, method="get", user=None, data=None):
+        self.name = name
+        self.url_name = url_name
+        self.method = method
+        # None (anonymous), "donor" or "admin"
+        self.user = user
+        self.data = data
+        self.writes = method != "get"
+
+
+SCENARIOS = [
+    Scenario("blog-list", "blog-list"),
+    Scenario("events-upcoming", "events-upcoming"),
+    Scenario("my-donations", "my-donations", user="donor"),
+    Scenario("admin-blood-requests", "admin-blood-request-list-create", user="admin"),
+    Scenario(
+        "admin-donation-interests", "admin-donation-interest-list-create", user="admin"
+    ),
+    Scenario("admin-comments", "admin-comment-list-create", user="admin"),
+    Scenario("admin-donations", "admin-donation-list-create", user="admin"),
+    Scenario(
+        "convert-due-interests", "convert-due-interests", method="post", user="admin"
+    ),
+]
+SCENARIO_NAMES = [scenario.name for scenario in SCENARIOS]
+
+
+def percentile(values, p):
+    """Linear-interpolated percentile of a non-empty list."""
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * p / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def benchmark_users():
+    """(donor, admin): the donor with the longest history and a staff user."""
+    top = (
+        BloodDonation.objects.values("user")
+        .annotate(n=Count("id"))
+        .order_by("-n", "user")
+        .first()
+    )
+    donor = User.objects.get(pk=top["user"]) if top else None
+    admin = User.objects.filter(email=ADMIN_EMAIL).first()
+    if admin is None:
+        admin = User.objects.create_superuser(email=ADMIN_EMAIL)
+    return donor, admin
+
+
+@contextmanager
+def _rolled_back(enabled):
+    if not enabled:
+        yield
+        return
+    with transaction.atomic():
+        yield
+        transaction.set_rollback(True)
+
+
+def _request(client, scenario, url):
+    return getattr(client, scenario.method)(url, scenario.data, format="json")
+
+
+def measure(client, scenario, iterations=20, warmup=2):
+    url = reverse(scenario.url_name)
+    for _ in range(warmup):
+        with _rolled_back(scenario.writes):
+            _request(client, scenario, url)
+
+    times, queries, statuses = [], [], set()
+    for _ in range(iterations):
+        with _rolled_back(scenario.writes), CaptureQueriesContext(connection) as ctx:
+            start = time.perf_counter()
+            response = _request(client, scenario, url)
+            times.append(time.perf_counter() - start)
+        queries.append(len(ctx.captured_queries))
+        statuses.add(response.status_code)
+
+    peaks, retained = [], []
+    for _ in range(min(MEMORY_ITERATIONS, iterations)):
+        with _rolled_back(scenario.writes):
+            tracemalloc.start()
+            try:
+                before = tracemalloc.get_traced_memory()[0]
+                response = _request(client, scenario, url)
+                current, peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+        peaks.append(peak - before)
+        retained.append(current - before)
+
+    ms = [t * 1000 for t in times]
+    return {
+        "iterations": iterations,
+        "status": sorted(statuses),
+        "p50_ms": round(percentile(ms, 50), 3),
+        "p95_ms": round(percentile(ms, 95), 3),
+        "mean_ms": round(statistics.fmean(ms), 3),
+        "min_ms": round(min(ms), 3),
+        "max_ms": round(max(ms), 3),
+        "queries": max(queries),
+        "queries_min": min(queries),
+        "peak_kib": round(max(peaks) / 1024, 1) if peaks else None,
+        "retained_kib": round(max(retained) / 1024, 1) if retained else None,
+        "response_bytes": len(response.content),
+    }
+
+
+def run(names=None, iterations=20, warmup=2, progress=None):
+    """Measure the named scenarios (all by default); returns {name: result}."""
+    donor, admin = benchmark_users()
+    clients = {None: APIClient(), "admin": APIClient(), "donor": APIClient()}
+    clients["admin"].force_authenticate(admin)
+    clients["donor"].force_authenticate(donor)
+
+    results = {}
+    with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"]):
+        for scenario in SCENARIOS:
+            if names and scenario.name not in names:
+                continue
+            if scenario.user == "donor" and donor is None:
+                continue
+            results[scenario.name] = measure(
+                clients[scenario.user], scenario, iterations, warmup
+            )
+            if progress:
+                progress(scenario.name, results[scenario.name])
+    return results
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=settings.BASE_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def metadata(**extra):
+    return {
+        "commit": _git_commit(),
+        "timestamp": timezone.now().isoformat(),
+        "python": platform.python_version(),
+        "django": django.get_version(),
+        "database": connection.vendor,
+        "rows": {table: model.objects.count() for table, model in MODELS.items()},
+        **extra,
+    }
+
+
+def compare(before, after, threshold=10.0):
+    """
+    Rows of (scenario, metric, before, after, change %, regressed) for the
+    scenarios present in both result files. Timings regress when they grow by
+    more than ``threshold`` percent; query counts whenever they grow at all.
+    """
+    rows = []
+    for name, new in after["results"].items():
+        old = before["results"].get(name)
+        if old is None:
+            continue
+        for metric, kind in COMPARED:
+            a, b = old.get(metric), new.get(metric)
+            if a is None or b is None:
+                continue
+            change = (b - a) / a * 100 if a else 0.0
+            regressed = b > a if kind == "count" else change > threshold
+            rows.append((name, metric, a, b, change, regressed))
+    return rows
@@ -0,0 +1,120 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+from django.utils.http import quote_etag
+
+
+def _cache():
+    return caches[settings.CONTENT_CACHE_ALIAS]
+
+
+def _version_key(model):
+    return f"content-version:{model._meta.label_lower}"
+
+
+def get_model_version(model):
+    """Current version counter for ``model``; created on first use."""
+    cache = _cache()
+    key = _version_key(model)
+    version = cache.get(key)
+    if version is None:
+        # seed from the clock so an evicted counter never rewinds onto old entries
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+async def aget_model_version(model):
+    """``get_model_version`` for async views."""
+    cache = _cache()
+    key = _version_key(model)
+    version = await cache.aget(key)
+    if version is None:
+        await cache.aadd(key, time.time_ns(), timeout=None)
+        version = await cache.aget(key)
+    return version
+
+
+def response_cache_key(full_path, versions):
+    return f"content:{full_path}:{'.'.join(str(v) for v in versions)}"
+
+
+def _version_etag(key, format):
+    return quote_etag(
+        hashlib.md5(f"{key}:{format}".encode(), usedforsecurity=False).hexdigest()
+    )
+
+
+def cached_validators(key, format, get_last_modified):
+    """
+    (ETag, Last-Modified timestamp) of the cached response at ``key`` without
+    a query on a hit: the ETag follows the model versions in the key, and
+    ``get_last_modified()`` runs once per key, its result cached alongside.
+    """
+    cache = _cache()
+    stored = cache.get(f"{key}:last-modified")
+    if stored is None:
+        stored = [get_last_modified()]
+        cache.set(f"{key}:last-modified", stored, settings.CONTENT_CACHE_TIMEOUT)
+    return _version_etag(key, format), stored[0]
+
+
+async def acached_validators(key, format, aget_last_modified):
+    """``cached_validators`` for async views."""
+    cache = _cache()
+    stored = await cache.aget(f"{key}:last-modified")
+    if stored is None:
+        stored = [await aget_last_modified()]
+        await cache.aset(f"{key}:last-modified", stored, settings.CONTENT_CACHE_TIMEOUT)
+    return _version_etag(key, format), stored[0]
+
+
+def bump_model_version(model):
+    """Invalidate every cached response that depends on ``model``."""
+    cache = _cache()
+    key = _version_key(model)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), timeout=None)
+
+
+class CachedResponseMixin:
+    """
+    Read-through cache of the rendered JSON body of a GET endpoint.
+
+    The key combines the full request path (query string included) with the
+    version counter of every model in ``cache_models``; saving or deleting any
+    of them bumps its counter (see ``api.signals``) so stale entries are simply
+    never read again and age out after ``CONTENT_CACHE_TIMEOUT``.
+    ``QuerySet.update()``/``bulk_create()`` skip those signals, so call
+    ``bump_model_version`` yourself after using them on a cached model.
+    """
+
+    cache_models = ()
+
+    def _response_cache_key(self, request):
+        versions = [get_model_version(m) for m in self.cache_models]
+        return response_cache_key(request.get_full_path(), versions)
+
+    def get(self, request, *args, **kwargs):
+        if request.accepted_renderer.format != "json":
+            return super().get(request, *args, **kwargs)
+
+        cache = _cache()
+        key = self._response_cache_key(request)
+        content = cache.get(key)
+        if content is not None:
+            return HttpResponse(content, content_type="application/json")
+
+        response = super().get(request, *args, **kwargs)
+        if response.status_code == 200:
+
+            def store(rendered):
+                cache.set(key, rendered.content, settings.CONTENT_CACHE_TIMEOUT)
+
+            response.add_post_render_callback(store)
+        return response
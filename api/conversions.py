@@ -0,0 +1,130 @@
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Max, Q
+from django.utils import timezone
+
+from core.models import BloodDonation, BloodDonationInterest, User
+from . import matching
+
+INTEREST_FIELDS = (
+    "id",
+    "user_id",
+    "blood_group",
+    "user__blood_group",
+    "available_date",
+    "contact_info",
+)
+
+
+def _donation_key(donation):
+    return (
+        donation.user_id,
+        donation.donation_date,
+        donation.contact_info,
+        donation.notes,
+    )
+
+
+def _create_donations(donations):
+    """
+    ``bulk_create`` that always hands back saved rows with their ids.
+
+    MySQL cannot return ids from a multi-row INSERT, so there the new rows are
+    read back (``id`` above the pre-insert maximum) and matched to the
+    unsaved objects by their column values.
+    """
+    if connection.features.can_return_rows_from_bulk_insert:
+        return BloodDonation.objects.bulk_create(donations)
+
+    floor = BloodDonation.objects.aggregate(max_id=Max("id"))["max_id"] or 0
+    BloodDonation.objects.bulk_create(donations)
+    saved = defaultdict(list)
+    for donation in BloodDonation.objects.filter(
+        id__gt=floor, user_id__in={d.user_id for d in donations}
+    ).order_by("id"):
+        saved[_donation_key(donation)].append(donation)
+    return [saved[_donation_key(d)].pop(0) for d in donations]
+
+
+def _lock(queryset):
+    """
+    ``queryset`` as a locking read of the interest rows, so overlapping runs
+    (cron and the admin endpoint) never convert one twice: rows another run
+    holds are skipped where the database can, waited for otherwise. SQLite
+    has no row locks; it lets one writer at a time through instead.
+    """
+    features = connection.features
+    if not features.has_select_for_update:
+        return queryset
+    return queryset.select_for_update(
+        skip_locked=features.has_select_for_update_skip_locked,
+        of=("self",) if features.has_select_for_update_of else (),
+    )
+
+
+def _convert_batch(rows):
+    donations = _create_donations(
+        [
+            BloodDonation(
+                user_id=row["user_id"],
+                blood_group=row["blood_group"] or row["user__blood_group"] or "",
+                donation_date=row["available_date"],
+                contact_info=row["contact_info"],
+                notes=f"Auto-converted from donation interest on {row['available_date']}",
+            )
+            for row in rows
+        ]
+    )
+
+    # link back to the interests
+    BloodDonationInterest.objects.bulk_update(
+        [
+            BloodDonationInterest(id=row["id"], donation_id=donation.id)
+            for row, donation in zip(rows, donations)
+        ],
+        ["donation"],
+    )
+
+    # move each user's last_donation_date forward: one UPDATE per distinct date,
+    # oldest first, so a user with several dates ends on the latest
+    users_by_date = defaultdict(set)
+    for row in rows:
+        users_by_date[row["available_date"]].add(row["user_id"])
+    for donation_date in sorted(users_by_date):
+        User.objects.filter(pk__in=users_by_date[donation_date]).filter(
+            Q(last_donation_date__isnull=True) | Q(last_donation_date__lt=donation_date)
+        ).update(last_donation_date=donation_date)
+
+
+def convert_due_interests(today=None, batch_size=None):
+    """
+    Turn every unconverted interest whose ``available_date`` has arrived into a
+    ``BloodDonation``. Works through the due rows in id order, ``batch_size``
+    at a time, each batch locked in its own short transaction. Returns the
+    number of interests converted.
+    """
+    today = today or timezone.now().date()
+    batch_size = batch_size or settings.DONATION_CONVERSION_BATCH_SIZE
+    due = BloodDonationInterest.objects.filter(
+        available_date__lte=today, donation__isnull=True
+    ).order_by("id")
+
+    converted = 0
+    last_id = 0
+    while True:
+        with transaction.atomic():
+            rows = list(
+                _lock(due.filter(id__gt=last_id)).values(*INTEREST_FIELDS)[:batch_size]
+            )
+            if not rows:
+                break
+            _convert_batch(rows)
+        converted += len(rows)
+        last_id = rows[-1]["id"]
+
+    if converted:
+        # bulk writes skip the signals that keep the match index current
+        matching.reset_index()
+    return converted
@@ -0,0 +1,61 @@
+from datetime import timedelta
+
+from django.db.models import Q
+from django.utils import timezone
+
+from core.models import BloodDonation
+
+# Minimum spacing between two donations by the same user
+DONATION_INTERVAL = timedelta(days=90)
+
+
+def find_conflicting_donation_date(user, donation_date, exclude_pk=None):
+    """
+    Date of a donation by ``user`` less than ``DONATION_INTERVAL`` away from
+    ``donation_date`` (either side), or ``None`` when the date is allowed.
+    One range query served by the ``(user, donation_date)`` index.
+    """
+    window = DONATION_INTERVAL - timedelta(days=1)
+    qs = BloodDonation.objects.filter(
+        user=user,
+        donation_date__range=(donation_date - window, donation_date + window),
+    )
+    if exclude_pk is not None:
+        qs = qs.exclude(pk=exclude_pk)
+    return qs.order_by("donation_date").values_list("donation_date", flat=True).first()
+
+
+def can_donate(user, on_date=None):
+    """Whether ``user`` may donate on ``on_date`` (today by default)."""
+    on_date = on_date or timezone.now().date()
+    if (
+        user.last_donation_date
+        and abs(on_date - user.last_donation_date) < DONATION_INTERVAL
+    ):
+        return False
+    return find_conflicting_donation_date(user, on_date) is None
+
+
+# ABO/Rh red cell compatibility: recipient group -> donor groups it can receive
+COMPATIBLE_DONOR_GROUPS = {
+    "O-": ["O-"],
+    "O+": ["O-", "O+"],
+    "A-": ["O-", "A-"],
+    "A+": ["O-", "O+", "A-", "A+"],
+    "B-": ["O-", "B-"],
+    "B+": ["O-", "O+", "B-", "B+"],
+    "AB-": ["O-", "A-", "B-", "AB-"],
+    "AB+": ["O-", "O+", "A-", "A+", "B-", "B+", "AB-", "AB+"],
+}
+
+
+def eligibility_cutoff(on_date=None):
+    """Latest previous donation date that still allows donating on ``on_date``."""
+    return (on_date or timezone.now().date()) - DONATION_INTERVAL
+
+
+def eligible_donor_filter(field, on_date=None):
+    """``Q`` for rows whose last donation date ``field`` allows donating now."""
+    return Q(**{f"{field}__isnull": True}) | Q(
+        **{f"{field}__lte": eligibility_cutoff(on_date)}
+    )
@@ -0,0 +1,117 @@
+import csv
+import json
+import re
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+
+from core.models import BloodDonation, BloodDonor, BloodRequest
+
+# dataset -> (model, exported columns, date column used by ?from= / ?to=)
+EXPORTS = {
+    "donors": (
+        BloodDonor,
+        [
+            "id",
+            "name",
+            "batch",
+            "blood_group",
+            "phone",
+            "last_donated_date",
+            "gender",
+            "created_at",
+        ],
+        "created_at__date",
+    ),
+    "donations": (
+        BloodDonation,
+        [
+            "id",
+            "user_id",
+            "user__email",
+            "blood_group",
+            "donation_date",
+            "contact_info",
+            "notes",
+            "created_at",
+        ],
+        "donation_date",
+    ),
+    "blood-requests": (
+        BloodRequest,
+        [
+            "id",
+            "user_id",
+            "user__email",
+            "blood_group",
+            "location",
+            "contact",
+            "collection_location",
+            "reason",
+            "date_required",
+        ],
+        "date_required",
+    ),
+}
+
+# a cell starting with one of these is run as a formula by spreadsheet apps
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+# phone numbers such as "+880 1711-000000" start with +/- but are just data
+PLAIN_NUMBER = re.compile(r"[+-]?\d[\d\s-]*")
+
+CONTENT_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+
+class _Echo:
+    """File-like object whose write() hands the line back to csv.writer."""
+
+    def write(self, value):
+        return value
+
+
+def iter_rows(queryset, fields, chunk_size=None):
+    """
+    Yield ``values_list`` tuples ``chunk_size`` rows at a time, paging on the
+    primary key. Unlike ``.iterator()``, this keeps memory flat on MySQL too,
+    where the driver would otherwise buffer the whole result set.
+    """
+    chunk_size = chunk_size or settings.EXPORT_CHUNK_SIZE
+    queryset = queryset.order_by("pk").values_list("pk", *fields)
+    last_pk = None
+    while True:
+        chunk = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+        rows = list(chunk[:chunk_size])
+        if not rows:
+            return
+        for row in rows:
+            yield row[1:]
+        last_pk = rows[-1][0]
+
+
+def csv_cell(value):
+    """``value``, with user text that a spreadsheet would evaluate quoted."""
+    if (
+        isinstance(value, str)
+        and value.startswith(FORMULA_PREFIXES)
+        and not PLAIN_NUMBER.fullmatch(value)
+    ):
+        return "'" + value
+    return value
+
+
+def stream_csv(queryset, fields):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(fields)
+    for row in iter_rows(queryset, fields):
+        yield writer.writerow([csv_cell(value) for value in row])
+
+
+def stream_ndjson(queryset, fields):
+    for row in iter_rows(queryset, fields):
+        yield json.dumps(dict(zip(fields, row)), cls=DjangoJSONEncoder) + "\n"
+
+
+STREAMERS = {"csv": stream_csv, "ndjson": stream_ndjson}
@@ -0,0 +1,157 @@
+"""
+Responsive variants of ``core.models.Image`` uploads.
+
+For every width in ``IMAGE_VARIANT_WIDTHS`` narrower than the original (plus
+the original width itself when it is below the largest one), a resized copy
+is written in each of ``IMAGE_VARIANT_FORMATS`` under ``images/variants/``.
+Their storage names (content-addressed, see ``core.storage``) are kept on
+``Image.variants``::
+
+    {"source": "images/3f/3f2a...c9.jpg",
+     "webp": {"320": "images/variants/8b/8b10...e4.webp", ...},
+     "jpeg": {"320": "images/variants/d7/d7c2...05.jpg", ...}}
+
+``source`` records which upload the variants were made from, so a replaced
+file is picked up and an unchanged one is skipped.
+"""
+
+import io
+import os
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.utils import timezone
+from PIL import Image as PILImage
+from PIL import ImageOps
+
+from core.models import Image
+from .cache import bump_model_version
+
+VARIANT_DIR = "images/variants"
+
+# format -> (Pillow format name, file extension, save options)
+FORMATS = {
+    "webp": ("WEBP", "webp", {"quality": 80, "method": 4}),
+    "jpeg": ("JPEG", "jpg", {"quality": 82, "optimize": True, "progressive": True}),
+}
+
+# relations to the models whose endpoints render Image rows
+PARENT_FIELDS = ["blog", "event", "team_member", "about"]
+
+
+def variant_widths(original_width):
+    widths = sorted(w for w in settings.IMAGE_VARIANT_WIDTHS if w < original_width)
+    if original_width < max(settings.IMAGE_VARIANT_WIDTHS, default=0):
+        widths.append(original_width)
+    return widths
+
+
+def needs_variants(image):
+    return (
+        bool(image.image) and (image.variants or {}).get("source") != image.image.name
+    )
+
+
+def _prepare(picture, fmt):
+    if fmt == "JPEG" and picture.mode != "RGB":
+        # flatten transparency onto white; JPEG has no alpha channel
+        rgba = picture.convert("RGBA")
+        background = PILImage.new("RGB", rgba.size, (255, 255, 255))
+        background.paste(rgba, mask=rgba.getchannel("A"))
+        return background
+    if picture.mode not in ("RGB", "RGBA"):
+        return picture.convert("RGBA" if "transparency" in picture.info else "RGB")
+    return picture
+
+
+def render_variants(source_file, stem, storage):
+    """Write the variants of ``source_file``; returns {format: {width: name}}."""
+    with PILImage.open(source_file) as original:
+        original = ImageOps.exif_transpose(original)
+        original.load()
+
+    variants = {}
+    for width in variant_widths(original.width):
+        height = max(1, round(original.height * width / original.width))
+        resized = (
+            original
+            if width == original.width
+            else original.resize((width, height), PILImage.Resampling.LANCZOS)
+        )
+        for key in settings.IMAGE_VARIANT_FORMATS:
+            fmt, extension, options = FORMATS[key]
+            buffer = io.BytesIO()
+            _prepare(resized, fmt).save(buffer, fmt, **options)
+            name = storage.save(
+                f"{VARIANT_DIR}/{stem}-{width}w.{extension}",
+                ContentFile(buffer.getvalue()),
+            )
+            variants.setdefault(key, {})[str(width)] = name
+    return variants
+
+
+def variant_names(variants):
+    return [
+        name
+        for key, value in (variants or {}).items()
+        if key != "source"
+        for name in value.values()
+    ]
+
+
+def delete_variant_files(names, storage=None):
+    storage = storage or Image._meta.get_field("image").storage
+    for name in names:
+        storage.delete(name)
+
+
+def touch_parents(image):
+    """
+    Variants are saved with ``update()``, which fires no signals and leaves
+    the parent's ``updated_at`` alone; refresh both so cached responses and
+    ETags of the pages showing the image change.
+    """
+    bump_model_version(Image)
+    now = timezone.now()
+    for name in PARENT_FIELDS:
+        parent_id = getattr(image, f"{name}_id")
+        if parent_id is None:
+            continue
+        model = Image._meta.get_field(name).related_model
+        if any(f.name == "updated_at" for f in model._meta.concrete_fields):
+            model.objects.filter(pk=parent_id).update(updated_at=now)
+        bump_model_version(model)
+
+
+def generate_variants(image_id, force=False):
+    """
+    Build the variants of one ``Image`` row. Returns True when new variants
+    were stored; undecodable uploads are recorded with no variants so they
+    are not retried on every save.
+    """
+    image = Image.objects.filter(pk=image_id).first()
+    if image is None or not image.image:
+        return False
+    if not force and not needs_variants(image):
+        return False
+
+    source = image.image.name
+    storage = image.image.storage
+    stem = os.path.splitext(os.path.basename(source))[0]
+    try:
+        with storage.open(source, "rb") as source_file:
+            variants = render_variants(source_file, stem, storage)
+    except (OSError, PILImage.DecompressionBombError):
+        variants = {}
+    variants["source"] = source
+
+    # only store them if the row still points at the file that was processed
+    stored = Image.objects.filter(pk=image.pk, image=source).update(variants=variants)
+    if not stored:
+        delete_variant_files(variant_names(variants), storage)
+        return False
+    delete_variant_files(
+        set(variant_names(image.variants)) - set(variant_names(variants)), storage
+    )
+    touch_parents(image)
+    return True
@@ -0,0 +1,182 @@
+import csv
+import io
+import re
+from functools import reduce
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F, Value
+from django.db.models.functions import Replace
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from core.models import BloodDonor, BloodInventory
+from . import matching
+
+DONOR_COLUMNS = ["name", "batch", "blood_group", "phone", "last_donated_date", "gender"]
+BLOOD_GROUPS = {group for group, _ in BloodInventory.BLOOD_GROUPS}
+GENDERS = {value.lower(): value for value, _ in BloodDonor.GENDER_CHOICES}
+# separators people type into phone numbers, stripped before comparing
+PHONE_SEPARATORS = " -().+/"
+
+
+def normalize_phone(value):
+    """
+    Strip separators and fold Bangladeshi numbers to the local 11-digit form,
+    so "+880 1711-000000", "8801711000000" and "01711000000" compare equal.
+    """
+    digits = re.sub(r"\D", "", value or "")
+    if digits.startswith("880") and len(digits) == 13:
+        digits = "0" + digits[3:]
+    elif digits.startswith("1") and len(digits) == 10:
+        # spreadsheets drop the leading zero of numeric cells
+        digits = "0" + digits
+    return digits
+
+
+def phone_variants(phone):
+    """Digit strings a normalized local number may be stored as."""
+    if phone.startswith("01") and len(phone) == 11:
+        return {phone, "88" + phone, phone[1:]}
+    return {phone}
+
+
+def phone_digits(field):
+    """``field`` with PHONE_SEPARATORS removed, computed in the database."""
+    return reduce(
+        lambda expression, char: Replace(expression, Value(char)),
+        PHONE_SEPARATORS,
+        F(field),
+    )
+
+
+def _check_length(cleaned, errors, field):
+    max_length = BloodDonor._meta.get_field(field).max_length
+    if len(cleaned[field]) > max_length:
+        errors[field] = (
+            f"Ensure this value has at most {max_length} characters "
+            f"(it has {len(cleaned[field])})."
+        )
+
+
+def read_csv(uploaded):
+    """Rows of an uploaded CSV file as dicts keyed by the header line."""
+    text = io.TextIOWrapper(uploaded, encoding="utf-8-sig", newline="")
+    return list(csv.DictReader(text))
+
+
+def _text(row, field):
+    # JSON rows may hold numbers ("batch": 70) where CSV always gives text
+    value = row.get(field)
+    return "" if value is None else str(value).strip()
+
+
+def _clean_row(row, today):
+    cleaned = {}
+    errors = {}
+
+    name = _text(row, "name")
+    if not name:
+        errors["name"] = "This field is required."
+    cleaned["name"] = name
+    cleaned["batch"] = _text(row, "batch")
+    # over-long values would fail the whole bulk insert on strict databases
+    for field in ("name", "batch"):
+        _check_length(cleaned, errors, field)
+
+    blood_group = _text(row, "blood_group").upper()
+    if blood_group not in BLOOD_GROUPS:
+        errors["blood_group"] = f'"{_text(row, "blood_group")}" is not a valid choice.'
+    cleaned["blood_group"] = blood_group
+
+    phone = normalize_phone(_text(row, "phone"))
+    cleaned["phone"] = phone
+    if len(phone) < 6:
+        errors["phone"] = "Enter a valid phone number."
+    else:
+        _check_length(cleaned, errors, "phone")
+
+    gender = GENDERS.get(_text(row, "gender").lower())
+    if not gender:
+        errors["gender"] = f'"{_text(row, "gender")}" is not a valid choice.'
+    cleaned["gender"] = gender
+
+    last_donated = _text(row, "last_donated_date")
+    cleaned["last_donated_date"] = None
+    if last_donated:
+        try:
+            cleaned["last_donated_date"] = parse_date(last_donated)
+        except ValueError:
+            pass
+        if cleaned["last_donated_date"] is None:
+            errors["last_donated_date"] = "Use YYYY-MM-DD."
+        elif cleaned["last_donated_date"] > today:
+            errors["last_donated_date"] = "Date cannot be in the future."
+
+    return cleaned, errors
+
+
+def import_donors(rows, dry_run=False, batch_size=None):
+    """
+    Validate ``rows`` (dicts with DONOR_COLUMNS) in one pass and bulk insert
+    the valid ones. Duplicates are detected by normalized phone, both within
+    the upload and against existing donors, whatever separators their stored
+    numbers contain (one query). Row numbers in the
+    returned report are 1-based, in upload order.
+    """
+    today = timezone.now().date()
+    batch_size = batch_size or settings.DONOR_IMPORT_BATCH_SIZE
+
+    cleaned_rows = []
+    report = []
+    for number, row in enumerate(rows, start=1):
+        if not isinstance(row, dict):
+            report.append({"row": number, "errors": {"row": "Expected an object."}})
+            continue
+        cleaned, errors = _clean_row(row, today)
+        cleaned_rows.append((number, cleaned, errors))
+
+    phones = set()
+    for _, cleaned, _ in cleaned_rows:
+        if cleaned["phone"]:
+            phones |= phone_variants(cleaned["phone"])
+    # a single query, unless the backend caps bound parameters (SQLite)
+    phones = sorted(phones)
+    step = connection.features.max_query_params or len(phones) or 1
+    existing = set()
+    for start in range(0, len(phones), step):
+        existing.update(
+            normalize_phone(phone)
+            for phone in BloodDonor.objects.annotate(digits=phone_digits("phone"))
+            .filter(digits__in=phones[start : start + step])
+            .values_list("phone", flat=True)
+        )
+
+    seen = {}
+    donors = []
+    for number, cleaned, errors in cleaned_rows:
+        phone = cleaned["phone"]
+        if phone and "phone" not in errors:
+            if phone in existing:
+                errors["phone"] = "A donor with this phone number already exists."
+            elif phone in seen:
+                errors["phone"] = f"Duplicate of row {seen[phone]} in this upload."
+            else:
+                seen[phone] = number
+        if errors:
+            report.append({"row": number, "errors": errors})
+        else:
+            donors.append(BloodDonor(**cleaned))
+
+    if donors and not dry_run:
+        with transaction.atomic():
+            BloodDonor.objects.bulk_create(donors, batch_size=batch_size)
+        # bulk_create skips the signals that keep the match index current
+        matching.reset_index()
+
+    report.sort(key=lambda entry: entry["row"])
+    return {
+        "created": 0 if dry_run else len(donors),
+        "valid": len(donors),
+        "errors": report,
+    }
@@ -0,0 +1,194 @@
+"""
+Database-backed outbound mail queue.
+
+``enqueue`` stores a message as an ``OutboundEmail`` row and returns at
+once; delivery happens after commit on the background pool (api.tasks) and
+from ``manage.py send_queued_mail``, which also retries what failed.
+
+A sender claims up to ``MAIL_QUEUE_BATCH_SIZE`` due rows (a conditional
+UPDATE, so concurrent senders never pick the same row) and sends them over
+one backend connection, i.e. a single SMTP session per batch. A failed
+message is retried after ``MAIL_RETRY_DELAY`` seconds, doubling each time
+up to ``MAIL_RETRY_MAX_DELAY``, and marked failed after
+``MAIL_MAX_ATTEMPTS``. Rows left "sending" by a crashed sender are queued
+again after ``MAIL_CLAIM_TIMEOUT`` seconds, so delivery is at least once. Bodies are
+cleared once a message is sent or given up on, and never shown in the admin.
+
+Messages go out through the regular ``EMAIL_BACKEND``: SMTP in production,
+the locmem/file backends in tests and development.
+"""
+
+import logging
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db.models import F
+from django.utils import timezone
+
+from core.models import OutboundEmail
+from .tasks import submit
+
+logger = logging.getLogger(__name__)
+
+
+def enqueue(message, send_now=True):
+    """
+    Queue an ``EmailMessage``/``EmailMultiAlternatives`` (its text body and
+    first HTML alternative) and schedule a background send after commit.
+    """
+    html_body = ""
+    for content, mimetype in getattr(message, "alternatives", []):
+        if mimetype == "text/html":
+            html_body = content
+            break
+    email = OutboundEmail.objects.create(
+        subject=message.subject,
+        body=message.body,
+        html_body=html_body,
+        from_email=message.from_email or "",
+        to=list(message.recipients()),
+    )
+    if send_now:
+        submit(send_queued)
+    return email
+
+
+def build_message(email):
+    message = EmailMultiAlternatives(
+        email.subject, email.body, email.from_email or None, email.to
+    )
+    if email.html_body:
+        message.attach_alternative(email.html_body, "text/html")
+    return message
+
+
+def retry_delay(attempts):
+    delay = settings.MAIL_RETRY_DELAY * 2 ** max(attempts - 1, 0)
+    return timedelta(seconds=min(delay, settings.MAIL_RETRY_MAX_DELAY))
+
+
+def release_stale_claims(queryset=None, now=None):
+    """Queue rows a crashed sender left in "sending" again."""
+    queryset = OutboundEmail.objects.all() if queryset is None else queryset
+    model = queryset.model
+    now = now or timezone.now()
+    cutoff = now - timedelta(seconds=settings.MAIL_CLAIM_TIMEOUT)
+    return queryset.filter(status=model.STATUS_SENDING, claimed_at__lt=cutoff).update(
+        status=model.STATUS_QUEUED, claim="", next_attempt_at=now
+    )
+
+
+def claim_batch(batch_size=None, now=None, queryset=None):
+    """
+    Mark up to ``batch_size`` due rows as ours and return them. Works for any
+    queue model with the ``OutboundEmail`` status/claim/next_attempt_at fields.
+    """
+    queryset = OutboundEmail.objects.all() if queryset is None else queryset
+    model = queryset.model
+    now = now or timezone.now()
+    batch_size = batch_size or settings.MAIL_QUEUE_BATCH_SIZE
+    due = queryset.filter(
+        status=model.STATUS_QUEUED, next_attempt_at__lte=now
+    ).order_by("next_attempt_at", "id")
+    ids = list(due.values_list("id", flat=True)[:batch_size])
+    if not ids:
+        return []
+    claim = uuid.uuid4().hex
+    # rows another sender claimed in the meantime no longer match
+    model.objects.filter(id__in=ids, status=model.STATUS_QUEUED).update(
+        status=model.STATUS_SENDING, claim=claim, claimed_at=now
+    )
+    return list(model.objects.filter(claim=claim).order_by("id"))
+
+
+def send_messages(messages, connection):
+    """
+    Send ``messages`` over one open/close of ``connection`` (an email or SMS
+    backend); returns the exception raised for each message, or None.
+    """
+    try:
+        connection.open()
+    except Exception as exc:
+        # nothing can go out this round
+        return [exc] * len(messages)
+    errors = []
+    try:
+        for message in messages:
+            try:
+                connection.send_messages([message])
+            except Exception as exc:
+                errors.append(exc)
+            else:
+                errors.append(None)
+    finally:
+        connection.close()
+    return errors
+
+
+def record_results(rows, errors):
+    """Mark rows sent, or schedule a retry/give up; returns (sent, failed)."""
+    now = timezone.now()
+    sent = [row.pk for row, exc in zip(rows, errors) if exc is None]
+    if sent:
+        model = type(rows[0])
+        model.objects.filter(pk__in=sent).update(
+            status=model.STATUS_SENT,
+            sent_at=now,
+            attempts=F("attempts") + 1,
+            last_error="",
+            claim="",
+        )
+    for row, exc in zip(rows, errors):
+        if exc is not None:
+            _record_failure(row, exc, now)
+    return len(sent), len(rows) - len(sent)
+
+
+def send_batch(emails, connection=None):
+    """Send claimed rows over one connection; returns (sent, failed) counts."""
+    connection = connection or get_connection(fail_silently=False)
+    errors = send_messages([build_message(email) for email in emails], connection)
+    sent, failed = record_results(emails, errors)
+    # bodies can hold secrets (password reset tokens): drop them once the
+    # message is out or given up on, keeping only the delivery record
+    OutboundEmail.objects.filter(
+        pk__in=[email.pk for email in emails],
+        status__in=[OutboundEmail.STATUS_SENT, OutboundEmail.STATUS_FAILED],
+    ).update(body="", html_body="")
+    return sent, failed
+
+
+def _record_failure(row, exc, now):
+    model = type(row)
+    row.attempts += 1
+    row.last_error = f"{type(exc).__name__}: {exc}"[:2000]
+    row.claim = ""
+    if row.attempts >= settings.MAIL_MAX_ATTEMPTS:
+        row.status = model.STATUS_FAILED
+        logger.error(
+            "Giving up on %s %s: %s", model._meta.model_name, row.pk, row.last_error
+        )
+    else:
+        row.status = model.STATUS_QUEUED
+        row.next_attempt_at = now + retry_delay(row.attempts)
+    row.save(
+        update_fields=["attempts", "last_error", "claim", "status", "next_attempt_at"]
+    )
+
+
+def send_queued(batch_size=None):
+    """Send everything due, batch by batch; returns (sent, failed) counts."""
+    release_stale_claims()
+    sent = failed = 0
+    while True:
+        emails = claim_batch(batch_size)
+        if not emails:
+            return sent, failed
+        batch_sent, batch_failed = send_batch(emails)
+        sent += batch_sent
+        failed += batch_failed
+        if not batch_sent:
+            # nothing got through (backend down?): leave the rest for later
+            return sent, failed
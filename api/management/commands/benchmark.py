@@ -0,0 +1,146 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from api import matching
+from api.benchmarks import SCENARIO_NAMES, compare, metadata, run
+from api.search import rebuild
+from core.models import User
+from core.seeding import DEFAULT_COUNTS, TABLES, seed
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a throw-away test database with synthetic data and measure "
+        "latency (p50/p95), queries and memory per request of the public, "
+        "donation and admin APIs. Writes JSON; --compare lines a run up "
+        "against an earlier one (or compares two result files)."
+    )
+
+    def add_arguments(self, parser):
+        for table in TABLES:
+            parser.add_argument(
+                f"--{table}",
+                type=int,
+                default=DEFAULT_COUNTS[table],
+                help=f"Rows of {table} to seed (default {DEFAULT_COUNTS[table]})",
+            )
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--iterations", type=int, default=20)
+        parser.add_argument("--warmup", type=int, default=2)
+        parser.add_argument(
+            "--scenario",
+            action="append",
+            choices=SCENARIO_NAMES,
+            help="Only run this scenario (repeatable)",
+        )
+        parser.add_argument("--output", help="Write the JSON results to this file")
+        parser.add_argument(
+            "--compare",
+            nargs="+",
+            metavar="RESULTS",
+            help="Baseline results to compare this run with; given two files, "
+            "compare them without running anything",
+        )
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=10.0,
+            help="Percent slowdown reported as a regression (default 10)",
+        )
+        parser.add_argument(
+            "--fail-on-regression",
+            action="store_true",
+            help="Exit with an error when the comparison finds a regression",
+        )
+        parser.add_argument(
+            "--keepdb",
+            action="store_true",
+            help="Keep the test database, and reuse its data on the next run",
+        )
+
+    def handle(self, *args, **options):
+        compare_with = options["compare"] or []
+        if len(compare_with) > 2:
+            raise CommandError("--compare takes one or two result files.")
+        if len(compare_with) == 2:
+            before, after = (self.read_results(path) for path in compare_with)
+            return self.report(before, after, options)
+
+        baseline = self.read_results(compare_with[0]) if compare_with else None
+        results = self.benchmark(options)
+        text = json.dumps(results, indent=2)
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as f:
+                f.write(text + "\n")
+            self.stdout.write(self.style.SUCCESS(f"Wrote {options['output']}"))
+        elif baseline is None:
+            self.stdout.write(text)
+        if baseline is not None:
+            self.report(baseline, results, options)
+
+    def benchmark(self, options):
+        counts = {table: options[table] for table in TABLES}
+        old_name = connection.settings_dict["NAME"]
+        connection.creation.create_test_db(
+            verbosity=0, autoclobber=True, keepdb=options["keepdb"], serialize=False
+        )
+        try:
+            if User.objects.filter(
+                email=f"seed{options['seed']}-0@example.com"
+            ).exists():
+                self.stdout.write("Reusing the seeded test database.")
+            else:
+                seed(counts, seed=options["seed"], progress=self.progress)
+                rebuild()
+                matching.reset_index()
+            results = run(
+                options["scenario"],
+                iterations=options["iterations"],
+                warmup=options["warmup"],
+                progress=self.show,
+            )
+            meta = metadata(
+                seed=options["seed"],
+                iterations=options["iterations"],
+                warmup=options["warmup"],
+            )
+        finally:
+            connection.creation.destroy_test_db(
+                old_name, verbosity=0, keepdb=options["keepdb"]
+            )
+        return {"meta": meta, "results": results}
+
+    def progress(self, table, done, total):
+        self.stderr.write(f"seeded {table}: {done}/{total}", ending="\r")
+        if done == total:
+            self.stderr.write("")
+
+    def show(self, name, result):
+        self.stderr.write(
+            f"{name:28} p50 {result['p50_ms']:9.2f} ms  p95 {result['p95_ms']:9.2f} ms"
+            f"  {result['queries']:3} queries  {result['peak_kib']} KiB peak"
+        )
+
+    def read_results(self, path):
+        try:
+            with open(path, encoding="utf-8") as f:
+                results = json.load(f)
+        except (OSError, ValueError) as exc:
+            raise CommandError(f"Could not read {path}: {exc}")
+        if "results" not in results:
+            raise CommandError(f"{path} is not a benchmark result file.")
+        return results
+
+    def report(self, before, after, options):
+        rows = compare(before, after, threshold=options["threshold"])
+        old, new = before.get("meta", {}), after.get("meta", {})
+        self.stdout.write(f"{old.get('commit')} -> {new.get('commit')}")
+        for name, metric, a, b, change, regressed in rows:
+            line = f"{name:28} {metric:10} {a:>10} -> {b:>10} {change:+7.1f}%"
+            self.stdout.write(self.style.ERROR(line) if regressed else line)
+        regressions = sum(row[-1] for row in rows)
+        if regressions and options["fail_on_regression"]:
+            raise CommandError(f"{regressions} regression(s).")
+        self.stdout.write(f"{regressions} regression(s).")
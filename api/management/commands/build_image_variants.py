@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+
+from api.images import generate_variants, needs_variants
+from core.models import Image
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate responsive WebP/JPEG variants for Image rows that have none "
+        "yet (uploads made before the pipeline existed, or lost background jobs)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--force", action="store_true", help="Rebuild variants for every image"
+        )
+        parser.add_argument("ids", nargs="*", type=int, help="Only these Image ids")
+
+    def handle(self, *args, **options):
+        images = Image.objects.only("id", "image", "variants").order_by("id")
+        if options["ids"]:
+            images = images.filter(pk__in=options["ids"])
+
+        built = skipped = 0
+        for image in images.iterator():
+            if not options["force"] and not needs_variants(image):
+                skipped += 1
+                continue
+            if generate_variants(image.pk, force=options["force"]):
+                built += 1
+                self.stdout.write(f"image {image.pk}: {image.image.name}")
+            else:
+                skipped += 1
+        self.stdout.write(
+            self.style.SUCCESS(f"{built} image(s) processed, {skipped} skipped.")
+        )
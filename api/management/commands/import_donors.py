@@ -0,0 +1,47 @@
+import csv
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.imports import import_donors, read_csv
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk-import BloodDonor rows from a CSV file or a JSON array "
+        "(columns: name, batch, blood_group, phone, last_donated_date, gender)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Path to a .csv or .json file")
+        parser.add_argument(
+            "--dry-run", action="store_true", help="Validate without saving"
+        )
+        parser.add_argument("--batch-size", type=int, default=None)
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        try:
+            if path.lower().endswith(".json"):
+                with open(path, encoding="utf-8") as f:
+                    rows = json.load(f)
+                if not isinstance(rows, list):
+                    raise CommandError("The JSON file must hold an array of donors.")
+            else:
+                with open(path, "rb") as f:
+                    rows = read_csv(f)
+        except (OSError, ValueError, csv.Error) as exc:
+            raise CommandError(f"Could not read {path}: {exc}")
+
+        report = import_donors(
+            rows, dry_run=options["dry_run"], batch_size=options["batch_size"]
+        )
+        for entry in report["errors"]:
+            problems = "; ".join(f"{k}: {v}" for k, v in entry["errors"].items())
+            self.stderr.write(f"row {entry['row']}: {problems}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{report['valid']} valid row(s), {report['created']} created, "
+                f"{len(report['errors'])} rejected."
+            )
+        )
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+
+from api.uploads import store_upload
+from core.models import Image
+
+
+class Command(BaseCommand):
+    help = (
+        "Store API image uploads still waiting in the staging area (jobs lost "
+        "to a restart); --retry-failed also retries uploads that failed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--retry-failed", action="store_true")
+
+    def handle(self, *args, **options):
+        if options["retry_failed"]:
+            Image.objects.filter(status=Image.STATUS_FAILED).exclude(
+                staged_file=""
+            ).update(status=Image.STATUS_PENDING)
+
+        pending = (
+            Image.objects.filter(status=Image.STATUS_PENDING)
+            .exclude(staged_file="")
+            .values_list("pk", flat=True)
+        )
+        stored = 0
+        for image_id in list(pending):
+            store_upload(image_id)
+            stored += Image.objects.filter(
+                pk=image_id, status=Image.STATUS_READY
+            ).exists()
+        self.stdout.write(self.style.SUCCESS(f"{stored} upload(s) stored."))
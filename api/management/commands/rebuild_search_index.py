@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from api.search import backend_name, rebuild
+
+
+class Command(BaseCommand):
+    help = (
+        "Re-create the full-text search documents of every blog and event "
+        "(after bulk imports or raw SQL edits that bypass model signals)."
+    )
+
+    def handle(self, *args, **options):
+        count = rebuild()
+        self.stdout.write(
+            self.style.SUCCESS(f"Indexed {count} document(s) ({backend_name()}).")
+        )
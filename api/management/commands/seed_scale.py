@@ -0,0 +1,94 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from api import matching
+from api.cache import bump_model_version
+from api.search import rebuild
+from core.models import User
+from core.seeding import DEFAULT_COUNTS, MODELS, TABLES, seed
+
+
+class Command(BaseCommand):
+    help = (
+        "Fill the configured database with deterministic synthetic users, "
+        "donors, donations, interests, requests, blogs, images, comments and "
+        "events for scale testing. Rows are added next to existing data with "
+        "chunked bulk_create (no model signals), optionally in several "
+        "processes; the search index and caches are refreshed afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--scale",
+            type=float,
+            default=1.0,
+            help="Multiply every default row count by this factor",
+        )
+        for table in TABLES:
+            parser.add_argument(
+                f"--{table}",
+                type=int,
+                default=None,
+                help=f"Rows of {table} (default {DEFAULT_COUNTS[table]} x scale)",
+            )
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--chunk-size", type=int, default=5000)
+        parser.add_argument(
+            "--processes",
+            type=int,
+            default=1,
+            help="Worker processes generating (and, except on SQLite, writing) "
+            "chunks",
+        )
+
+    def handle(self, *args, **options):
+        if options["chunk_size"] < 1 or options["processes"] < 1:
+            raise CommandError("--chunk-size and --processes must be positive.")
+        counts = {
+            table: (
+                options[table]
+                if options[table] is not None
+                else round(DEFAULT_COUNTS[table] * options["scale"])
+            )
+            for table in TABLES
+        }
+        if User.objects.filter(email=f"seed{options['seed']}-0@example.com").exists():
+            raise CommandError(
+                f"Seed {options['seed']} is already in this database; "
+                "pick another --seed."
+            )
+
+        started = time.monotonic()
+        try:
+            seed(
+                counts,
+                seed=options["seed"],
+                chunk_size=options["chunk_size"],
+                processes=options["processes"],
+                progress=self.progress,
+            )
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        # bulk_create skipped the signals that keep these current
+        indexed = rebuild()
+        matching.reset_index()
+        for model in MODELS.values():
+            bump_model_version(model)
+
+        total = sum(counts.values())
+        elapsed = time.monotonic() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Seeded {total} row(s) into {connection.vendor} in {elapsed:.1f}s "
+                f"({total / max(elapsed, 0.001):.0f} rows/s); "
+                f"{indexed} search document(s) indexed."
+            )
+        )
+
+    def progress(self, table, done, total):
+        self.stderr.write(f"{table}: {done}/{total}", ending="\r")
+        if done == total:
+            self.stderr.write("")
@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from api.notifications import notify, send_pending
+from core.models import Notification
+
+
+class Command(BaseCommand):
+    help = (
+        "Send queued donor notifications (api.notifications) in batches, one "
+        "email/SMS connection per batch, retrying failures with backoff. "
+        "--request/--event fan a notification out (again) first; only "
+        "recipients not queued before are added."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--request", type=int, help="Notify donors of this blood request"
+        )
+        parser.add_argument("--event", type=int, help="Notify donors of this event")
+        parser.add_argument("--batch-size", type=int, default=None)
+
+    def handle(self, *args, **options):
+        for kind, object_id in (
+            (Notification.KIND_BLOOD_REQUEST, options["request"]),
+            (Notification.KIND_EVENT, options["event"]),
+        ):
+            if object_id is None:
+                continue
+            notification = notify(kind, object_id, send=False)
+            if notification is None:
+                raise CommandError(f"No {kind.replace('_', ' ')} with id {object_id}.")
+            self.stdout.write(
+                f"{notification}: {notification.deliveries.count()} delivery(ies)."
+            )
+
+        sent, failed = send_pending(options["batch_size"])
+        self.stdout.write(
+            self.style.SUCCESS(f"{sent} sent, {failed} failed (will retry or gave up).")
+        )
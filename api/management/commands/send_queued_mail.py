@@ -0,0 +1,88 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.utils import timezone
+
+from api.mail import send_queued
+from core.models import OutboundEmail
+
+
+def _send_in_thread(batch_size):
+    try:
+        return send_queued(batch_size)
+    finally:
+        # pool threads get their own connections; don't leak them
+        connections.close_all()
+
+
+class Command(BaseCommand):
+    help = (
+        "Deliver queued outbound email (api.mail): due messages are claimed in "
+        "batches, each batch sent over one connection, failures retried with "
+        "backoff. Run from cron, or keep it running with --loop."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Threads sending batches in parallel, one connection each",
+        )
+        parser.add_argument("--batch-size", type=int, default=None)
+        parser.add_argument(
+            "--loop", action="store_true", help="Keep polling the queue"
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=10.0,
+            help="Seconds between polls with --loop (default 10)",
+        )
+        parser.add_argument(
+            "--keep-days",
+            type=int,
+            default=30,
+            help="Delete sent messages older than this many days (default 30)",
+        )
+
+    def handle(self, *args, **options):
+        workers = options["workers"]
+        if workers < 1:
+            raise CommandError("--workers must be at least 1.")
+        pool = None
+        if workers > 1:
+            pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="mail")
+        try:
+            while True:
+                self.run_once(pool, options)
+                if not options["loop"]:
+                    break
+                time.sleep(options["interval"])
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+    def run_once(self, pool, options):
+        if pool is None:
+            results = [send_queued(options["batch_size"])]
+        else:
+            jobs = [options["batch_size"]] * options["workers"]
+            results = list(pool.map(_send_in_thread, jobs))
+        sent = sum(r[0] for r in results)
+        failed = sum(r[1] for r in results)
+
+        cutoff = timezone.now() - timedelta(days=options["keep_days"])
+        purged, _ = OutboundEmail.objects.filter(
+            status=OutboundEmail.STATUS_SENT, sent_at__lt=cutoff
+        ).delete()
+        if sent or failed or not options["loop"]:
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"{sent} sent, {failed} failed (will retry or gave up), "
+                    f"{purged} old message(s) purged."
+                )
+            )
@@ -0,0 +1,212 @@
+"""
+Donor matching for blood requests.
+
+Candidates (registered users, BloodDonor records and open donation
+interests) are kept in one bucket per donor blood group, each entry carrying
+the first date the candidate can donate. Buckets live in the Django cache so
+every worker shares them, keyed by a per-group version, with a per-process
+copy that is reused while the version is unchanged. Signal handlers in
+``api.signals`` bump the version of the groups a save/delete touches; the
+bucket is then rebuilt from the database on next use. Buckets are never
+edited in place, so concurrent writers can't lose each other's updates.
+"""
+
+import time
+from datetime import date
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+from core.models import BloodDonationInterest, BloodDonor, BloodInventory, User
+from .eligibility import COMPATIBLE_DONOR_GROUPS, DONATION_INTERVAL
+
+BLOOD_GROUPS = [group for group, _ in BloodInventory.BLOOD_GROUPS]
+
+# interests are explicit offers to donate, so they rank ahead of the rosters
+SOURCE_RANK = {"interest": 0, "user": 1, "donor": 2}
+
+_local = {}
+
+
+def _cache():
+    return caches[settings.CONTENT_CACHE_ALIAS]
+
+
+def _bucket_key(group, version):
+    return f"donor-match:bucket:{group}:{version}"
+
+
+def _version_key(group):
+    return f"donor-match:version:{group}"
+
+
+def _available_from(last_donation):
+    return last_donation + DONATION_INTERVAL if last_donation else date.min
+
+
+def _display_name(first_name, last_name, email):
+    return f"{first_name.strip()} {last_name.strip()}".strip() or email
+
+
+def user_entry(user):
+    if not user.is_active or not user.blood_group:
+        return None
+    return {
+        "source": "user",
+        "id": user.id,
+        "user_id": user.id,
+        "name": _display_name(user.first_name, user.last_name, user.email),
+        "blood_group": user.blood_group,
+        "contact": user.phone,
+        "last_donation_date": user.last_donation_date,
+        "available_from": _available_from(user.last_donation_date),
+    }
+
+
+def donor_entry(donor):
+    return {
+        "source": "donor",
+        "id": donor.id,
+        "user_id": None,
+        "name": donor.name,
+        "blood_group": donor.blood_group,
+        "contact": donor.phone,
+        "batch": donor.batch,
+        "last_donation_date": donor.last_donated_date,
+        "available_from": _available_from(donor.last_donated_date),
+    }
+
+
+def interest_entry(interest, user=None):
+    if interest.donation_id:
+        return None
+    user = user or interest.user
+    return {
+        "source": "interest",
+        "id": interest.id,
+        "user_id": interest.user_id,
+        "name": _display_name(user.first_name, user.last_name, user.email),
+        "blood_group": interest.blood_group,
+        "contact": interest.contact_info,
+        "last_donation_date": user.last_donation_date,
+        "available_from": interest.available_date,
+    }
+
+
+def _build_bucket(group):
+    bucket = {}
+    for user in User.objects.filter(blood_group=group, is_active=True).only(
+        "id",
+        "first_name",
+        "last_name",
+        "email",
+        "phone",
+        "blood_group",
+        "is_active",
+        "last_donation_date",
+    ):
+        bucket[("user", user.id)] = user_entry(user)
+    for donor in BloodDonor.objects.filter(blood_group=group).order_by():
+        bucket[("donor", donor.id)] = donor_entry(donor)
+    for interest in BloodDonationInterest.objects.filter(
+        blood_group=group, donation__isnull=True
+    ).select_related("user"):
+        bucket[("interest", interest.id)] = interest_entry(interest)
+    return bucket
+
+
+def get_version(group):
+    cache = _cache()
+    key = _version_key(group)
+    version = cache.get(key)
+    if version is None:
+        # seed from the clock so an evicted counter never rewinds onto old buckets
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def get_bucket(group):
+    version = get_version(group)
+    local = _local.get(group)
+    if local and local[0] == version:
+        return local[1]
+
+    cache = _cache()
+    key = _bucket_key(group, version)
+    bucket = cache.get(key)
+    if bucket is None:
+        bucket = _build_bucket(group)
+        # if the version moved while building, nobody reads this key again
+        cache.set(key, bucket, settings.DONOR_MATCH_INDEX_TIMEOUT)
+    _local[group] = (version, bucket)
+    return bucket
+
+
+def _bump(groups):
+    cache = _cache()
+    for group in groups:
+        try:
+            cache.incr(_version_key(group))
+        except ValueError:
+            cache.set(_version_key(group), time.time_ns(), timeout=None)
+
+
+def invalidate(groups):
+    """
+    Mark the buckets of ``groups`` stale. Bumped now, for reads later in the
+    same transaction, and again on commit, so a bucket another worker built
+    from the old rows in between is never read.
+    """
+    groups = sorted({g for g in groups if g in BLOOD_GROUPS})
+    if groups:
+        _bump(groups)
+        transaction.on_commit(lambda: _bump(groups))
+
+
+def warm(groups):
+    for group in groups:
+        get_bucket(group)
+
+
+def reset_index():
+    """Drop every bucket; use after bulk writes that bypass model signals."""
+    _bump(BLOOD_GROUPS)
+    _local.clear()
+
+
+def match_blood_request(blood_request, limit=None):
+    """
+    Candidates able to give blood to ``blood_request`` by its ``date_required``,
+    best first: exact group before compatible ones, offered interests before
+    roster entries, then whoever has been eligible the longest.
+    """
+    compatible = COMPATIBLE_DONOR_GROUPS.get(blood_request.blood_group, [])
+    candidates = []
+    offered_users = set()
+    for group in compatible:
+        for entry in get_bucket(group).values():
+            if entry["user_id"] == blood_request.user_id:
+                continue
+            if entry["available_from"] > blood_request.date_required:
+                continue
+            if entry["source"] == "interest":
+                offered_users.add(entry["user_id"])
+            candidates.append(entry)
+
+    # a user with an open interest is listed once, through the interest
+    candidates = [
+        c
+        for c in candidates
+        if not (c["source"] == "user" and c["user_id"] in offered_users)
+    ]
+    candidates.sort(
+        key=lambda c: (
+            c["blood_group"] != blood_request.blood_group,
+            SOURCE_RANK[c["source"]],
+            c["available_from"],
+            c["id"],
+        )
+    )
+    return candidates[:limit] if limit else candidates
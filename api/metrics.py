@@ -0,0 +1,274 @@
+"""
+Per-route request instrumentation.
+
+``RequestMetricsMiddleware`` records, for every request, the wall time, the
+number and total duration of DB queries (through
+``connection.execute_wrapper``), the time spent producing serializer
+``.data`` and the response size. Observations go into histograms keyed by
+method, URL route (the pattern, not the concrete path) and status class,
+served in Prometheus text format by ``MetricsView`` (staff only).
+
+Histograms are cumulative since process start, as Prometheus expects;
+windowed views (p95 over the last 5 minutes, ...) come from ``rate()`` on
+the scraping side. Each worker process keeps its own series, labelled with
+its pid. With ``METRICS_SERVER_TIMING`` the same numbers are also sent per
+response as a ``Server-Timing`` header for the browser's network panel.
+
+Under ASGI the ORM runs queries in the request's sync_to_async thread, whose
+connections are not the event loop's, so the query hook is installed there.
+"""
+
+import contextvars
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+from rest_framework import serializers
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 200)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+METRICS = {
+    "http_request_duration_seconds": ("Wall time per request.", DURATION_BUCKETS),
+    "http_request_db_queries": ("DB queries per request.", QUERY_BUCKETS),
+    "http_request_db_duration_seconds": (
+        "Time spent in DB queries per request.",
+        DURATION_BUCKETS,
+    ),
+    "http_request_serializer_duration_seconds": (
+        "Time spent building serializer data per request (includes the "
+        "queries it triggers).",
+        DURATION_BUCKETS,
+    ),
+    "http_response_size_bytes": ("Response body size.", SIZE_BUCKETS),
+}
+
+
+class Histogram:
+    __slots__ = ("buckets", "counts", "count", "sum")
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+
+class Registry:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.histograms = {}
+
+    def observe(self, labels, values):
+        with self.lock:
+            for name, value in values.items():
+                key = (name, labels)
+                histogram = self.histograms.get(key)
+                if histogram is None:
+                    histogram = self.histograms[key] = Histogram(METRICS[name][1])
+                histogram.observe(value)
+
+    def clear(self):
+        with self.lock:
+            self.histograms.clear()
+
+    def render(self):
+        """The histograms in Prometheus text exposition format 0.0.4."""
+        with self.lock:
+            snapshot = sorted(
+                (
+                    name,
+                    labels,
+                    histogram.buckets,
+                    list(histogram.counts),
+                    histogram.count,
+                    histogram.sum,
+                )
+                for (name, labels), histogram in self.histograms.items()
+            )
+        pid = str(os.getpid())
+        lines = []
+        for metric, (help_text, _) in METRICS.items():
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} histogram")
+            for name, labels, buckets, counts, count, total in snapshot:
+                if name != metric:
+                    continue
+                base = _labels(labels + (("pid", pid),))
+                cumulative = 0
+                for bound, bucket_count in zip(buckets + ("+Inf",), counts):
+                    cumulative += bucket_count
+                    bucket_labels = _labels(
+                        labels + (("pid", pid), ("le", _number(bound)))
+                    )
+                    lines.append(f"{metric}_bucket{bucket_labels} {cumulative}")
+                lines.append(f"{metric}_sum{base} {_number(total)}")
+                lines.append(f"{metric}_count{base} {count}")
+        return "\n".join(lines) + "\n"
+
+
+def _number(value):
+    if isinstance(value, str):
+        return value
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _labels(pairs):
+    escaped = (
+        (k, str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for k, v in pairs
+    )
+    return "{" + ",".join(f'{k}="{v}"' for k, v in escaped) + "}"
+
+
+registry = Registry()
+
+
+class RequestStats:
+    __slots__ = ("queries", "db_time", "serializer_time", "serializer_depth")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        self.serializer_depth = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        # connection.execute_wrapper hook
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - start
+            self.queries += 1
+
+
+_current = contextvars.ContextVar("request_stats", default=None)
+
+
+def _timed_data(data_property):
+    def data(self):
+        stats = _current.get()
+        if stats is None:
+            return data_property.fget(self)
+        # only the outermost .data counts; nested calls are part of it
+        stats.serializer_depth += 1
+        start = time.perf_counter()
+        try:
+            return data_property.fget(self)
+        finally:
+            stats.serializer_depth -= 1
+            if not stats.serializer_depth:
+                stats.serializer_time += time.perf_counter() - start
+
+    return property(data)
+
+
+def instrument_serializers():
+    """Time ``.data`` on DRF serializers (called once from ApiConfig.ready)."""
+    for cls in (serializers.Serializer, serializers.ListSerializer):
+        if not getattr(cls.data.fget, "_metrics_timed", False):
+            timed = _timed_data(cls.data)
+            timed.fget._metrics_timed = True
+            cls.data = timed
+
+
+def _route(request):
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return "unmatched"
+    return "/" + match.route if match.route else match.view_name
+
+
+def _response_size(response):
+    if response.streaming:
+        length = response.get("Content-Length")
+        return int(length) if length and length.isdigit() else None
+    return len(response.content)
+
+
+def _wrap_connections(stack, stats):
+    for connection in connections.all():
+        stack.enter_context(connection.execute_wrapper(stats))
+
+
+class RequestMetricsMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if not settings.METRICS_ENABLED:
+            return self.get_response(request)
+
+        stats = RequestStats()
+        token = _current.set(stats)
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                _wrap_connections(stack, stats)
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.record(request, response, stats, time.perf_counter() - start)
+
+    async def __acall__(self, request):
+        if not settings.METRICS_ENABLED:
+            return await self.get_response(request)
+
+        stats = RequestStats()
+        token = _current.set(stats)
+        start = time.perf_counter()
+        stack = ExitStack()
+        try:
+            await sync_to_async(_wrap_connections)(stack, stats)
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stack.close)()
+            _current.reset(token)
+        return self.record(request, response, stats, time.perf_counter() - start)
+
+    def record(self, request, response, stats, elapsed):
+        values = {
+            "http_request_duration_seconds": elapsed,
+            "http_request_db_queries": stats.queries,
+            "http_request_db_duration_seconds": stats.db_time,
+            "http_request_serializer_duration_seconds": stats.serializer_time,
+        }
+        size = _response_size(response)
+        if size is not None:
+            values["http_response_size_bytes"] = size
+        labels = (
+            ("method", request.method),
+            ("route", _route(request)),
+            ("status", f"{response.status_code // 100}xx"),
+        )
+        registry.observe(labels, values)
+
+        if settings.METRICS_SERVER_TIMING:
+            response["Server-Timing"] = ", ".join(
+                [
+                    f"total;dur={elapsed * 1000:.1f}",
+                    f'db;dur={stats.db_time * 1000:.1f};desc="{stats.queries} queries"',
+                    f"serialize;dur={stats.serializer_time * 1000:.1f}",
+                ]
+            )
+        return response
@@ -0,0 +1,111 @@
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+from .cache import CachedResponseMixin, cached_validators
+
+
+class QueryPlanMixin:
+    """
+    Declare the relations a view's serializer walks so they are joined or
+    prefetched up front instead of being loaded once per row.
+
+        select_related_fields = ("user",)
+        prefetch_related_fields = ("images",)
+
+    Applied in ``filter_queryset`` so it also covers views that build their
+    own ``get_queryset`` and the single-object lookup in ``get_object``.
+    """
+
+    select_related_fields = ()
+    prefetch_related_fields = ()
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.select_related_fields:
+            queryset = queryset.select_related(*self.select_related_fields)
+        if self.prefetch_related_fields:
+            queryset = queryset.prefetch_related(*self.prefetch_related_fields)
+        return queryset
+
+
+def last_modified_timestamp(stats):
+    last_modified = stats["last_modified"]
+    return int(last_modified.timestamp()) if last_modified else None
+
+
+def conditional_validators(full_path, format, stats):
+    """(ETag, Last-Modified timestamp) from a count/last_modified aggregate."""
+    last_modified = stats["last_modified"]
+    digest = hashlib.md5(
+        f"{full_path}:{format}:"
+        f"{stats['count']}:{last_modified and last_modified.isoformat()}".encode(),
+        usedforsecurity=False,
+    ).hexdigest()
+    return quote_etag(digest), last_modified_timestamp(stats)
+
+
+class ConditionalGetMixin:
+    """
+    ETag / Last-Modified validators for GET endpoints backed by a model with
+    an ``updated_at`` column.
+
+    The validators come from one aggregate (row count + latest
+    ``updated_at``) over the same queryset the view would render, so a
+    matching ``If-None-Match`` / ``If-Modified-Since`` is answered with 304
+    before anything is serialized.
+
+    On a ``CachedResponseMixin`` view the validators follow the cache
+    instead (see ``api.cache.cached_validators``), so a cache hit, 304 or
+    not, never reaches the database.
+    """
+
+    last_modified_field = "updated_at"
+
+    def get_validator_queryset(self):
+        queryset = self.filter_queryset(self.get_queryset())
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        if lookup_url_kwarg in self.kwargs:
+            queryset = queryset.filter(
+                **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+            )
+        return queryset
+
+    def get_validator_aggregates(self):
+        return {"count": Count("pk"), "last_modified": Max(self.last_modified_field)}
+
+    def get_validator_stats(self):
+        return (
+            self.get_validator_queryset()
+            .order_by()
+            .aggregate(**self.get_validator_aggregates())
+        )
+
+    def get_validators(self, request):
+        if isinstance(self, CachedResponseMixin):
+            return cached_validators(
+                self._response_cache_key(request),
+                request.accepted_renderer.format,
+                lambda: last_modified_timestamp(self.get_validator_stats()),
+            )
+        return conditional_validators(
+            request.get_full_path(),
+            request.accepted_renderer.format,
+            self.get_validator_stats(),
+        )
+
+    def get(self, request, *args, **kwargs):
+        etag, last_modified = self.get_validators(request)
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            response = super().get(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+        response["ETag"] = etag
+        if last_modified is not None:
+            response["Last-Modified"] = http_date(last_modified)
+        return response
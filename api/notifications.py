@@ -0,0 +1,207 @@
+"""
+Bulk donor notifications for new blood requests and donation events.
+
+With ``DONOR_NOTIFICATIONS`` on, approving a ``BloodRequest`` (staff only:
+any user can post one) or creating an ``Event`` queues ``notify`` on the
+background pool (api.tasks), so the request that triggered it never waits on
+recipients or SMTP. ``notify``:
+
+* renders the subject, text/HTML email and SMS body once into a
+  ``Notification`` (templates/notifications/),
+* selects every eligible donor in one query: compatible blood group for a
+  request, any group for an event, and no donation within
+  ``DONATION_INTERVAL`` of the date needed,
+* stores one ``NotificationDelivery`` per recipient and channel with chunked
+  ``bulk_create``; running it again only adds recipients that are new,
+* and sends what is due.
+
+Deliveries go through the same claim/batch/retry machinery as the mail queue
+(api.mail): each batch is sent over one email (SMTP) or SMS connection, and
+failures are retried with ``MAIL_RETRY_DELAY`` backoff up to
+``MAIL_MAX_ATTEMPTS``. ``manage.py send_notifications`` retries from cron and
+can fan a notification out again by hand.
+"""
+
+import logging
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives
+from django.core.mail import get_connection as get_email_connection
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from core.models import BloodRequest, Event, Notification, NotificationDelivery, User
+from . import sms
+from .eligibility import COMPATIBLE_DONOR_GROUPS, eligible_donor_filter
+from .mail import claim_batch, record_results, release_stale_claims, send_messages
+
+logger = logging.getLogger(__name__)
+
+# Deliveries per bulk_create
+INSERT_CHUNK_SIZE = 1000
+
+
+def blood_request_recipients(blood_request):
+    return User.objects.filter(
+        eligible_donor_filter(
+            "last_donation_date", on_date=blood_request.date_required
+        ),
+        is_active=True,
+        blood_group__in=COMPATIBLE_DONOR_GROUPS.get(blood_request.blood_group, []),
+    ).exclude(pk=blood_request.user_id)
+
+
+def event_recipients(event):
+    return User.objects.filter(
+        eligible_donor_filter(
+            "last_donation_date", on_date=timezone.localdate(event.date)
+        ),
+        is_active=True,
+    ).exclude(blood_group="")
+
+
+def blood_request_subject(blood_request):
+    return f"{blood_request.blood_group} blood needed in {blood_request.location}"
+
+
+def event_subject(event):
+    return f"Blood donation event: {event.title}"
+
+
+# kind -> (model, template/context name, subject, recipient query)
+KINDS = {
+    Notification.KIND_BLOOD_REQUEST: (
+        BloodRequest,
+        "blood_request",
+        blood_request_subject,
+        blood_request_recipients,
+    ),
+    Notification.KIND_EVENT: (Event, "event", event_subject, event_recipients),
+}
+
+
+def render(kind, obj):
+    """Subject and bodies of the notification about ``obj``, for every recipient."""
+    _, name, subject, _ = KINDS[kind]
+    context = {name: obj}
+    return {
+        "subject": subject(obj)[:255],
+        "body": render_to_string(f"notifications/{name}.txt", context),
+        "html_body": render_to_string(f"notifications/{name}.html", context),
+        "sms_body": render_to_string(f"notifications/{name}_sms.txt", context).strip(),
+    }
+
+
+def enabled_channels():
+    channels = [NotificationDelivery.CHANNEL_EMAIL]
+    if sms.is_enabled():
+        channels.append(NotificationDelivery.CHANNEL_SMS)
+    return channels
+
+
+def queue_deliveries(notification, recipients):
+    """Add a queued delivery per recipient and channel; returns recipients seen."""
+    channels = enabled_channels()
+    rows = list(recipients.order_by("pk").values_list("pk", "email", "phone"))
+    deliveries = []
+    for user_id, email, phone in rows:
+        for channel, address in (
+            (NotificationDelivery.CHANNEL_EMAIL, email),
+            (NotificationDelivery.CHANNEL_SMS, phone.strip()),
+        ):
+            if address and channel in channels:
+                deliveries.append(
+                    NotificationDelivery(
+                        notification=notification,
+                        user_id=user_id,
+                        channel=channel,
+                        address=address,
+                    )
+                )
+    for start in range(0, len(deliveries), INSERT_CHUNK_SIZE):
+        # recipients queued by an earlier run are skipped
+        NotificationDelivery.objects.bulk_create(
+            deliveries[start : start + INSERT_CHUNK_SIZE], ignore_conflicts=True
+        )
+    return len(rows)
+
+
+def notify(kind, object_id, send=True):
+    """
+    Render and fan out the notification about a blood request/event, then
+    send it unless ``send`` is false; returns the ``Notification`` or None
+    when the object is gone.
+    """
+    model, _, _, recipients = KINDS[kind]
+    obj = model.objects.filter(pk=object_id).first()
+    if obj is None:
+        return None
+    notification, _ = Notification.objects.get_or_create(
+        kind=kind, object_id=object_id, defaults=render(kind, obj)
+    )
+    count = queue_deliveries(notification, recipients(obj))
+    logger.info("Notifying %s donor(s) about %s", count, notification)
+    if send:
+        send_pending()
+    return notification
+
+
+def build_email(notification, address):
+    message = EmailMultiAlternatives(
+        notification.subject,
+        notification.body,
+        settings.DEFAULT_FROM_EMAIL or None,
+        [address],
+    )
+    if notification.html_body:
+        message.attach_alternative(notification.html_body, "text/html")
+    return message
+
+
+def build_sms(notification, address):
+    return sms.SMSMessage(notification.sms_body or notification.subject, address)
+
+
+CHANNELS = {
+    NotificationDelivery.CHANNEL_EMAIL: (
+        build_email,
+        lambda: get_email_connection(fail_silently=False),
+    ),
+    NotificationDelivery.CHANNEL_SMS: (build_sms, sms.get_connection),
+}
+
+
+def send_channel(channel, batch_size=None):
+    """Send due deliveries of one channel, batch by batch; returns (sent, failed)."""
+    build, get_connection = CHANNELS[channel]
+    queryset = NotificationDelivery.objects.filter(channel=channel)
+    notifications = {}
+    sent = failed = 0
+    while True:
+        deliveries = claim_batch(batch_size, queryset=queryset)
+        if not deliveries:
+            return sent, failed
+        missing = {d.notification_id for d in deliveries} - notifications.keys()
+        if missing:
+            notifications.update(Notification.objects.in_bulk(missing))
+        messages = [
+            build(notifications[d.notification_id], d.address) for d in deliveries
+        ]
+        errors = send_messages(messages, get_connection())
+        batch_sent, batch_failed = record_results(deliveries, errors)
+        sent += batch_sent
+        failed += batch_failed
+        if not batch_sent:
+            # nothing got through (backend down?): leave the rest for later
+            return sent, failed
+
+
+def send_pending(batch_size=None):
+    """Send everything due on the enabled channels; returns (sent, failed)."""
+    release_stale_claims(NotificationDelivery.objects.all())
+    sent = failed = 0
+    for channel in enabled_channels():
+        channel_sent, channel_failed = send_channel(channel, batch_size)
+        sent += channel_sent
+        failed += channel_failed
+    return sent, failed
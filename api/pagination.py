@@ -0,0 +1,60 @@
+from django.conf import settings
+from rest_framework.pagination import CursorPagination, LimitOffsetPagination
+
+
+class KeysetCursorPagination(CursorPagination):
+    """
+    Keyset (cursor) pagination shared by every list endpoint.
+
+    - Ordering comes from the view's ``cursor_ordering`` when set, otherwise
+      ``-created_at, -id`` for models that carry ``created_at`` and ``-id``
+      for the rest. The trailing ``id`` keeps the order stable.
+    - Pages hold ``API_PAGE_SIZE`` rows; ``?limit=`` lets the client ask for
+      a smaller/larger page, capped at ``API_MAX_PAGE_SIZE``. Both are read
+      per request, so settings overrides apply.
+    - While ``API_PAGINATE_BY_DEFAULT`` is off, a list is only paginated when
+      the client sends ``?cursor=`` or ``?limit=`` so existing callers that
+      expect a plain array keep working.
+    """
+
+    page_size_query_param = "limit"
+
+    def get_page_size(self, request):
+        self.page_size = settings.API_PAGE_SIZE
+        self.max_page_size = settings.API_MAX_PAGE_SIZE
+        return super().get_page_size(request)
+
+    def is_requested(self, query_params):
+        return settings.API_PAGINATE_BY_DEFAULT or (
+            self.cursor_query_param in query_params
+            or self.page_size_query_param in query_params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if not self.is_requested(request.query_params):
+            return None
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_ordering(self, request, queryset, view):
+        ordering = getattr(view, "cursor_ordering", None)
+        if ordering is None:
+            field_names = {f.name for f in queryset.model._meta.concrete_fields}
+            if "created_at" in field_names:
+                ordering = ("-created_at", "-id")
+            else:
+                ordering = ("-id",)
+        if isinstance(ordering, str):
+            return (ordering,)
+        return tuple(ordering)
+
+
+class SearchResultsPagination(LimitOffsetPagination):
+    """
+    ``?limit=`` / ``?offset=`` pages for ranked search results, whose sort key
+    has too many ties (e.g. donors who never donated) for a cursor.
+    """
+
+    def get_limit(self, request):
+        self.default_limit = settings.API_PAGE_SIZE
+        self.max_limit = settings.API_MAX_PAGE_SIZE
+        return super().get_limit(request)
@@ -0,0 +1,236 @@
+"""
+Full-text search over blogs and events.
+
+Each Blog/Event has a ``core.models.SearchDocument`` row (title, plain-text
+body) maintained by signals. Queries go to the best index available:
+
+- ``fts5``: SQLite FTS5 table ``core_searchdocument_fts``, ranked by bm25
+- ``mysql``: FULLTEXT indexes, ranked by MATCH ... AGAINST relevance
+- ``python``: an in-process inverted index rebuilt whenever a document
+  changes; fine for the few thousand rows this site has
+
+Every query term must match, as a prefix, so "blo don" finds "blood donation".
+``SEARCH_BACKEND`` forces one of them; the default picks by database.
+"""
+
+import math
+import re
+from bisect import bisect_left
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.db import connection
+from django.utils.html import strip_tags
+
+from core.models import Blog, Event, SearchDocument
+from .cache import bump_model_version, get_model_version
+
+TOKEN_RE = re.compile(r"\w+")
+MAX_TERMS = 10
+TITLE_WEIGHT = 3.0
+FTS_TABLE = "core_searchdocument_fts"
+MYSQL_MIN_TOKEN = 3  # InnoDB's default innodb_ft_min_token_size
+
+KINDS = {Blog: SearchDocument.KIND_BLOG, Event: SearchDocument.KIND_EVENT}
+
+
+def tokenize(text):
+    return TOKEN_RE.findall((text or "").lower())
+
+
+def query_terms(query):
+    terms = []
+    for term in tokenize(query):
+        if term not in terms:
+            terms.append(term)
+    return terms[:MAX_TERMS]
+
+
+def document_fields(instance):
+    if isinstance(instance, Blog):
+        return {
+            "title": instance.title,
+            "body": strip_tags(instance.content),
+            "slug": instance.slug,
+            "date": instance.created_at,
+            "visible": instance.published,
+        }
+    return {
+        "title": instance.title,
+        "body": f"{strip_tags(instance.description)}\n{instance.location}",
+        "slug": "",
+        "date": instance.date,
+        "visible": True,
+    }
+
+
+def index_instance(instance):
+    SearchDocument.objects.update_or_create(
+        kind=KINDS[type(instance)],
+        object_id=instance.pk,
+        defaults=document_fields(instance),
+    )
+
+
+def remove_instance(model, pk):
+    SearchDocument.objects.filter(kind=KINDS[model], object_id=pk).delete()
+
+
+def rebuild():
+    """Re-create every document from the Blog and Event tables."""
+    documents = [
+        SearchDocument(kind=KINDS[type(obj)], object_id=obj.pk, **document_fields(obj))
+        for model in KINDS
+        for obj in model.objects.all().iterator()
+    ]
+    SearchDocument.objects.all().delete()
+    SearchDocument.objects.bulk_create(documents, batch_size=500)
+    if connection.vendor == "sqlite" and _has_fts5():
+        with connection.cursor() as cursor:
+            cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+    bump_model_version(SearchDocument)
+    return len(documents)
+
+
+def _has_fts5():
+    return FTS_TABLE in connection.introspection.table_names()
+
+
+def backend_name():
+    configured = settings.SEARCH_BACKEND
+    if configured != "auto":
+        return configured
+    if connection.vendor == "sqlite" and _has_fts5():
+        return "fts5"
+    if connection.vendor == "mysql":
+        return "mysql"
+    return "python"
+
+
+def search(query, kind=None):
+    """[(SearchDocument id, score)] for visible documents, best first."""
+    terms = query_terms(query)
+    if not terms:
+        return []
+    backend = BACKENDS[backend_name()]
+    return backend(terms, kind)
+
+
+def _kind_filter(kind, params):
+    if not kind:
+        return ""
+    params.append(kind)
+    return " AND d.kind = %s"
+
+
+def _search_fts5(terms, kind):
+    match = " ".join(f'"{term}"*' for term in terms)
+    params = [TITLE_WEIGHT, match]
+    where = _kind_filter(kind, params)
+    sql = (
+        f"SELECT d.id, bm25({FTS_TABLE}, %s, 1.0) AS rank "
+        f"FROM {FTS_TABLE} JOIN core_searchdocument d ON d.id = {FTS_TABLE}.rowid "
+        f"WHERE {FTS_TABLE} MATCH %s AND d.visible{where} "
+        "ORDER BY rank, d.id"
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        # bm25 is "lower is better"; flip it so scores grow with relevance
+        return [(pk, -rank) for pk, rank in cursor.fetchall()]
+
+
+def _search_mysql(terms, kind):
+    # words shorter than the FULLTEXT minimum are not indexed at all
+    terms = [term for term in terms if len(term) >= MYSQL_MIN_TOKEN]
+    if not terms:
+        return []
+    against = " ".join(f"+{term}*" for term in terms)
+    params = [against, TITLE_WEIGHT, against, against]
+    where = _kind_filter(kind, params)
+    sql = (
+        "SELECT d.id, MATCH(d.title) AGAINST (%s IN BOOLEAN MODE) * %s "
+        "+ MATCH(d.title, d.body) AGAINST (%s IN BOOLEAN MODE) AS score "
+        "FROM core_searchdocument d "
+        "WHERE MATCH(d.title, d.body) AGAINST (%s IN BOOLEAN MODE) "
+        f"AND d.visible{where} ORDER BY score DESC, d.id"
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [(pk, float(score)) for pk, score in cursor.fetchall()]
+
+
+class InvertedIndex:
+    """term -> {document id: weighted term frequency}, plus per-doc metadata."""
+
+    def __init__(self, documents):
+        self.postings = defaultdict(dict)
+        self.kinds = {}
+        for pk, kind, title, body in documents:
+            self.kinds[pk] = kind
+            weights = Counter()
+            for term in tokenize(title):
+                weights[term] += TITLE_WEIGHT
+            for term in tokenize(body):
+                weights[term] += 1
+            for term, weight in weights.items():
+                self.postings[term][pk] = weight
+        self.vocabulary = sorted(self.postings)
+
+    def expand(self, prefix):
+        start = bisect_left(self.vocabulary, prefix)
+        for term in self.vocabulary[start:]:
+            if not term.startswith(prefix):
+                break
+            yield term
+
+    def search(self, terms, kind=None):
+        total = len(self.kinds) or 1
+        scores = None
+        for prefix in terms:
+            term_scores = Counter()
+            for term in self.expand(prefix):
+                postings = self.postings[term]
+                idf = math.log(1 + total / len(postings))
+                for pk, weight in postings.items():
+                    term_scores[pk] += weight * idf
+            if scores is None:
+                scores = term_scores
+            else:
+                # every query term has to match
+                scores = Counter(
+                    {
+                        pk: s + term_scores[pk]
+                        for pk, s in scores.items()
+                        if pk in term_scores
+                    }
+                )
+            if not scores:
+                return []
+        hits = [
+            (pk, score)
+            for pk, score in scores.items()
+            if not kind or self.kinds[pk] == kind
+        ]
+        hits.sort(key=lambda hit: (-hit[1], hit[0]))
+        return hits
+
+
+_index = {}
+
+
+def get_index():
+    """The in-process index, rebuilt when the document set has changed."""
+    version = get_model_version(SearchDocument)
+    if _index.get("version") != version:
+        documents = SearchDocument.objects.filter(visible=True).values_list(
+            "pk", "kind", "title", "body"
+        )
+        _index.update(version=version, index=InvertedIndex(documents.iterator()))
+    return _index["index"]
+
+
+def _search_python(terms, kind):
+    return get_index().search(terms, kind)
+
+
+BACKENDS = {"fts5": _search_fts5, "mysql": _search_mysql, "python": _search_python}
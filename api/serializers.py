@@ -1,4 +1,3 @@
-from datetime import timedelta
 from rest_framework import serializers
 from core.models import (
     About,
@@ -23,9 +22,13 @@ from core.models import (
     BloodDonation,
     User,
     Image,
+    SearchDocument,
 )
 from django.utils import timezone
+from django.utils.text import Truncator
 
+from . import uploads
+from .eligibility import find_conflicting_donation_date
 
 # api/serializers.py
 
@@ -154,11 +157,67 @@ class UserSerializer(serializers.ModelSerializer):
         return instance
 
 
+class UserSummarySerializer(serializers.ModelSerializer):
+    """Read-only slice of the user embedded in donation/request/comment rows."""
+
+    name = serializers.SerializerMethodField()
+
+    class Meta:
+        model = User
+        fields = [
+            "id",
+            "email",
+            "first_name",
+            "last_name",
+            "name",
+            "phone",
+            "blood_group",
+            "last_donation_date",
+        ]
+        read_only_fields = fields
+
+    def get_name(self, obj):
+        full_name = f"{obj.first_name.strip()} {obj.last_name.strip()}".strip()
+        return full_name if full_name else obj.email
+
+
 class ImageSerializer(serializers.ModelSerializer):
+    # {"webp": "<url> 320w, <url> 640w", "jpeg": ...}; empty until processed
+    srcset = serializers.SerializerMethodField()
+
     class Meta:
         model = Image
-        fields = ["id", "image", "blog", "event", "team_member", "about"]
-        read_only_fields = ["blog", "event", "team_member", "about"]
+        fields = [
+            "id",
+            "image",
+            "srcset",
+            "status",
+            "blog",
+            "event",
+            "team_member",
+            "about",
+        ]
+        read_only_fields = ["status", "blog", "event", "team_member", "about"]
+        # blank on the model only while an API upload is pending
+        extra_kwargs = {"image": {"required": True, "allow_null": False}}
+
+    def get_srcset(self, obj):
+        if not obj.image or (obj.variants or {}).get("source") != obj.image.name:
+            return {}
+        storage = obj.image.storage
+        request = self.context.get("request")
+        srcset = {}
+        for fmt, widths in (obj.variants or {}).items():
+            if fmt == "source":
+                continue
+            candidates = []
+            for width, name in sorted(widths.items(), key=lambda item: int(item[0])):
+                url = storage.url(name)
+                if request is not None:
+                    url = request.build_absolute_uri(url)
+                candidates.append(f"{url} {width}w")
+            srcset[fmt] = ", ".join(candidates)
+        return srcset
 
 
 class BlogSerializer(serializers.ModelSerializer):
@@ -169,6 +228,13 @@ class BlogSerializer(serializers.ModelSerializer):
         required=False,
         allow_empty=True,
     )
+    # with image_files on update: ids of current images to keep
+    keep_images = serializers.ListField(
+        child=serializers.IntegerField(),
+        write_only=True,
+        required=False,
+        allow_empty=True,
+    )
 
     class Meta:
         model = Blog
@@ -181,32 +247,32 @@ class BlogSerializer(serializers.ModelSerializer):
             "published",
             "images",
             "image_files",
+            "keep_images",
         ]
         read_only_fields = ["created_at", "slug", "images"]
 
     def create(self, validated_data):
         image_files = validated_data.pop("image_files", [])
+        validated_data.pop("keep_images", None)
         blog = Blog.objects.create(**validated_data)  # slug auto-generates
-        for image_file in image_files:
-            Image.objects.create(blog=blog, image=image_file)
+        uploads.add_images(image_files, blog=blog)
         return blog
 
     def update(self, instance, validated_data):
         image_files = validated_data.pop("image_files", None)
+        keep_images = validated_data.pop("keep_images", None)
         # don’t allow slug changes from payload
         validated_data.pop("slug", None)
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
         instance.save()
-        if image_files is not None:
-            Image.objects.filter(blog=instance).delete()
-            for image_file in image_files:
-                Image.objects.create(blog=instance, image=image_file)
+        if image_files is not None or keep_images is not None:
+            uploads.replace_images(image_files or [], keep_images or [], blog=instance)
         return instance
 
 
 class BlogCommentSerializer(serializers.ModelSerializer):
-    user = UserSerializer(read_only=True)
+    user = UserSummarySerializer(read_only=True)
 
     class Meta:
         model = BlogComment
@@ -222,6 +288,13 @@ class EventSerializer(serializers.ModelSerializer):
         required=False,
         allow_empty=True,
     )
+    # with image_files on update: ids of current images to keep
+    keep_images = serializers.ListField(
+        child=serializers.IntegerField(),
+        write_only=True,
+        required=False,
+        allow_empty=True,
+    )
     description = serializers.CharField(allow_blank=True)
     is_active = serializers.BooleanField(required=False)
 
@@ -236,24 +309,31 @@ class EventSerializer(serializers.ModelSerializer):
             "is_active",
             "images",
             "image_files",
+            "keep_images",
         ]
 
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        # the stored flag is only flipped periodically; report expiry as of now
+        if data.get("is_active") and instance.is_expired:
+            data["is_active"] = False
+        return data
+
     def create(self, validated_data):
         image_files = validated_data.pop("image_files", [])
+        validated_data.pop("keep_images", None)
         event = Event.objects.create(**validated_data)
-        for image_file in image_files:
-            Image.objects.create(event=event, image=image_file)
+        uploads.add_images(image_files, event=event)
         return event
 
     def update(self, instance, validated_data):
         image_files = validated_data.pop("image_files", None)
+        keep_images = validated_data.pop("keep_images", None)
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
         instance.save()
-        if image_files is not None:
-            Image.objects.filter(event=instance).delete()
-            for image_file in image_files:
-                Image.objects.create(event=instance, image=image_file)
+        if image_files is not None or keep_images is not None:
+            uploads.replace_images(image_files or [], keep_images or [], event=instance)
         return instance
 
 
@@ -292,7 +372,7 @@ class TopDonorSerializer(serializers.ModelSerializer):
 
 
 class BloodRequestSerializer(serializers.ModelSerializer):
-    user = UserSerializer(read_only=True)
+    user = UserSummarySerializer(read_only=True)
 
     class Meta:
         model = BloodRequest
@@ -305,13 +385,20 @@ class BloodRequestSerializer(serializers.ModelSerializer):
             "reason",
             "date_required",
             "collection_location",
+            "approved",
         ]
+        read_only_fields = ["user", "approved"]
+
+
+class AdminBloodRequestSerializer(BloodRequestSerializer):
+    class Meta(BloodRequestSerializer.Meta):
         read_only_fields = ["user"]
 
 
 class BloodDonationInterestSerializer(serializers.ModelSerializer):
-    user = UserSerializer(read_only=True)
-    donation_id = serializers.IntegerField(source="donation.id", read_only=True)
+    user = UserSummarySerializer(read_only=True)
+    # read the FK column directly instead of loading the related donation
+    donation_id = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = BloodDonationInterest
@@ -328,7 +415,7 @@ class BloodDonationInterestSerializer(serializers.ModelSerializer):
     def validate(self, data):
         """
         Enforce the 3-month rule using only confirmed donations (BloodDonation),
-        and compare against the chosen available_date.
+        on either side of the chosen available_date.
         """
         request = self.context.get("request")
         user = getattr(request, "user", None)
@@ -339,16 +426,12 @@ class BloodDonationInterestSerializer(serializers.ModelSerializer):
         if not available_date:
             return data
 
-        # Look up the user's latest confirmed donation
-        latest = (
-            BloodDonation.objects.filter(user=user).order_by("-donation_date").first()
-        )
-
-        if latest and available_date < (latest.donation_date + timedelta(days=90)):
+        conflict = find_conflicting_donation_date(user, available_date)
+        if conflict:
             raise serializers.ValidationError(
                 {
                     "available_date": (
-                        f"You can donate only after 3 months from your last donation on {latest.donation_date}."
+                        f"You can donate only after 3 months from your last donation on {conflict}."
                     )
                 }
             )
@@ -361,7 +444,7 @@ class BloodDonationInterestSerializer(serializers.ModelSerializer):
 
 
 class BloodDonationSerializer(serializers.ModelSerializer):
-    user = UserSerializer(read_only=True)
+    user = UserSummarySerializer(read_only=True)
 
     class Meta:
         model = BloodDonation
@@ -383,8 +466,8 @@ class BloodDonationSerializer(serializers.ModelSerializer):
 
     def validate(self, data):
         """
-        Enforce 90-day spacing by checking nearest existing donations before/after
-        the submitted donation_date for this user.
+        Enforce 90-day spacing: no other donation by this user may fall within
+        90 days either side of the submitted donation_date.
         """
         user = self.context["request"].user if "request" in self.context else None
         if not user or not user.is_authenticated:
@@ -394,31 +477,19 @@ class BloodDonationSerializer(serializers.ModelSerializer):
         if not donation_date:
             return data
 
-        qs = BloodDonation.objects.filter(user=user)
-
-        prev_donation = (
-            qs.filter(donation_date__lt=donation_date)
-            .order_by("-donation_date")
-            .first()
+        conflict = find_conflicting_donation_date(
+            user, donation_date, exclude_pk=getattr(self.instance, "pk", None)
         )
-        if prev_donation and donation_date < (
-            prev_donation.donation_date + timedelta(days=90)
-        ):
+        if conflict and conflict <= donation_date:
             raise serializers.ValidationError(
                 {
-                    "donation_date": f"You must wait 3 months after your previous donation on {prev_donation.donation_date}."
+                    "donation_date": f"You must wait 3 months after your previous donation on {conflict}."
                 }
             )
-
-        next_donation = (
-            qs.filter(donation_date__gt=donation_date).order_by("donation_date").first()
-        )
-        if next_donation and next_donation.donation_date < (
-            donation_date + timedelta(days=90)
-        ):
+        if conflict:
             raise serializers.ValidationError(
                 {
-                    "donation_date": f"This date conflicts with an existing donation on {next_donation.donation_date} (less than 3 months apart)."
+                    "donation_date": f"This date conflicts with an existing donation on {conflict} (less than 3 months apart)."
                 }
             )
 
@@ -556,3 +627,17 @@ class HomeAboutAchievementSerializer(serializers.ModelSerializer):
     class Meta:
         model = HomeAboutAchievement
         fields = ["id", "title", "description", "icon"]
+
+
+class SearchResultSerializer(serializers.ModelSerializer):
+    type = serializers.CharField(source="kind")
+    id = serializers.IntegerField(source="object_id")
+    excerpt = serializers.SerializerMethodField()
+    score = serializers.FloatField()
+
+    class Meta:
+        model = SearchDocument
+        fields = ["type", "id", "title", "slug", "date", "excerpt", "score"]
+
+    def get_excerpt(self, obj):
+        return Truncator(" ".join(obj.body.split())).chars(200)
@@ -0,0 +1,193 @@
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from core.models import (
+    About,
+    Achievement,
+    Blog,
+    BloodDonationInterest,
+    BloodDonor,
+    BloodRequest,
+    Event,
+    HomeAbout,
+    HomeAboutAchievement,
+    Image,
+    Mission,
+    MissionStatement,
+    Notification,
+    SearchDocument,
+    Service,
+    TeamMember,
+    User,
+)
+from . import images, matching, notifications, search, tasks, uploads
+from .cache import bump_model_version
+from .eligibility import COMPATIBLE_DONOR_GROUPS
+
+# Models behind the cached public endpoints (CachedResponseMixin.cache_models)
+CACHED_CONTENT_MODELS = [
+    About,
+    Achievement,
+    HomeAbout,
+    HomeAboutAchievement,
+    Image,
+    Mission,
+    MissionStatement,
+    Service,
+    TeamMember,
+]
+
+
+def bump_content_version(sender, **kwargs):
+    bump_model_version(sender)
+
+
+for model in CACHED_CONTENT_MODELS:
+    post_save.connect(
+        bump_content_version,
+        sender=model,
+        dispatch_uid=f"cache-save-{model._meta.label}",
+    )
+    post_delete.connect(
+        bump_content_version,
+        sender=model,
+        dispatch_uid=f"cache-delete-{model._meta.label}",
+    )
+
+
+# Donor matching index (api.matching)
+USER_MATCH_FIELDS = {
+    "first_name",
+    "last_name",
+    "email",
+    "phone",
+    "blood_group",
+    "is_active",
+    "last_donation_date",
+}
+
+
+def _touches_matching(sender, update_fields):
+    # skip saves such as last_login updates that don't touch matching data
+    return not (
+        sender is User
+        and update_fields
+        and not USER_MATCH_FIELDS.intersection(update_fields)
+    )
+
+
+@receiver(pre_save, sender=User, dispatch_uid="match-user-pre-save")
+@receiver(pre_save, sender=BloodDonor, dispatch_uid="match-donor-pre-save")
+@receiver(
+    pre_save, sender=BloodDonationInterest, dispatch_uid="match-interest-pre-save"
+)
+def remember_match_group(sender, instance, update_fields=None, **kwargs):
+    # the bucket a candidate moves out of needs rebuilding too
+    instance._match_group = None
+    if instance._state.adding or not _touches_matching(sender, update_fields):
+        return
+    if update_fields is None or "blood_group" in update_fields:
+        instance._match_group = (
+            sender._default_manager.filter(pk=instance.pk)
+            .values_list("blood_group", flat=True)
+            .first()
+        )
+
+
+@receiver(post_save, sender=User, dispatch_uid="match-user-save")
+@receiver(post_save, sender=BloodDonor, dispatch_uid="match-donor-save")
+@receiver(post_save, sender=BloodDonationInterest, dispatch_uid="match-interest-save")
+def reindex_candidate(sender, instance, update_fields=None, **kwargs):
+    if _touches_matching(sender, update_fields):
+        matching.invalidate(
+            [instance.blood_group, getattr(instance, "_match_group", None)]
+        )
+
+
+@receiver(post_delete, sender=User, dispatch_uid="match-user-delete")
+@receiver(post_delete, sender=BloodDonor, dispatch_uid="match-donor-delete")
+@receiver(
+    post_delete, sender=BloodDonationInterest, dispatch_uid="match-interest-delete"
+)
+def unindex_candidate(sender, instance, **kwargs):
+    matching.invalidate([instance.blood_group])
+
+
+@receiver(post_save, sender=BloodRequest, dispatch_uid="match-request-save")
+def warm_request_buckets(sender, instance, raw=False, **kwargs):
+    # rebuilding a bucket scans its whole group: keep it off the request
+    if not raw:
+        tasks.submit(
+            matching.warm, COMPATIBLE_DONOR_GROUPS.get(instance.blood_group, [])
+        )
+
+
+# Responsive image variants (api.images)
+@receiver(post_save, sender=Image, dispatch_uid="image-variants-save")
+def queue_image_variants(sender, instance, raw=False, **kwargs):
+    if not raw and images.needs_variants(instance):
+        tasks.submit(images.generate_variants, instance.pk)
+
+
+@receiver(post_save, sender=Image, dispatch_uid="image-parents-save")
+@receiver(post_delete, sender=Image, dispatch_uid="image-parents-delete")
+def touch_image_parents(sender, instance, raw=False, **kwargs):
+    # the parent's validators only see its own rows: an added, edited or
+    # removed image has to move its updated_at and cached version
+    if not raw:
+        images.touch_parents(instance)
+
+
+@receiver(post_delete, sender=Image, dispatch_uid="image-variants-delete")
+def delete_image_variants(sender, instance, **kwargs):
+    names = images.variant_names(instance.variants)
+    if names:
+        tasks.submit(images.delete_variant_files, names)
+    if instance.staged_file:
+        tasks.submit(uploads.discard_staged, instance.staged_file)
+
+
+# Full-text search documents (api.search)
+@receiver(post_save, sender=Blog, dispatch_uid="search-blog-save")
+@receiver(post_save, sender=Event, dispatch_uid="search-event-save")
+def index_search_document(sender, instance, raw=False, **kwargs):
+    if not raw:
+        search.index_instance(instance)
+
+
+@receiver(post_delete, sender=Blog, dispatch_uid="search-blog-delete")
+@receiver(post_delete, sender=Event, dispatch_uid="search-event-delete")
+def remove_search_document(sender, instance, **kwargs):
+    search.remove_instance(sender, instance.pk)
+
+
+# the Python fallback index is rebuilt when this version moves
+post_save.connect(
+    bump_content_version, sender=SearchDocument, dispatch_uid="search-doc-save"
+)
+post_delete.connect(
+    bump_content_version, sender=SearchDocument, dispatch_uid="search-doc-delete"
+)
+
+
+# Donor notifications (api.notifications), fanned out after commit
+@receiver(post_save, sender=BloodRequest, dispatch_uid="notify-request-save")
+def notify_blood_request(sender, instance, raw=False, **kwargs):
+    # anyone can post a request: only fan out once staff approved it
+    if (
+        not raw
+        and instance.approved
+        and settings.DONOR_NOTIFICATIONS
+        and not Notification.objects.filter(
+            kind=Notification.KIND_BLOOD_REQUEST, object_id=instance.pk
+        ).exists()
+    ):
+        tasks.submit(notifications.notify, Notification.KIND_BLOOD_REQUEST, instance.pk)
+
+
+@receiver(post_save, sender=Event, dispatch_uid="notify-event-save")
+def notify_event(sender, instance, created=False, raw=False, **kwargs):
+    # events created already in the past are saved inactive
+    if created and not raw and instance.is_active and settings.DONOR_NOTIFICATIONS:
+        tasks.submit(notifications.notify, Notification.KIND_EVENT, instance.pk)
@@ -0,0 +1,68 @@
+"""
+Pluggable SMS sending, shaped like Django's email backends.
+
+``SMS_BACKEND`` names a class with ``open()``, ``close()`` and
+``send_messages(messages)``; a provider integration only has to implement
+those. Leave it empty to send no SMS at all. ``LocmemBackend`` collects
+messages in ``api.sms.outbox`` (tests) and ``ConsoleBackend`` prints them
+(local development).
+"""
+
+import sys
+import threading
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+outbox = []
+
+
+class SMSMessage:
+    def __init__(self, body, to):
+        self.body = body
+        self.to = to
+
+    def __repr__(self):
+        return f"<SMSMessage to {self.to}>"
+
+
+class BaseBackend:
+    def __init__(self, fail_silently=False, **kwargs):
+        self.fail_silently = fail_silently
+
+    def open(self):
+        pass
+
+    def close(self):
+        pass
+
+    def send_messages(self, messages):
+        raise NotImplementedError
+
+
+class LocmemBackend(BaseBackend):
+    def send_messages(self, messages):
+        outbox.extend(messages)
+        return len(messages)
+
+
+class ConsoleBackend(BaseBackend):
+    def __init__(self, *args, stream=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stream = stream or sys.stdout
+        self._lock = threading.Lock()
+
+    def send_messages(self, messages):
+        with self._lock:
+            for message in messages:
+                self.stream.write(f"SMS to {message.to}: {message.body}\n")
+            self.stream.flush()
+        return len(messages)
+
+
+def is_enabled():
+    return bool(settings.SMS_BACKEND)
+
+
+def get_connection(backend=None, **kwargs):
+    return import_string(backend or settings.SMS_BACKEND)(**kwargs)
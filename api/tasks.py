@@ -0,0 +1,62 @@
+"""
+Minimal background work for slow, non-critical jobs (image processing).
+
+``submit`` queues a call to run on a per-process thread pool once the
+current transaction commits, so the request that triggered it returns
+without waiting and the worker never sees uncommitted rows. Jobs are lost if
+the process exits first; every job here can be redone from the database
+(e.g. ``manage.py build_image_variants``).
+
+With ``BACKGROUND_TASKS_EAGER`` the call runs inline on commit instead, which
+is what tests and management commands want.
+"""
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import connections, transaction
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.BACKGROUND_TASK_WORKERS,
+                thread_name_prefix="background-task",
+            )
+        return _executor
+
+
+def _run(func, args, kwargs):
+    try:
+        func(*args, **kwargs)
+    except Exception:
+        logger.exception("Background task %s failed", func.__qualname__)
+
+
+def _run_in_worker(func, args, kwargs):
+    try:
+        _run(func, args, kwargs)
+    finally:
+        # worker threads get their own connections; don't leak them
+        connections.close_all()
+
+
+def submit(func, *args, **kwargs):
+    """Run ``func(*args, **kwargs)`` in the background after commit."""
+
+    def enqueue():
+        if settings.BACKGROUND_TASKS_EAGER:
+            _run(func, args, kwargs)
+        else:
+            _get_executor().submit(_run_in_worker, func, args, kwargs)
+
+    transaction.on_commit(enqueue)
@@ -1,3 +1,1491 @@
-from django.test import TestCase
+import io
+import json
+import os
+import re
+import shutil
+import tempfile
+from datetime import date, timedelta
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.core import mail
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.core.handlers.asgi import ASGIHandler
+from django.test import AsyncRequestFactory, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from PIL import Image as PILImage
+from rest_framework.test import APIClient
+
+from api import matching, sms
+from api.async_views import AsyncPublicView
+from api.benchmarks import compare, run
+from api.conversions import INTEREST_FIELDS, _lock
+from api.images import variant_names
+from api.mail import claim_batch, send_queued
+from api.metrics import registry
+from api.notifications import notify, send_pending
+from api.serializers import ImageSerializer
+from api.uploads import store_upload
+from api.views import BlogDetailView, BlogListView, ServiceListView
+from core.models import (
+    Blog,
+    BlogComment,
+    BloodDonation,
+    BloodDonationInterest,
+    BloodDonor,
+    BloodRequest,
+    Event,
+    Image,
+    Notification,
+    NotificationDelivery,
+    OutboundEmail,
+    SearchDocument,
+    Service,
+    TeamMember,
+    User,
+)
+from core.seeding import DONATION_SPACING, seed
+
+
+class AdminListQueryCountTests(TestCase):
+    """Admin lists embedding the user must not issue a query per row."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(
+            email="admin@example.com", password="x", is_staff=True
+        )
+        cls.blog = Blog.objects.create(title="Post", content="...", published=True)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def _add_rows(self, start, count):
+        for i in range(start, start + count):
+            user = User.objects.create_user(email=f"donor{i}@example.com")
+            BloodRequest.objects.create(
+                user=user,
+                blood_group="O-",
+                location="Dhaka",
+                contact="017",
+                date_required=date.today(),
+            )
+            donation = BloodDonation.objects.create(
+                user=user, blood_group="O-", donation_date=date.today()
+            )
+            BloodDonationInterest.objects.create(
+                user=user,
+                blood_group="O-",
+                available_date=date.today() + timedelta(days=1),
+                contact_info="017",
+                donation=donation,
+            )
+            BlogComment.objects.create(user=user, blog=self.blog, comment="hi")
+
+    def assertConstantQueries(self, url_name):
+        self._add_rows(0, 2)
+        with self.assertNumQueries(1):
+            self.assertEqual(len(self.client.get(reverse(url_name)).json()), 2)
+        self._add_rows(2, 8)
+        with self.assertNumQueries(1):
+            self.assertEqual(len(self.client.get(reverse(url_name)).json()), 10)
+
+    def test_blood_requests(self):
+        self.assertConstantQueries("admin-blood-request-list-create")
+
+    def test_donation_interests(self):
+        self.assertConstantQueries("admin-donation-interest-list-create")
+
+    def test_comments(self):
+        self.assertConstantQueries("admin-comment-list-create")
+
+    def test_donations(self):
+        self.assertConstantQueries("admin-donation-list-create")
+
+
+class ImagePrefetchQueryCountTests(TestCase):
+    """Lists nesting ``images`` prefetch them in one extra query."""
+
+    def test_500_blog_list(self):
+        blogs = Blog.objects.bulk_create(
+            Blog(title=f"Post {i}", slug=f"post-{i}", content="...", published=True)
+            for i in range(500)
+        )
+        Image.objects.bulk_create(
+            Image(blog=blog, image=f"images/{blog.slug}.jpg") for blog in blogs
+        )
+        # validators aggregate + blogs + images
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse("blog-list"))
+        self.assertEqual(len(response.json()), 500)
+        self.assertEqual(len(json.loads(response.content)[0]["images"]), 1)
+
+
+class ContentCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_served_from_cache_until_model_changes(self):
+        service = Service.objects.create(name="Blood bank", description="...")
+        self.client.get(reverse("service-list"))
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse("service-list"))
+        self.assertEqual(response.json()[0]["name"], "Blood bank")
+
+        service.name = "Vaccination"
+        service.save()
+        response = self.client.get(reverse("service-list"))
+        self.assertEqual(response.json()[0]["name"], "Vaccination")
+
+        service.delete()
+        self.assertEqual(self.client.get(reverse("service-list")).json(), [])
+
+    def test_validators_of_cached_views_come_from_the_cache(self):
+        member = TeamMember.objects.create(name="Rahim", role="Lead", session="24")
+        url = reverse("team-member-list")
+        first = self.client.get(url)
+        self.assertIn("Last-Modified", first)
+        with self.assertNumQueries(0):
+            response = self.client.get(url)
+            self.assertEqual(response["ETag"], first["ETag"])
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+            self.assertEqual(response.status_code, 304)
+
+        member.role = "Chair"
+        member.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], first["ETag"])
+
+
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        self.blog = Blog.objects.create(title="Post", content="...", published=True)
+
+    def test_list_not_modified_until_changed(self):
+        url = reverse("blog-list")
+        etag = self.client.get(url)["ETag"]
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        self.blog.content = "edited"
+        self.blog.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_detail_if_modified_since(self):
+        url = reverse("blog-detail", kwargs={"slug": self.blog.slug})
+        last_modified = self.client.get(url)["Last-Modified"]
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 304)
+
+    def test_missing_detail_has_no_validators(self):
+        response = self.client.get(reverse("blog-detail", kwargs={"slug": "nope"}))
+        self.assertEqual(response.status_code, 404)
+        self.assertNotIn("ETag", response)
+
+
+class KeysetPaginationTests(TestCase):
+    def setUp(self):
+        blogs = [
+            Blog.objects.create(title=f"Post {i}", content="...", published=True)
+            for i in range(5)
+        ]
+        # ties on created_at are broken by id
+        Blog.objects.update(created_at=blogs[0].created_at)
+        self.expected = [b.id for b in reversed(blogs)]
+        self.url = reverse("blog-list")
+
+    def test_plain_list_unless_asked(self):
+        data = self.client.get(self.url).json()
+        self.assertIsInstance(data, list)
+        self.assertCountEqual([b["id"] for b in data], self.expected)
+
+    def test_next_cursor_walks_every_row_once(self):
+        seen = []
+        url = f"{self.url}?limit=2"
+        while url:
+            data = self.client.get(url).json()
+            self.assertLessEqual(len(data["results"]), 2)
+            seen += [b["id"] for b in data["results"]]
+            url = data["next"]
+        self.assertEqual(seen, self.expected)
+
+    @override_settings(API_PAGINATE_BY_DEFAULT=True, API_PAGE_SIZE=3)
+    def test_paginated_by_default_when_switched_on(self):
+        data = self.client.get(self.url).json()
+        self.assertEqual([b["id"] for b in data["results"]], self.expected[:3])
+        data = self.client.get(data["next"]).json()
+        self.assertEqual([b["id"] for b in data["results"]], self.expected[3:])
+        self.assertIsNone(data["next"])
+
+    @override_settings(API_MAX_PAGE_SIZE=2)
+    def test_limit_capped_at_max_page_size(self):
+        data = self.client.get(self.url, {"limit": 4}).json()
+        self.assertEqual([b["id"] for b in data["results"]], self.expected[:2])
+
+
+class EventExpiryTests(TestCase):
+    def setUp(self):
+        now = timezone.now()
+        self.future = Event.objects.create(
+            title="Camp", description="", location="SMCH", date=now + timedelta(days=1)
+        )
+        self.lapsed = Event.objects.create(
+            title="Drive", description="", location="SMCH", date=now + timedelta(days=2)
+        )
+        Event.objects.filter(pk=self.lapsed.pk).update(date=now - timedelta(days=1))
+
+    def test_revalidation_sees_an_event_lapse(self):
+        Event.objects.update(updated_at=timezone.now() - timedelta(hours=1))
+        url = reverse("event-list")
+        detail_url = reverse("event-detail", kwargs={"id": self.future.id})
+        list_response = self.client.get(url)
+        detail = self.client.get(detail_url)
+        self.assertTrue(detail.json()["is_active"])
+        self.assertEqual(
+            self.client.get(detail_url, HTTP_IF_NONE_MATCH=detail["ETag"]).status_code,
+            304,
+        )
+
+        # its date passes: nothing is written, but the event now reads inactive
+        Event.objects.filter(pk=self.future.pk).update(
+            date=timezone.now() - timedelta(minutes=1)
+        )
+        response = self.client.get(detail_url, HTTP_IF_NONE_MATCH=detail["ETag"])
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.json()["is_active"])
+        response = self.client.get(
+            detail_url, HTTP_IF_MODIFIED_SINCE=detail["Last-Modified"]
+        )
+        self.assertEqual(response.status_code, 200)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=list_response["ETag"])
+        self.assertEqual(response.status_code, 200)
+
+    def test_listing_does_not_write(self):
+        with self.assertNumQueries(3):
+            upcoming = self.client.get(reverse("events-upcoming")).json()
+        self.assertEqual([e["id"] for e in upcoming], [self.future.id])
+
+        past = self.client.get(reverse("events-past")).json()
+        self.assertEqual([e["id"] for e in past], [self.lapsed.id])
+        self.assertFalse(past[0]["is_active"])
+        self.lapsed.refresh_from_db()
+        self.assertTrue(self.lapsed.is_active)
+
+    def test_expire_events_command(self):
+        call_command("expire_events", stdout=StringIO())
+        self.lapsed.refresh_from_db()
+        self.future.refresh_from_db()
+        self.assertFalse(self.lapsed.is_active)
+        self.assertTrue(self.future.is_active)
+
+
+class ConvertDueInterestsTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(
+            User.objects.create_user(email="admin@example.com", is_staff=True)
+        )
+        today = date.today()
+        self.alice = User.objects.create_user(
+            email="alice@example.com", blood_group="A+"
+        )
+        self.bob = User.objects.create_user(
+            email="bob@example.com", last_donation_date=today
+        )
+        self.due = [
+            BloodDonationInterest.objects.create(
+                user=self.alice,
+                blood_group="",
+                available_date=today - timedelta(days=100),
+                contact_info="1",
+            ),
+            BloodDonationInterest.objects.create(
+                user=self.alice,
+                blood_group="A+",
+                available_date=today - timedelta(days=5),
+                contact_info="1",
+            ),
+            BloodDonationInterest.objects.create(
+                user=self.bob,
+                blood_group="B+",
+                available_date=today - timedelta(days=1),
+                contact_info="2",
+            ),
+        ]
+        self.not_due = BloodDonationInterest.objects.create(
+            user=self.bob,
+            blood_group="B+",
+            available_date=today + timedelta(days=1),
+            contact_info="2",
+        )
+
+    def convert(self, **data):
+        response = self.client.post(reverse("convert-due-interests"), data)
+        self.assertEqual(response.status_code, 200)
+        return response.json()["converted"]
+
+    def assertConverted(self):
+        for interest in self.due:
+            interest.refresh_from_db()
+            self.assertEqual(interest.donation.donation_date, interest.available_date)
+            self.assertEqual(interest.donation.user_id, interest.user_id)
+        self.assertEqual(self.due[0].donation.blood_group, "A+")
+        self.not_due.refresh_from_db()
+        self.assertIsNone(self.not_due.donation)
+
+        self.alice.refresh_from_db()
+        self.bob.refresh_from_db()
+        self.assertEqual(self.alice.last_donation_date, self.due[1].available_date)
+        self.assertEqual(self.bob.last_donation_date, date.today())
+
+    def test_converts_in_batches(self):
+        self.assertEqual(self.convert(batch_size=2), 3)
+        self.assertConverted()
+        self.assertEqual(self.convert(), 0)
+
+    def test_without_bulk_insert_returning(self):
+        with mock.patch.object(
+            type(connection.features),
+            "can_return_rows_from_bulk_insert",
+            new_callable=mock.PropertyMock,
+            return_value=False,
+        ):
+            self.assertEqual(self.convert(), 3)
+        self.assertConverted()
+
+    def test_batches_are_locked_where_supported(self):
+        # SQLite has no FOR UPDATE: check the SQL a MySQL 8 style backend gets
+        with mock.patch.multiple(
+            type(connection.features),
+            has_select_for_update=True,
+            has_select_for_update_skip_locked=True,
+            has_select_for_update_of=True,
+        ):
+            sql = str(
+                _lock(BloodDonationInterest.objects.all())
+                .values(*INTEREST_FIELDS)
+                .query
+            )
+        self.assertIn("FOR UPDATE", sql)
+        self.assertIn("SKIP LOCKED", sql)
+        self.assertIn("OF", sql.split("FOR UPDATE")[1])
+
+    def test_rejects_bad_batch_size(self):
+        response = self.client.post(reverse("convert-due-interests"), {"batch_size": 0})
+        self.assertEqual(response.status_code, 400)
+
+
+class DonationEligibilityTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email="donor@example.com")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.today = date.today()
+        BloodDonation.objects.create(
+            user=self.user,
+            blood_group="O+",
+            donation_date=self.today - timedelta(days=200),
+        )
+
+    def log(self, donation_date):
+        return self.client.post(
+            reverse("my-donations"),
+            {"blood_group": "O+", "donation_date": donation_date.isoformat()},
+        )
+
+    def test_rejects_dates_within_90_days_either_side(self):
+        for offset in (-89, 0, 89):
+            donation_date = self.today - timedelta(days=200 + offset)
+            response = self.log(donation_date)
+            self.assertEqual(response.status_code, 400, offset)
+            self.assertIn("donation_date", response.json())
+
+    def test_accepts_dates_90_days_apart(self):
+        self.assertEqual(self.log(self.today - timedelta(days=110)).status_code, 201)
+        self.assertEqual(self.log(self.today - timedelta(days=290)).status_code, 201)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.last_donation_date, self.today - timedelta(days=110))
+
+    def test_profile_can_donate(self):
+        profile = self.client.get(reverse("profile")).json()
+        self.assertTrue(profile["can_donate"])
+        self.log(self.today - timedelta(days=10))
+        profile = self.client.get(reverse("profile")).json()
+        self.assertFalse(profile["can_donate"])
+
+
+class DonorSearchTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(
+            User.objects.create_user(email="admin@example.com", is_staff=True)
+        )
+        today = date.today()
+
+        def donor(name, group, days_ago=None, gender="Male", batch="K-70"):
+            return BloodDonor.objects.create(
+                name=name,
+                blood_group=group,
+                phone=name,
+                gender=gender,
+                batch=batch,
+                last_donated_date=(
+                    today - timedelta(days=days_ago) if days_ago is not None else None
+                ),
+            )
+
+        self.never = donor("never", "O-")
+        self.long_ago = donor("long-ago", "A-", days_ago=400)
+        self.recent_ago = donor("recent-ago", "O-", days_ago=120)
+        self.too_recent = donor("too-recent", "O-", days_ago=30)
+        self.incompatible = donor("incompatible", "A+", days_ago=400)
+        self.other_batch = donor("other-batch", "O-", batch="K-71", gender="Female")
+
+    def search(self, **params):
+        response = self.client.get(reverse("admin-blood-donor-search"), params)
+        self.assertEqual(response.status_code, 200)
+        return [row["name"] for row in response.json()["results"]]
+
+    def test_compatible_eligible_longest_since_first(self):
+        self.assertEqual(
+            self.search(blood_group="A-", batch="K-70"),
+            ["never", "long-ago", "recent-ago"],
+        )
+
+    def test_exact_group_gender_and_ineligible(self):
+        self.assertEqual(
+            self.search(blood_group="O-", exact="true", gender="female"),
+            ["other-batch"],
+        )
+        self.assertIn("too-recent", self.search(blood_group="O-", eligible="false"))
+
+    def test_unencoded_plus_and_unknown_group(self):
+        self.assertIn("incompatible", self.search(blood_group="A "))
+        response = self.client.get(
+            reverse("admin-blood-donor-search"), {"blood_group": "Z+"}
+        )
+        self.assertEqual(response.status_code, 400)
+
+
+class BloodRequestMatchTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(
+            User.objects.create_user(email="admin@example.com", is_staff=True)
+        )
+        self.today = date.today()
+        self.patient = User.objects.create_user(
+            email="patient@example.com", blood_group="A+"
+        )
+        self.request = BloodRequest.objects.create(
+            user=self.patient,
+            blood_group="A+",
+            location="SMCH",
+            contact="017",
+            date_required=self.today + timedelta(days=3),
+        )
+
+    def matches(self):
+        response = self.client.get(
+            reverse("blood-request-matches", kwargs={"id": self.request.id})
+        )
+        self.assertEqual(response.status_code, 200)
+        return [(m["source"], m["name"]) for m in response.json()["results"]]
+
+    def test_ranked_and_kept_current(self):
+        universal = User.objects.create_user(
+            email="o-neg@example.com", first_name="Universal", blood_group="O-"
+        )
+        BloodDonor.objects.create(
+            name="Roster A+", blood_group="A+", phone="1", gender="Male"
+        )
+        BloodDonor.objects.create(
+            name="Recent",
+            blood_group="A+",
+            phone="2",
+            gender="Male",
+            last_donated_date=self.today - timedelta(days=10),
+        )
+        BloodDonor.objects.create(
+            name="Incompatible", blood_group="B+", phone="3", gender="Male"
+        )
+        self.assertEqual(
+            self.matches(), [("donor", "Roster A+"), ("user", "Universal")]
+        )
+
+        # changes rebuild only the buckets of the groups they touch
+        interest = BloodDonationInterest.objects.create(
+            user=universal,
+            blood_group="O-",
+            available_date=self.today + timedelta(days=1),
+            contact_info="018",
+        )
+        helper = User.objects.create_user(
+            email="helper@example.com", first_name="Helper", blood_group="A-"
+        )
+        # the request, then users/donors/interests for O- and A-, not A+
+        with self.assertNumQueries(7):
+            self.assertEqual(
+                self.matches(),
+                [
+                    ("donor", "Roster A+"),
+                    ("interest", "Universal"),
+                    ("user", "Helper"),
+                ],
+            )
+
+        helper.blood_group = "B+"
+        helper.save()
+        interest.delete()
+        self.assertEqual(
+            self.matches(), [("donor", "Roster A+"), ("user", "Universal")]
+        )
+
+    @override_settings(BACKGROUND_TASKS_EAGER=True)
+    def test_new_request_warms_buckets_in_the_background(self):
+        User.objects.create_user(email="b@example.com", blood_group="B-")
+        with self.captureOnCommitCallbacks() as callbacks:
+            # only the insert runs inline, no candidate scan
+            with self.assertNumQueries(1):
+                self.request = BloodRequest.objects.create(
+                    user=self.patient,
+                    blood_group="B+",
+                    location="SMCH",
+                    contact="017",
+                    date_required=self.today,
+                )
+        for callback in callbacks:
+            callback()
+        # the request itself; both buckets are already built
+        with self.assertNumQueries(1):
+            self.assertEqual(self.matches(), [("user", "b@example.com")])
+
+    def test_bucket_built_from_old_rows_is_never_read(self):
+        self.assertEqual(self.matches(), [])
+        stale_version = matching.get_version("O-")
+        User.objects.create_user(
+            email="o-neg@example.com", first_name="Universal", blood_group="O-"
+        )
+        # another worker rebuilt O- from the rows before the insert, and
+        # stored it after our invalidation
+        cache.set(matching._bucket_key("O-", stale_version), {}, None)
+        self.assertEqual(self.matches(), [("user", "Universal")])
+
+        # the group a candidate leaves is rebuilt too
+        user = User.objects.get(email="o-neg@example.com")
+        user.blood_group = "B+"
+        user.save()
+        self.assertEqual(self.matches(), [])
+
+
+class ExportTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(
+            User.objects.create_user(email="admin@example.com", is_staff=True)
+        )
+        for i, group in enumerate(["O-", "A+", "O-"]):
+            BloodDonation.objects.create(
+                user=User.objects.create_user(email=f"d{i}@example.com"),
+                blood_group=group,
+                donation_date=date(2025, 1, 1 + i),
+            )
+
+    def export(self, name, **params):
+        response = self.client.get(
+            reverse("admin-export", kwargs={"dataset": "donations", "fmt": name}),
+            params,
+            HTTP_ACCEPT="text/csv",
+        )
+        self.assertEqual(response.status_code, 200)
+        return b"".join(response.streaming_content).decode()
+
+    def test_csv_filtered(self):
+        with self.settings(EXPORT_CHUNK_SIZE=1):
+            lines = self.export("csv", blood_group="O-", to="2025-01-02").splitlines()
+        self.assertEqual(lines[0].split(",")[:3], ["id", "user_id", "user__email"])
+        self.assertEqual(len(lines), 2)
+        self.assertIn("d0@example.com", lines[1])
+
+    def test_csv_neutralizes_formulas(self):
+        BloodDonation.objects.filter(blood_group="A+").update(
+            contact_info='=HYPERLINK("http://x")', notes="@SUM(A1)"
+        )
+        line = self.export("csv", blood_group="A+").splitlines()[1]
+        self.assertIn("'=HYPERLINK", line)
+        self.assertIn(",'@SUM(A1),", line)
+
+        rows = [json.loads(line) for line in self.export("ndjson").splitlines()]
+        self.assertEqual(rows[1]["notes"], "@SUM(A1)")
+
+        # phone numbers are data, not formulas
+        BloodDonation.objects.filter(blood_group="A+").update(
+            contact_info="+880 1711-000000", notes="-5+SUM(A1)"
+        )
+        line = self.export("csv", blood_group="A+").splitlines()[1]
+        self.assertIn(",+880 1711-000000,", line)
+        self.assertIn(",'-5+SUM(A1),", line)
+
+    def test_ndjson(self):
+        rows = [json.loads(line) for line in self.export("ndjson").splitlines()]
+        self.assertEqual(
+            [r["donation_date"] for r in rows],
+            ["2025-01-01", "2025-01-02", "2025-01-03"],
+        )
+
+    def test_unknown_dataset_and_bad_date(self):
+        url = reverse("admin-export", kwargs={"dataset": "users", "fmt": "csv"})
+        self.assertEqual(self.client.get(url).status_code, 404)
+        url = reverse("admin-export", kwargs={"dataset": "donors", "fmt": "csv"})
+        self.assertEqual(self.client.get(url, {"from": "2025-13-01"}).status_code, 400)
+
+
+class DonorImportTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(
+            User.objects.create_user(email="admin@example.com", is_staff=True)
+        )
+        BloodDonor.objects.create(
+            name="Existing", blood_group="O+", phone="+8801711000000", gender="Male"
+        )
+
+    def test_lengths_checked_and_stored_separators_ignored(self):
+        BloodDonor.objects.create(
+            name="Dashed", blood_group="A+", phone="01611-000 000", gender="Male"
+        )
+        rows = [
+            {"name": "x" * 256, "blood_group": "A+", "phone": "01511000000"},
+            {
+                "name": "Long batch",
+                "batch": "b" * 101,
+                "blood_group": "A+",
+                "phone": "01411000000",
+            },
+            {"name": "Same", "blood_group": "A+", "phone": "+880 1611 000000"},
+            {"name": "Fine", "blood_group": "A+", "phone": "01311000000"},
+        ]
+        for row in rows:
+            row["gender"] = "Male"
+        response = self.client.post(
+            reverse("admin-blood-donor-import"), rows, format="json"
+        )
+        self.assertEqual(response.status_code, 201)
+        report = response.json()
+        self.assertEqual(report["created"], 1)
+        self.assertEqual(
+            {e["row"]: sorted(e["errors"]) for e in report["errors"]},
+            {1: ["name"], 2: ["batch"], 3: ["phone"]},
+        )
+        self.assertIn("at most 255 characters", report["errors"][0]["errors"]["name"])
+
+    def test_csv_upload_with_row_report(self):
+        upload = SimpleUploadedFile(
+            "donors.csv",
+            (
+                "name,batch,blood_group,phone,last_donated_date,gender\n"
+                "Rahim,K-70,b+,01811-000000,2025-01-10,male\n"
+                "Karim,K-70,O+,1711000000,,Male\n"
+                "Rahim again,K-70,B+,+8801811000000,,Male\n"
+                "Nadia,K-71,C+,01911000000,2025-02-30,Female\n"
+            ).encode(),
+            content_type="text/csv",
+        )
+        response = self.client.post(
+            reverse("admin-blood-donor-import"), {"file": upload}, format="multipart"
+        )
+        self.assertEqual(response.status_code, 201)
+        report = response.json()
+        self.assertEqual(report["created"], 1)
+        self.assertEqual(
+            {e["row"]: sorted(e["errors"]) for e in report["errors"]},
+            {2: ["phone"], 3: ["phone"], 4: ["blood_group", "last_donated_date"]},
+        )
+        donor = BloodDonor.objects.get(name="Rahim")
+        self.assertEqual((donor.blood_group, donor.phone), ("B+", "01811000000"))
+
+    def test_json_dry_run(self):
+        response = self.client.post(
+            reverse("admin-blood-donor-import") + "?dry_run=true",
+            [
+                {
+                    "name": "Sumi",
+                    "blood_group": "AB-",
+                    "phone": "01511000000",
+                    "gender": "Female",
+                }
+            ],
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["valid"], 1)
+        self.assertFalse(BloodDonor.objects.filter(name="Sumi").exists())
+
+    def test_json_numbers_are_read_as_text(self):
+        rows = [
+            {
+                "name": "Rafi",
+                "batch": 70,
+                "blood_group": "O+",
+                "phone": 1411000000,
+                "gender": "Male",
+            },
+            {
+                "name": 123,
+                "batch": 71,
+                "blood_group": 7,
+                "phone": "01411000001",
+                "gender": 1,
+                "last_donated_date": 2025,
+            },
+        ]
+        response = self.client.post(
+            reverse("admin-blood-donor-import"), rows, format="json"
+        )
+        self.assertEqual(response.status_code, 201)
+        report = response.json()
+        self.assertEqual(report["created"], 1)
+        self.assertEqual(
+            report["errors"],
+            [
+                {
+                    "row": 2,
+                    "errors": {
+                        "blood_group": '"7" is not a valid choice.',
+                        "gender": '"1" is not a valid choice.',
+                        "last_donated_date": "Use YYYY-MM-DD.",
+                    },
+                }
+            ],
+        )
+        donor = BloodDonor.objects.get(name="Rafi")
+        self.assertEqual((donor.batch, donor.phone), ("70", "01411000000"))
+
+
+class MediaTestCase(TestCase):
+    """Runs against throwaway media/staging directories, tasks inline."""
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        self.staging_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.staging_dir)
+        settings_override = override_settings(
+            MEDIA_ROOT=self.media_root,
+            UPLOAD_STAGING_DIR=self.staging_dir,
+            BACKGROUND_TASKS_EAGER=True,
+            IMAGE_VARIANT_WIDTHS=[320, 640, 1280],
+            IMAGE_VARIANT_FORMATS=["webp", "jpeg"],
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def upload(self, name="photo.png", size=(1000, 500), color=(200, 30, 30, 128)):
+        buffer = io.BytesIO()
+        PILImage.new("RGBA", size, color).save(buffer, "PNG")
+        return SimpleUploadedFile(name, buffer.getvalue(), content_type="image/png")
+
+
+class ImageVariantTests(MediaTestCase):
+
+    def test_variants_built_after_commit_and_exposed_as_srcset(self):
+        blog = Blog.objects.create(
+            title="Camp", slug="camp", content="...", published=True
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            image = Image.objects.create(blog=blog, image=self.upload())
+        image.refresh_from_db()
+
+        self.assertEqual(image.variants["source"], image.image.name)
+        # 1280 would upscale, so the original width is used instead
+        self.assertEqual(
+            sorted(image.variants["webp"], key=int), ["320", "640", "1000"]
+        )
+        storage = image.image.storage
+        with storage.open(image.variants["jpeg"]["320"]) as f:
+            self.assertEqual(PILImage.open(f).size, (320, 160))
+
+        response = self.client.get(reverse("blog-detail", args=["camp"]))
+        srcset = response.json()["images"][0]["srcset"]
+        self.assertEqual(srcset["webp"].count("w, "), 2)
+        self.assertTrue(srcset["webp"].startswith("http://testserver/media/"))
+        self.assertRegex(srcset["webp"], r"/images/variants/\w\w/\w{64}\.webp 1000w$")
+
+        names = variant_names(image.variants) + [image.image.name]
+        with self.captureOnCommitCallbacks(execute=True):
+            image.delete()
+        # shared storage: files stay until gc_media finds them unreferenced
+        self.assertTrue(all(storage.exists(name) for name in names))
+        call_command("gc_media", "--min-age=0", stdout=StringIO())
+        self.assertFalse(any(storage.exists(name) for name in names))
+
+    def test_pending_and_unreadable_images(self):
+        with self.captureOnCommitCallbacks(execute=False):
+            image = Image.objects.create(image=self.upload())
+        # not processed yet: the serializer offers no srcset
+        self.assertEqual(ImageSerializer(image).data["srcset"], {})
+
+        broken = SimpleUploadedFile("broken.jpg", b"not an image")
+        with self.captureOnCommitCallbacks(execute=True):
+            broken_image = Image.objects.create(image=broken)
+        broken_image.refresh_from_db()
+        self.assertEqual(broken_image.variants, {"source": broken_image.image.name})
+
+    def test_backfill_command(self):
+        # rows created before the pipeline existed (no signals, no variants)
+        name = Image._meta.get_field("image").storage.save(
+            "images/photo.png", self.upload()
+        )
+        image = Image.objects.bulk_create([Image(image=name)])[0]
+        out = StringIO()
+        call_command("build_image_variants", stdout=out)
+        self.assertIn("1 image(s) processed", out.getvalue())
+        self.assertIn("webp", Image.objects.get(pk=image.pk).variants)
+
+
+class ImageUploadTests(MediaTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.client.force_authenticate(
+            User.objects.create_user(
+                email="editor@example.com", password="x", is_staff=True
+            )
+        )
+
+    def test_create_returns_pending_images_stored_after_commit(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            response = self.client.post(
+                reverse("admin-blog-list-create"),
+                {
+                    "title": "Camp",
+                    "content": "...",
+                    "published": True,
+                    "image_files": [self.upload("a.png"), self.upload("b.png")],
+                },
+                format="multipart",
+            )
+        self.assertEqual(response.status_code, 201)
+        images = response.json()["images"]
+        self.assertEqual([i["status"] for i in images], ["pending", "pending"])
+        self.assertIsNone(images[0]["image"])
+        # the public page leaves out images that are not stored yet
+        blog_url = reverse("blog-detail", args=["camp"])
+        self.assertEqual(self.client.get(blog_url).json()["images"], [])
+
+        for callback in callbacks:
+            callback()
+        stored = self.client.get(blog_url).json()["images"]
+        self.assertEqual(len(stored), 2)
+        # same bytes under two names: stored once, content-addressed
+        self.assertRegex(
+            stored[0]["image"], r"/media/images/[0-9a-f]{2}/[0-9a-f]{64}\.png$"
+        )
+        self.assertEqual(stored[0]["image"], stored[1]["image"])
+        self.assertIn("webp", stored[0]["srcset"])
+        self.assertEqual(os.listdir(self.staging_dir), [])
+
+    def test_failed_rerun_does_not_hide_a_stored_image(self):
+        with self.captureOnCommitCallbacks():
+            self.client.post(
+                reverse("admin-blog-list-create"),
+                {"title": "Camp", "content": "...", "image_files": [self.upload()]},
+                format="multipart",
+            )
+        image = Image.objects.get()
+
+        def stored_meanwhile(*args, **kwargs):
+            # another run finished between our read and our copy
+            Image.objects.filter(pk=image.pk).update(status=Image.STATUS_READY)
+            raise FileNotFoundError(image.staged_file)
+
+        with mock.patch("api.uploads.open", side_effect=stored_meanwhile, create=True):
+            store_upload(image.pk)
+        image.refresh_from_db()
+        self.assertEqual(image.status, Image.STATUS_READY)
+
+    def test_deleting_an_image_revalidates_its_page(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                reverse("admin-blog-list-create"),
+                {
+                    "title": "Camp",
+                    "content": "...",
+                    "published": True,
+                    "image_files": [self.upload()],
+                },
+                format="multipart",
+            )
+        image = Image.objects.get()
+        urls = [reverse("blog-list"), reverse("blog-detail", args=["camp"])]
+        etags = [self.client.get(url)["ETag"] for url in urls]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.delete(
+                reverse("admin-image-detail", args=[image.pk])
+            )
+        self.assertEqual(response.status_code, 204)
+        for url, etag in zip(urls, etags):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 200)
+            self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(response.json()["images"], [])
+
+    def test_update_keeps_unchanged_images(self):
+        event = Event.objects.create(
+            title="Drive", description="...", location="Dhaka", date=timezone.now()
+        )
+        url = reverse("admin-event-detail", args=[event.pk])
+        red = self.upload("red.png")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(url, {"image_files": [red]}, format="multipart")
+        original = Image.objects.get(event=event)
+
+        blue = self.upload("blue.png", color=(0, 0, 255, 255))
+        red.seek(0)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(
+                url, {"image_files": [red, blue]}, format="multipart"
+            )
+        self.assertEqual(response.status_code, 200)
+        images = Image.objects.filter(event=event).order_by("id")
+        self.assertEqual(len(images), 2)
+        self.assertEqual(images[0].pk, original.pk)
+        self.assertEqual(images[0].image.name, original.image.name)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(url, {"keep_images": [images[1].pk]}, format="multipart")
+        self.assertEqual(
+            list(Image.objects.filter(event=event).values_list("pk", flat=True)),
+            [images[1].pk],
+        )
+
+
+class ContentSearchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        Blog.objects.create(
+            title="Blood donation camp",
+            content="<p>Join our <b>donation</b> drive at Dhaka Medical.</p>",
+            published=True,
+        )
+        Blog.objects.create(
+            title="Annual report",
+            content="Thanks to every blood donor this year.",
+            published=True,
+        )
+        Blog.objects.create(
+            title="Blood draft", content="Not published yet.", published=False
+        )
+        cls.event = Event.objects.create(
+            title="Vaccination day",
+            description="Free vaccines for students.",
+            location="Suhrawardy Medical College",
+            date=timezone.now() + timedelta(days=3),
+        )
+
+    def search(self, **params):
+        response = self.client.get(reverse("content-search"), params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def assertBackendsAgree(self, query, expected_titles, **params):
+        for backend in ("auto", "python"):
+            with self.subTest(backend=backend), override_settings(
+                SEARCH_BACKEND=backend
+            ):
+                results = self.search(q=query, **params)["results"]
+                self.assertEqual([r["title"] for r in results], expected_titles)
+
+    def test_ranked_prefix_search(self):
+        # a title hit ranks above a body-only hit; drafts never show up
+        self.assertBackendsAgree("blood don", ["Blood donation camp", "Annual report"])
+        self.assertBackendsAgree("suhrawardy", ["Vaccination day"])
+        self.assertBackendsAgree("blood", [], type="event")
+        self.assertBackendsAgree("", [])
+
+    def test_result_fields_and_pagination(self):
+        data = self.search(q="blood", limit=1)
+        self.assertEqual(data["count"], 2)
+        self.assertIsNotNone(data["next"])
+        hit = data["results"][0]
+        self.assertEqual(hit["type"], "blog")
+        self.assertEqual(hit["slug"], "blood-donation-camp")
+        self.assertEqual(hit["excerpt"], "Join our donation drive at Dhaka Medical.")
+
+    def test_index_follows_saves_and_deletes(self):
+        self.event.title = "Thalassemia awareness"
+        self.event.save()
+        self.assertBackendsAgree("thalassemia", ["Thalassemia awareness"])
+        self.assertBackendsAgree("vaccination", [])
+        draft = Blog.objects.get(title="Blood draft")
+        draft.published = True
+        draft.save()
+        self.assertBackendsAgree("draft", ["Blood draft"])
+        draft.delete()
+        self.assertBackendsAgree("draft", [])
+
+    def test_rebuild_command(self):
+        out = StringIO()
+        call_command("rebuild_search_index", stdout=out)
+        self.assertIn("Indexed 4 document(s)", out.getvalue())
+        self.assertBackendsAgree("report", ["Annual report"])
+
+
+@override_settings(METRICS_ENABLED=True, METRICS_SERVER_TIMING=True)
+class RequestMetricsTests(TestCase):
+    def setUp(self):
+        registry.clear()
+        Blog.objects.create(title="Camp", content="...", published=True)
+
+    def test_server_timing_header(self):
+        response = self.client.get(reverse("blog-list"))
+        timing = response["Server-Timing"]
+        # validators aggregate + blogs + images
+        self.assertIn('desc="3 queries"', timing)
+        self.assertRegex(timing, r"^total;dur=[\d.]+, db;dur=[\d.]+;.*serialize;dur=")
+
+    def test_prometheus_endpoint_is_staff_only(self):
+        self.client.get(reverse("blog-list"))
+        self.client.get(reverse("blog-detail", args=["camp"]))
+        self.client.get("/api/no-such-route/")
+
+        client = APIClient()
+        self.assertIn(client.get(reverse("admin-metrics")).status_code, (401, 403))
+        client.force_authenticate(
+            User.objects.create_user(email="ops@example.com", is_staff=True)
+        )
+        response = client.get(reverse("admin-metrics"))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("text/plain"))
+        text = response.content.decode()
+
+        labels = 'method="GET",route="/api/blogs/<slug:slug>/",status="2xx"'
+        self.assertIn(f"http_request_db_queries_count{{{labels},pid=", text)
+        self.assertIn(f"http_request_db_queries_bucket{{{labels}", text)
+        self.assertIn('route="unmatched",status="4xx"', text)
+        self.assertIn("# TYPE http_response_size_bytes histogram", text)
+        serializer_sum = re.search(
+            r'http_request_serializer_duration_seconds_sum\{method="GET",'
+            r'route="/api/blogs/",[^}]*\} ([\d.e-]+)',
+            text,
+        )
+        self.assertGreater(float(serializer_sum.group(1)), 0)
+
+
+class BenchmarkTests(TestCase):
+    counts = {
+        "users": 20,
+        "donations": 50,
+        "interests": 10,
+        "requests": 5,
+        "blogs": 6,
+        "images": 8,
+        "comments": 10,
+        "events": 6,
+    }
+
+    def test_seeded_histories_respect_the_donation_gap(self):
+        plan = seed(self.counts, seed=7, chunk_size=7)
+        self.assertEqual(User.objects.count(), 20)
+        self.assertEqual(BloodDonation.objects.count(), 50)
+        for user in User.objects.prefetch_related("blooddonation_set"):
+            dates = sorted(d.donation_date for d in user.blooddonation_set.all())
+            self.assertEqual(user.last_donation_date, dates[-1])
+            self.assertLessEqual(dates[-1], plan.today - DONATION_SPACING)
+            gaps = [b - a for a, b in zip(dates, dates[1:])]
+            self.assertTrue(all(gap >= DONATION_SPACING for gap in gaps))
+        for interest in BloodDonationInterest.objects.select_related("user"):
+            gap = interest.available_date - interest.user.last_donation_date
+            self.assertGreaterEqual(gap, DONATION_SPACING)
+
+    def test_same_seed_same_rows(self):
+        first = seed(self.counts, seed=3)
+        emails = list(User.objects.order_by("pk").values_list("email", "phone"))
+        User.objects.all().delete()
+        Blog.objects.all().delete()
+        Event.objects.all().delete()
+        second = seed(self.counts, seed=3)
+        self.assertEqual(first.base, second.base)
+        self.assertEqual(
+            emails, list(User.objects.order_by("pk").values_list("email", "phone"))
+        )
+
+    def test_run_and_compare(self):
+        seed(self.counts)
+        results = run(["blog-list", "convert-due-interests"], iterations=2, warmup=0)
+        self.assertEqual(set(results), {"blog-list", "convert-due-interests"})
+        for result in results.values():
+            self.assertEqual(result["status"], [200])
+            self.assertGreater(result["queries"], 0)
+            self.assertLessEqual(result["p50_ms"], result["p95_ms"])
+        # the conversion is rolled back after every iteration
+        self.assertFalse(BloodDonationInterest.objects.exclude(donation=None).exists())
+
+        before = {"results": results}
+        slower = dict(results["blog-list"], queries=results["blog-list"]["queries"] + 1)
+        after = {"results": {"blog-list": slower}}
+        regressed = [row[1] for row in compare(before, after) if row[-1]]
+        self.assertEqual(regressed, ["queries"])
+
+    def test_seed_scale_command_in_several_processes(self):
+        out = StringIO()
+        call_command(
+            "seed_scale",
+            "--scale=0.01",
+            "--chunk-size=4",
+            "--processes=2",
+            stdout=out,
+            stderr=StringIO(),
+        )
+        self.assertIn("Seeded 127 row(s)", out.getvalue())
+        self.assertEqual(User.objects.count(), 20)
+        self.assertEqual(BloodDonor.objects.count(), 10)
+        self.assertEqual(BloodDonation.objects.count(), 60)
+        self.assertEqual(SearchDocument.objects.count(), 7)
+        with self.assertRaisesMessage(CommandError, "already in this database"):
+            call_command("seed_scale", "--scale=0.01", stdout=StringIO())
+
+
+class AsyncPublicViewTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.factory = AsyncRequestFactory()
+        self.blog = Blog.objects.create(title="Camp", content="...", published=True)
+        Image.objects.create(blog=self.blog, image="images/a.jpg")
+        Blog.objects.create(title="Draft", content="...", published=False)
+
+    async def call(self, view_class, path, **kwargs):
+        view = AsyncPublicView.as_view(view_class=view_class)
+        headers = kwargs.pop("headers", {})
+        return await view(self.factory.get(path, headers=headers), **kwargs)
+
+    async def test_matches_sync_view(self):
+        url = reverse("blog-list")
+        expected = await self.async_client.get(url)
+        response = await self.call(BlogListView, url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, expected.content)
+        self.assertEqual(response["ETag"], expected["ETag"])
+        self.assertEqual(len(json.loads(response.content)[0]["images"]), 1)
+
+        response = await self.call(
+            BlogListView, url, headers={"If-None-Match": expected["ETag"]}
+        )
+        self.assertEqual(response.status_code, 304)
+
+    async def test_detail_and_fallbacks(self):
+        response = await self.call(
+            BlogDetailView, "/api/blogs/camp/", slug=self.blog.slug
+        )
+        self.assertEqual(json.loads(response.content)["title"], "Camp")
+        # unpublished: the sync view answers with its usual 404
+        response = await self.call(BlogDetailView, "/api/blogs/draft/", slug="draft")
+        self.assertEqual(response.status_code, 404)
+        # pagination is left to the sync view
+        response = await self.call(BlogListView, "/api/blogs/?limit=1")
+        self.assertEqual(len(response.data["results"]), 1)
+
+    async def test_shares_the_response_cache(self):
+        await Service.objects.acreate(name="Blood bank", description="...")
+        url = reverse("service-list")
+        first = await self.call(ServiceListView, url)
+        # update() skips the version bump, so both paths keep the cached body
+        await Service.objects.aupdate(name="Vaccination")
+        self.assertEqual((await self.async_client.get(url)).content, first.content)
+        self.assertEqual((await self.call(ServiceListView, url)).content, first.content)
+
+    @override_settings(DEBUG=True)
+    def test_no_middleware_needs_a_thread(self):
+        with self.assertNoLogs("django.request", "DEBUG"):
+            ASGIHandler()
+
+    @override_settings(METRICS_ENABLED=True, METRICS_SERVER_TIMING=True)
+    async def test_metrics_count_queries_under_asgi(self):
+        response = await self.async_client.get(reverse("blog-list"))
+        self.assertIn('desc="3 queries"', response["Server-Timing"])
+
+
+class FlakyBackend:
+    """Email connection failing the first ``failures`` sends."""
+
+    failures = 0
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def open(self):
+        return False
+
+    def close(self):
+        pass
+
+    def send_messages(self, messages):
+        if FlakyBackend.failures:
+            FlakyBackend.failures -= 1
+            raise ConnectionError("SMTP timed out")
+        mail.outbox.extend(messages)
+        return len(messages)
+
+
+@override_settings(
+    BACKGROUND_TASKS_EAGER=True, MAIL_RETRY_DELAY=60, MAIL_MAX_ATTEMPTS=2
+)
+class MailQueueTests(TestCase):
+    def setUp(self):
+        User.objects.create_user(email="donor@example.com")
+
+    def test_forgot_password_queues_and_sends_after_commit(self):
+        url = reverse("forgot-password")
+        with self.captureOnCommitCallbacks() as callbacks:
+            response = self.client.post(url, {"email": "Donor@example.com"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(mail.outbox), 0)
+        email = OutboundEmail.objects.get()
+        self.assertEqual(email.to, ["donor@example.com"])
+        self.assertIn("?token=", email.body)
+
+        for callback in callbacks:
+            callback()
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].alternatives[0][1], "text/html")
+        email.refresh_from_db()
+        self.assertEqual(email.status, OutboundEmail.STATUS_SENT)
+        self.assertEqual(email.attempts, 1)
+        # the reset token doesn't outlive delivery
+        self.assertEqual((email.body, email.html_body), ("", ""))
+
+        # unknown addresses queue nothing
+        self.client.post(url, {"email": "nobody@example.com"})
+        self.assertEqual(OutboundEmail.objects.count(), 1)
+
+    @override_settings(EMAIL_BACKEND="api.tests.FlakyBackend")
+    def test_retries_with_backoff_then_gives_up(self):
+        email = OutboundEmail.objects.create(subject="Hi", body="...", to=["a@b.c"])
+        FlakyBackend.failures = 5
+        self.assertEqual(send_queued(), (0, 1))
+        email.refresh_from_db()
+        self.assertEqual(email.status, OutboundEmail.STATUS_QUEUED)
+        self.assertIn("SMTP timed out", email.last_error)
+        self.assertGreater(email.next_attempt_at, timezone.now())
+        self.assertEqual(email.body, "...")
+        # not due yet
+        self.assertEqual(send_queued(), (0, 0))
+
+        OutboundEmail.objects.update(next_attempt_at=timezone.now())
+        send_queued()
+        email.refresh_from_db()
+        self.assertEqual(email.status, OutboundEmail.STATUS_FAILED)
+        self.assertEqual(email.attempts, 2)
+        self.assertEqual(email.body, "")
+
+        FlakyBackend.failures = 0
+        OutboundEmail.objects.create(subject="Hi", body="...", to=["a@b.c"])
+        self.assertEqual(send_queued(), (1, 0))
+
+    def test_claims_are_exclusive_and_stale_ones_released(self):
+        for i in range(3):
+            OutboundEmail.objects.create(subject=f"#{i}", body="...", to=["a@b.c"])
+        first = claim_batch(batch_size=2)
+        second = claim_batch(batch_size=2)
+        self.assertEqual(len(first), 2)
+        self.assertEqual([e.subject for e in second], ["#2"])
+        self.assertEqual(claim_batch(), [])
+
+        # a sender died holding the first claim
+        OutboundEmail.objects.filter(pk__in=[e.pk for e in first]).update(
+            claimed_at=timezone.now() - timedelta(hours=1)
+        )
+        out = StringIO()
+        call_command("send_queued_mail", "--batch-size=1", stdout=out)
+        self.assertIn("2 sent", out.getvalue())
+        self.assertEqual(len(mail.outbox), 2)
+
+
+@override_settings(
+    BACKGROUND_TASKS_EAGER=True,
+    DONOR_NOTIFICATIONS=True,
+    MAIL_MAX_ATTEMPTS=2,
+    MAIL_QUEUE_BATCH_SIZE=2,
+    SMS_BACKEND="api.sms.LocmemBackend",
+)
+class DonorNotificationTests(TestCase):
+    def setUp(self):
+        sms.outbox.clear()
+        self.today = date.today()
+        self.patient = User.objects.create_user(
+            email="patient@example.com", blood_group="A+"
+        )
+        self.donors = [
+            User.objects.create_user(
+                email=f"donor{i}@example.com", blood_group=group, phone=phone
+            )
+            for i, (group, phone) in enumerate(
+                [("O-", "0171"), ("A+", ""), ("A-", "0173")]
+            )
+        ]
+        # recently donated, incompatible, inactive
+        User.objects.create_user(
+            email="recent@example.com",
+            blood_group="O+",
+            last_donation_date=self.today - timedelta(days=30),
+        )
+        User.objects.create_user(email="b@example.com", blood_group="B+")
+        User.objects.create_user(
+            email="inactive@example.com", blood_group="O+", is_active=False
+        )
+
+    def create_request(self, **fields):
+        with self.captureOnCommitCallbacks() as callbacks:
+            blood_request = BloodRequest.objects.create(
+                **{
+                    "user": self.patient,
+                    "blood_group": "A+",
+                    "location": "SMCH",
+                    "contact": "017",
+                    "date_required": self.today + timedelta(days=3),
+                    "approved": True,
+                    **fields,
+                }
+            )
+        return blood_request, callbacks
+
+    def test_new_request_notifies_eligible_donors_after_commit(self):
+        blood_request, callbacks = self.create_request()
+        self.assertEqual(Notification.objects.count(), 0)
+        for callback in callbacks:
+            callback()
+
+        notification = Notification.objects.get()
+        self.assertEqual(notification.object_id, blood_request.pk)
+        self.assertIn("A+ blood needed in SMCH", notification.subject)
+        self.assertEqual(
+            sorted(m.to[0] for m in mail.outbox),
+            [d.email for d in self.donors],
+        )
+        self.assertIn("text/html", mail.outbox[0].alternatives[0][1])
+        self.assertEqual(sorted(m.to for m in sms.outbox), ["0171", "0173"])
+        self.assertIn("Contact 017", sms.outbox[0].body)
+        self.assertFalse(
+            NotificationDelivery.objects.exclude(
+                status=NotificationDelivery.STATUS_SENT
+            ).exists()
+        )
+
+        # fanning out again adds nobody
+        out = StringIO()
+        call_command("send_notifications", f"--request={blood_request.pk}", stdout=out)
+        self.assertIn("5 delivery(ies)", out.getvalue())
+        self.assertIn("0 sent", out.getvalue())
+
+    def test_only_staff_approved_requests_are_fanned_out(self):
+        client = APIClient()
+        client.force_authenticate(self.patient)
+        payload = {
+            "blood_group": "A+",
+            "location": "SMCH",
+            "contact": "017",
+            "date_required": str(self.today + timedelta(days=3)),
+            "approved": True,
+        }
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            response = client.post(reverse("request-blood"), payload)
+        self.assertEqual(response.status_code, 201)
+        self.assertFalse(response.data["approved"])
+        self.assertFalse(Notification.objects.exists())
+
+        staff = User.objects.create_user(email="staff@example.com", is_staff=True)
+        client.force_authenticate(staff)
+        url = reverse("admin-blood-request-detail", args=[response.data["id"]])
+        with self.captureOnCommitCallbacks(execute=True):
+            client.patch(url, {"approved": True})
+        self.assertEqual(Notification.objects.count(), 1)
+        self.assertEqual(len(mail.outbox), 3)
+
+        # later edits don't notify anyone again
+        with self.captureOnCommitCallbacks(execute=True):
+            client.patch(url, {"location": "DMCH"})
+        self.assertEqual(Notification.objects.count(), 1)
+        self.assertEqual(len(mail.outbox), 3)
+
+    @override_settings(DONOR_NOTIFICATIONS=False)
+    def test_notifications_can_be_switched_off(self):
+        _, callbacks = self.create_request()
+        for callback in callbacks:
+            callback()
+        self.assertFalse(Notification.objects.exists())
+
+    def test_text_and_sms_bodies_are_not_html_escaped(self):
+        _, callbacks = self.create_request(
+            reason="mother's surgery & ICU", location="Ward <3>"
+        )
+        for callback in callbacks:
+            callback()
+        notification = Notification.objects.get()
+        self.assertIn("(mother's surgery & ICU)", notification.body)
+        self.assertIn("at Ward <3>.", notification.sms_body)
+        self.assertIn("mother&#x27;s surgery &amp; ICU", notification.html_body)
+        self.assertIn("mother's surgery & ICU", mail.outbox[0].body)
+
+    def test_recipients_are_selected_in_one_query(self):
+        User.objects.bulk_create(
+            User(email=f"bulk{i}@example.com", blood_group="O+") for i in range(50)
+        )
+        with self.settings(DONOR_NOTIFICATIONS=False):
+            blood_request, _ = self.create_request()
+        # object, get_or_create (select + insert in a savepoint), recipients,
+        # one bulk insert
+        with self.assertNumQueries(7):
+            notify(Notification.KIND_BLOOD_REQUEST, blood_request.pk, send=False)
+        self.assertEqual(NotificationDelivery.objects.count(), 55)
+
+    @override_settings(EMAIL_BACKEND="api.tests.FlakyBackend", SMS_BACKEND="")
+    def test_failed_sends_are_retried(self):
+        blood_request, callbacks = self.create_request()
+        FlakyBackend.failures = 1
+        for callback in callbacks:
+            callback()
+        # the other messages of the batch still went out over its connection
+        failed = NotificationDelivery.objects.get(
+            status=NotificationDelivery.STATUS_QUEUED
+        )
+        self.assertIn("SMTP timed out", failed.last_error)
+        self.assertEqual(len(mail.outbox), 2)
+        self.assertEqual(sms.outbox, [])
+
+        NotificationDelivery.objects.update(next_attempt_at=timezone.now())
+        self.assertEqual(send_pending(), (1, 0))
+        self.assertEqual(len(mail.outbox), 3)
+
+    def test_events_notify_all_eligible_donors(self):
+        now = timezone.now()
+        with self.captureOnCommitCallbacks(execute=True):
+            Event.objects.create(
+                title="Camp",
+                description="",
+                location="SMCH",
+                date=now - timedelta(days=1),
+            )
+        self.assertEqual(Notification.objects.count(), 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Event.objects.create(
+                title="Camp",
+                description="",
+                location="SMCH",
+                date=now + timedelta(days=7),
+            )
+        notification = Notification.objects.get(kind=Notification.KIND_EVENT)
+        self.assertEqual(notification.subject, "Blood donation event: Camp")
+        # every group, plus the patient; not the recent donor or inactive user
+        self.assertEqual(len(mail.outbox), 5)
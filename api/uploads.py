@@ -0,0 +1,137 @@
+"""
+Background storage of images uploaded through ``image_files`` on the blog
+and event serializers.
+
+In the request each upload is only copied to ``UPLOAD_STAGING_DIR`` (local
+disk, hashed on the way) and a ``pending`` Image row is created; a worker
+from ``api.tasks`` then moves the file into media storage, marks the row
+``ready`` and builds its variants. Rows whose job was lost (e.g. a restart)
+are picked up again by ``manage.py process_uploads``.
+
+Replacing a parent's images is diff-based: existing images whose checksum
+matches a new upload, or whose id is listed in ``keep_images``, are kept
+as they are, and only the rest are deleted or uploaded.
+"""
+
+import hashlib
+import logging
+import os
+import shutil
+import uuid
+
+from django.conf import settings
+from django.core.files import File
+
+from core.models import Image
+from . import images, tasks
+
+logger = logging.getLogger(__name__)
+
+
+def stage_upload(upload):
+    """
+    Copy ``upload`` to the staging area. Returns (path, sha256 hex digest);
+    the original file name is kept as the last path component.
+    """
+    directory = os.path.join(settings.UPLOAD_STAGING_DIR, uuid.uuid4().hex)
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, os.path.basename(upload.name) or "upload")
+    digest = hashlib.sha256()
+    upload.seek(0)
+    with open(path, "wb") as staged:
+        for chunk in upload.chunks():
+            digest.update(chunk)
+            staged.write(chunk)
+    return path, digest.hexdigest()
+
+
+def discard_staged(path):
+    if path:
+        shutil.rmtree(os.path.dirname(path), ignore_errors=True)
+
+
+def add_images(uploads, **parent):
+    """Create pending Image rows for ``uploads`` under ``parent`` (e.g. blog=)."""
+    created = []
+    for upload in uploads:
+        path, checksum = stage_upload(upload)
+        image = Image.objects.create(
+            status=Image.STATUS_PENDING,
+            staged_file=path,
+            checksum=checksum,
+            **parent,
+        )
+        tasks.submit(store_upload, image.pk)
+        created.append(image)
+    return created
+
+
+def replace_images(uploads, keep_ids=(), **parent):
+    """
+    Make ``parent``'s images the kept ones plus ``uploads``, without touching
+    images that are unchanged.
+    """
+    keep_ids = set(keep_ids)
+    staged = [(upload, *stage_upload(upload)) for upload in uploads]
+    wanted = {checksum for _, _, checksum in staged}
+
+    existing = list(Image.objects.filter(**parent).only("id", "checksum"))
+    kept_checksums = set()
+    stale = []
+    for image in existing:
+        if image.pk in keep_ids or (image.checksum and image.checksum in wanted):
+            kept_checksums.add(image.checksum)
+        else:
+            stale.append(image.pk)
+    if stale:
+        # one by one so the post_delete handlers clean up variant files
+        for image in Image.objects.filter(pk__in=stale):
+            image.delete()
+
+    for upload, path, checksum in staged:
+        if checksum in kept_checksums:
+            discard_staged(path)
+            continue
+        kept_checksums.add(checksum)
+        image = Image.objects.create(
+            status=Image.STATUS_PENDING,
+            staged_file=path,
+            checksum=checksum,
+            **parent,
+        )
+        tasks.submit(store_upload, image.pk)
+
+
+def store_upload(image_id):
+    """Background job: move a staged upload into storage and build variants."""
+    image = Image.objects.filter(pk=image_id, status=Image.STATUS_PENDING).first()
+    if image is None or not image.staged_file:
+        return
+    path = image.staged_file
+    field = Image._meta.get_field("image")
+    try:
+        with open(path, "rb") as staged:
+            name = field.storage.save(
+                field.generate_filename(image, os.path.basename(path)),
+                File(staged),
+                max_length=field.max_length,
+            )
+    except OSError:
+        logger.exception("Could not store upload %s for image %s", path, image_id)
+        # a concurrent run may have stored it (and removed the staged file)
+        Image.objects.filter(pk=image_id, status=Image.STATUS_PENDING).update(
+            status=Image.STATUS_FAILED
+        )
+        return
+
+    stored = Image.objects.filter(pk=image_id, status=Image.STATUS_PENDING).update(
+        image=name, status=Image.STATUS_READY, staged_file=""
+    )
+    discard_staged(path)
+    if not stored:
+        # the row was deleted (or replaced) while the file was being copied
+        field.storage.delete(name)
+        return
+    if not images.generate_variants(image_id):
+        # no variants to show, but the new file still has to reach the caches
+        images.touch_parents(image)
@@ -1,4 +1,5 @@
 from django.urls import path
+from .async_views import public_view
 from .views import (
     AboutListView,
     AchievementListView,
@@ -8,6 +9,9 @@ from .views import (
     AdminAchievementListCreateView,
     AdminBloodDonorDetailView,
     AdminBloodDonorListCreateView,
+    AdminDonorSearchView,
+    AdminUserDonorSearchView,
+    MetricsView,
     AdminHomeAboutAchievementDetailView,
     AdminHomeAboutAchievementListCreateView,
     AdminHomeAboutDetailView,
@@ -21,6 +25,7 @@ from .views import (
     AdminTeamMemberDetailView,
     AdminTeamMemberListCreateView,
     BlogListView,
+    ContentSearchView,
     BlogDetailView,
     BlogCommentCreateView,
     EventListView,
@@ -67,26 +72,34 @@ from .views import (
     AdminDonationListCreateView,
     AdminDonationDetailView,
     ConvertDueInterestsView,
+    BloodRequestMatchesView,
+    AdminExportView,
+    AdminBloodDonorImportView,
 )
 
 urlpatterns = [
     # Public Endpoints
-    path("blogs/", BlogListView.as_view(), name="blog-list"),
-    path("blogs/<slug:slug>/", BlogDetailView.as_view(), name="blog-detail"),
+    path("search/", ContentSearchView.as_view(), name="content-search"),
+    path("blogs/", public_view(BlogListView), name="blog-list"),
+    path("blogs/<slug:slug>/", public_view(BlogDetailView), name="blog-detail"),
     path(
         "blogs/<int:blog_id>/comments/",
         BlogCommentCreateView.as_view(),
         name="blog-comment",
     ),
-    path("events/", EventListView.as_view(), name="event-list"),
-    path("events/<int:id>/", EventDetailView.as_view(), name="event-detail"),
-    path("events/upcoming/", UpcomingEventListView.as_view(), name="events-upcoming"),
-    path("events/past/", PastEventListView.as_view(), name="events-past"),
-    path("services/", ServiceListView.as_view(), name="service-list"),
-    path("blood-inventory/", BloodInventoryListView.as_view(), name="blood-inventory"),
+    path("events/", public_view(EventListView), name="event-list"),
+    path("events/<int:id>/", public_view(EventDetailView), name="event-detail"),
+    path(
+        "events/upcoming/", public_view(UpcomingEventListView), name="events-upcoming"
+    ),
+    path("events/past/", public_view(PastEventListView), name="events-past"),
+    path("services/", public_view(ServiceListView), name="service-list"),
+    path(
+        "blood-inventory/", public_view(BloodInventoryListView), name="blood-inventory"
+    ),
     path(
         "vaccine-inventory/",
-        VaccineInventoryListView.as_view(),
+        public_view(VaccineInventoryListView),
         name="vaccine-inventory",
     ),
     path("request-blood/", BloodRequestCreateView.as_view(), name="request-blood"),
@@ -104,19 +117,24 @@ urlpatterns = [
         name="my-donation-interests",
     ),
     path("my/donations/", MyDonationListCreateView.as_view(), name="my-donations"),
-    path("about/", AboutListView.as_view(), name="about-list"),
-    path("achievements/", AchievementListView.as_view(), name="achievement-list"),
-    path("team-members/", TeamMemberListView.as_view(), name="team-member-list"),
-    path("mission/", MissionListView.as_view(), name="mission-list"),
-    path("home-about/", HomeAboutListView.as_view(), name="home-about-list"),
+    path(
+        "blood-requests/<int:id>/matches/",
+        BloodRequestMatchesView.as_view(),
+        name="blood-request-matches",
+    ),
+    path("about/", public_view(AboutListView), name="about-list"),
+    path("achievements/", public_view(AchievementListView), name="achievement-list"),
+    path("team-members/", public_view(TeamMemberListView), name="team-member-list"),
+    path("mission/", public_view(MissionListView), name="mission-list"),
+    path("home-about/", public_view(HomeAboutListView), name="home-about-list"),
     path(
         "mission-statement/",
-        MissionStatementListView.as_view(),
+        public_view(MissionStatementListView),
         name="mission-statement-list",
     ),
     path(
         "home-achievements/",
-        HomeAboutAchievementListView.as_view(),
+        public_view(HomeAboutAchievementListView),
         name="home-achievements-list",
     ),
     # Admin Endpoints
@@ -238,12 +256,32 @@ urlpatterns = [
         AdminBloodDonorListCreateView.as_view(),
         name="admin-blood-donor-list-create",
     ),
+    path(
+        "admin/export/<slug:dataset>.<slug:fmt>",
+        AdminExportView.as_view(),
+        name="admin-export",
+    ),
+    path(
+        "admin/donors/import/",
+        AdminBloodDonorImportView.as_view(),
+        name="admin-blood-donor-import",
+    ),
+    path("admin/metrics/", MetricsView.as_view(), name="admin-metrics"),
+    path(
+        "admin/donors/search/",
+        AdminDonorSearchView.as_view(),
+        name="admin-blood-donor-search",
+    ),
+    path(
+        "admin/users/donor-search/",
+        AdminUserDonorSearchView.as_view(),
+        name="admin-user-donor-search",
+    ),
     path(
         "admin/donors/<int:id>/",
         AdminBloodDonorDetailView.as_view(),
         name="admin-blood-donor-detail",
     ),
-    
     path(
         "admin/pdfs/",
         AdminPDFDocumentListCreateView.as_view(),
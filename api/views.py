@@ -1,10 +1,19 @@
-from rest_framework import generics, permissions
+import csv
+from datetime import date
+
+from rest_framework import generics, permissions, status
 from rest_framework.permissions import IsAdminUser
-from rest_framework.parsers import MultiPartParser, FormParser
+from rest_framework.parsers import JSONParser, MultiPartParser, FormParser
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from django.db import transaction
+from rest_framework.exceptions import NotFound, ValidationError
+from django.conf import settings
+from django.db.models import F, Max, Prefetch, Q
+from django.db.models.functions import Coalesce, Greatest
+from django.http import HttpResponse, StreamingHttpResponse
+from django.shortcuts import get_object_or_404
 from django.utils import timezone
+from django.utils.dateparse import parse_date
 
 from core.models import (
     About,
@@ -29,7 +38,18 @@ from core.models import (
     BloodDonation,
     User,
     Image,
+    SearchDocument,
 )
+from .cache import CachedResponseMixin
+from .conversions import convert_due_interests
+from .exports import CONTENT_TYPES, EXPORTS, STREAMERS
+from .imports import import_donors, read_csv
+from .eligibility import COMPATIBLE_DONOR_GROUPS, eligible_donor_filter
+from .matching import match_blood_request
+from .metrics import registry
+from .mixins import ConditionalGetMixin, QueryPlanMixin
+from .pagination import SearchResultsPagination
+from .search import search
 from .serializers import (
     AboutSerializer,
     AchievementSerializer,
@@ -48,21 +68,48 @@ from .serializers import (
     ServiceSerializer,
     ActivitySerializer,
     TopDonorSerializer,
+    AdminBloodRequestSerializer,
     BloodRequestSerializer,
     BloodDonationInterestSerializer,
     BloodDonationSerializer,
     UserSerializer,
+    UserSummarySerializer,
     ImageSerializer,
+    SearchResultSerializer,
+)
+
+# Columns ImageSerializer renders; shared by every view nesting ``images``
+IMAGE_COLUMNS = (
+    "id",
+    "image",
+    "variants",
+    "status",
+    "blog_id",
+    "event_id",
+    "team_member_id",
+    "about_id",
+)
+# public pages only list images whose upload has been stored
+IMAGES_PREFETCH = Prefetch(
+    "images",
+    queryset=Image.objects.filter(status=Image.STATUS_READY)
+    .only(*IMAGE_COLUMNS)
+    .order_by("id"),
+)
+ADMIN_IMAGES_PREFETCH = Prefetch(
+    "images", queryset=Image.objects.only(*IMAGE_COLUMNS).order_by("id")
 )
 
 
 # Public Views
-class BlogListView(generics.ListAPIView):
+class BlogListView(ConditionalGetMixin, QueryPlanMixin, generics.ListAPIView):
+    prefetch_related_fields = (IMAGES_PREFETCH,)
     queryset = Blog.objects.filter(published=True)
     serializer_class = BlogSerializer
 
 
-class BlogDetailView(generics.RetrieveAPIView):
+class BlogDetailView(ConditionalGetMixin, QueryPlanMixin, generics.RetrieveAPIView):
+    prefetch_related_fields = (IMAGES_PREFETCH,)
     queryset = Blog.objects.filter(published=True)
     serializer_class = BlogSerializer
     lookup_field = "slug"
@@ -77,43 +124,53 @@ class BlogCommentCreateView(generics.CreateAPIView):
         serializer.save(user=self.request.user, blog_id=self.kwargs["blog_id"])
 
 
-class EventListView(generics.ListAPIView):
+class EventValidatorsMixin(ConditionalGetMixin):
+    def get_validator_aggregates(self):
+        # EventSerializer reports is_active False as soon as the date passes,
+        # before expire_events stores it: count that moment as a change
+        lapsed = Max("date", filter=Q(is_active=True, date__lt=timezone.now()))
+        updated = Max(self.last_modified_field)
+        return {
+            **super().get_validator_aggregates(),
+            "last_modified": Greatest(updated, Coalesce(lapsed, updated)),
+        }
+
+
+class EventListView(EventValidatorsMixin, QueryPlanMixin, generics.ListAPIView):
+    prefetch_related_fields = (IMAGES_PREFETCH,)
     queryset = Event.objects.all()
     serializer_class = EventSerializer
 
 
-class EventDetailView(generics.RetrieveAPIView):
+class EventDetailView(EventValidatorsMixin, QueryPlanMixin, generics.RetrieveAPIView):
+    prefetch_related_fields = (IMAGES_PREFETCH,)
     queryset = Event.objects.all()
     serializer_class = EventSerializer
     lookup_field = "id"
 
 
-def _auto_expire_events():
-    """Deactivate any events whose date has already passed."""
-    Event.objects.filter(is_active=True, date__lt=timezone.now()).update(
-        is_active=False
-    )
-
-
-class UpcomingEventListView(generics.ListAPIView):
+class UpcomingEventListView(ConditionalGetMixin, QueryPlanMixin, generics.ListAPIView):
+    prefetch_related_fields = (IMAGES_PREFETCH,)
     serializer_class = EventSerializer
+    cursor_ordering = ("date", "id")
 
     def get_queryset(self):
-        _auto_expire_events()
         # Only active, future or today — order soonest first
-        return Event.objects.filter(is_active=True).order_by("date")
+        return Event.objects.upcoming().order_by("date")
 
 
-class PastEventListView(generics.ListAPIView):
+class PastEventListView(ConditionalGetMixin, QueryPlanMixin, generics.ListAPIView):
+    prefetch_related_fields = (IMAGES_PREFETCH,)
     serializer_class = EventSerializer
+    cursor_ordering = ("-date", "-id")
 
     def get_queryset(self):
-        _auto_expire_events()
-        # Everything deactivated — newest past events first
-        return Event.objects.filter(is_active=False).order_by("-date")
+        # Everything deactivated or already over — newest past events first
+        return Event.objects.past().order_by("-date")
 
 
-class ServiceListView(generics.ListAPIView):
+class ServiceListView(CachedResponseMixin, generics.ListAPIView):
+    cache_models = (Service,)
     queryset = Service.objects.all()
     serializer_class = ServiceSerializer
 
@@ -146,7 +203,8 @@ class BloodDonationInterestCreateView(generics.CreateAPIView):
         serializer.save(user=self.request.user)
 
 
-class MyBloodRequestListView(generics.ListAPIView):
+class MyBloodRequestListView(QueryPlanMixin, generics.ListAPIView):
+    select_related_fields = ("user",)
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = BloodRequestSerializer
 
@@ -154,7 +212,8 @@ class MyBloodRequestListView(generics.ListAPIView):
         return BloodRequest.objects.filter(user=self.request.user).order_by("-id")
 
 
-class MyDonationInterestListView(generics.ListAPIView):
+class MyDonationInterestListView(QueryPlanMixin, generics.ListAPIView):
+    select_related_fields = ("user",)
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = BloodDonationInterestSerializer
 
@@ -164,7 +223,7 @@ class MyDonationInterestListView(generics.ListAPIView):
         )
 
 
-class MyDonationListCreateView(generics.ListCreateAPIView):
+class MyDonationListCreateView(QueryPlanMixin, generics.ListCreateAPIView):
     """
     Normal users:
       - GET: see only their donations
@@ -172,8 +231,10 @@ class MyDonationListCreateView(generics.ListCreateAPIView):
     Admins can still use admin endpoints for full visibility.
     """
 
+    select_related_fields = ("user",)
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = BloodDonationSerializer
+    cursor_ordering = ("-donation_date", "-id")
 
     def get_queryset(self):
         return BloodDonation.objects.filter(user=self.request.user)
@@ -182,50 +243,96 @@ class MyDonationListCreateView(generics.ListCreateAPIView):
         serializer.save()  # serializer sets user from request + updates last_donation_date
 
 
-class AboutListView(generics.ListAPIView):
+class AboutListView(CachedResponseMixin, QueryPlanMixin, generics.ListAPIView):
+    cache_models = (About, Image)
+    prefetch_related_fields = (IMAGES_PREFETCH,)
     queryset = About.objects.all()
     serializer_class = AboutSerializer
 
 
-class AchievementListView(generics.ListAPIView):
+class AchievementListView(CachedResponseMixin, generics.ListAPIView):
+    cache_models = (Achievement,)
     queryset = Achievement.objects.all()
     serializer_class = AchievementSerializer
 
 
-class TeamMemberListView(generics.ListAPIView):
+class TeamMemberListView(
+    ConditionalGetMixin, CachedResponseMixin, QueryPlanMixin, generics.ListAPIView
+):
+    cache_models = (TeamMember, Image)
+    prefetch_related_fields = (IMAGES_PREFETCH,)
     queryset = TeamMember.objects.all()
     serializer_class = TeamMemberSerializer
 
 
-class MissionListView(generics.ListAPIView):
+class MissionListView(CachedResponseMixin, generics.ListAPIView):
+    cache_models = (Mission,)
     queryset = Mission.objects.all()
     serializer_class = MissionSerializer
 
 
-class HomeAboutListView(generics.ListAPIView):
+class HomeAboutListView(ConditionalGetMixin, CachedResponseMixin, generics.ListAPIView):
+    cache_models = (HomeAbout,)
     queryset = HomeAbout.objects.all()
     serializer_class = HomeAboutSerializer
 
 
-class MissionStatementListView(generics.ListAPIView):
+class MissionStatementListView(
+    ConditionalGetMixin, CachedResponseMixin, generics.ListAPIView
+):
+    cache_models = (MissionStatement,)
     queryset = MissionStatement.objects.all()
     serializer_class = MissionStatementSerializer
 
 
-class HomeAboutAchievementListView(generics.ListAPIView):
+class HomeAboutAchievementListView(
+    ConditionalGetMixin, CachedResponseMixin, generics.ListAPIView
+):
+    cache_models = (HomeAboutAchievement,)
     queryset = HomeAboutAchievement.objects.all()
     serializer_class = HomeAboutAchievementSerializer
 
 
+class ContentSearchView(generics.ListAPIView):
+    """
+    ``?q=`` full-text search over published blogs and events, best match
+    first (see api.search); ``?type=blog|event`` narrows it down. Pages with
+    ``?limit=`` / ``?offset=``.
+    """
+
+    serializer_class = SearchResultSerializer
+    pagination_class = SearchResultsPagination
+
+    def get_queryset(self):
+        kind = self.request.query_params.get("type") or None
+        if kind and kind not in dict(SearchDocument.KIND_CHOICES):
+            raise ValidationError({"type": "Use blog or event."})
+        return search(self.request.query_params.get("q", ""), kind)
+
+    def list(self, request, *args, **kwargs):
+        # rank (ids and scores) first, then load only the requested page
+        page = self.paginate_queryset(self.get_queryset())
+        documents = SearchDocument.objects.in_bulk([pk for pk, _ in page])
+        results = []
+        for pk, score in page:
+            if pk in documents:
+                documents[pk].score = score
+                results.append(documents[pk])
+        serializer = self.get_serializer(results, many=True)
+        return self.get_paginated_response(serializer.data)
+
+
 # Admin Views
-class AdminBlogListCreateView(generics.ListCreateAPIView):
+class AdminBlogListCreateView(QueryPlanMixin, generics.ListCreateAPIView):
+    prefetch_related_fields = (ADMIN_IMAGES_PREFETCH,)
     queryset = Blog.objects.all()
     serializer_class = BlogSerializer
     permission_classes = [IsAdminUser]
     parser_classes = [MultiPartParser, FormParser]
 
 
-class AdminBlogDetailView(generics.RetrieveUpdateDestroyAPIView):
+class AdminBlogDetailView(QueryPlanMixin, generics.RetrieveUpdateDestroyAPIView):
+    prefetch_related_fields = (ADMIN_IMAGES_PREFETCH,)
     queryset = Blog.objects.all()
     serializer_class = BlogSerializer
     permission_classes = [IsAdminUser]
@@ -233,14 +340,16 @@ class AdminBlogDetailView(generics.RetrieveUpdateDestroyAPIView):
     parser_classes = [MultiPartParser, FormParser]
 
 
-class AdminEventListCreateView(generics.ListCreateAPIView):
+class AdminEventListCreateView(QueryPlanMixin, generics.ListCreateAPIView):
+    prefetch_related_fields = (ADMIN_IMAGES_PREFETCH,)
     queryset = Event.objects.all()
     serializer_class = EventSerializer
     permission_classes = [IsAdminUser]
     parser_classes = [MultiPartParser, FormParser]
 
 
-class AdminEventDetailView(generics.RetrieveUpdateDestroyAPIView):
+class AdminEventDetailView(QueryPlanMixin, generics.RetrieveUpdateDestroyAPIView):
+    prefetch_related_fields = (ADMIN_IMAGES_PREFETCH,)
     queryset = Event.objects.all()
     serializer_class = EventSerializer
     permission_classes = [IsAdminUser]
@@ -300,20 +409,19 @@ class AdminBloodInventoryDetailView(generics.RetrieveUpdateDestroyAPIView):
     lookup_field = "id"
 
 
-class AdminDonationListCreateView(generics.ListCreateAPIView):
+class AdminDonationListCreateView(QueryPlanMixin, generics.ListCreateAPIView):
+    select_related_fields = ("user",)
     permission_classes = [IsAdminUser]
     serializer_class = BloodDonationSerializer
-    queryset = (
-        BloodDonation.objects.select_related("user")
-        .all()
-        .order_by("-donation_date", "-id")
-    )
+    cursor_ordering = ("-donation_date", "-id")
+    queryset = BloodDonation.objects.all().order_by("-donation_date", "-id")
 
 
-class AdminDonationDetailView(generics.RetrieveUpdateDestroyAPIView):
+class AdminDonationDetailView(QueryPlanMixin, generics.RetrieveUpdateDestroyAPIView):
+    select_related_fields = ("user",)
     permission_classes = [IsAdminUser]
     serializer_class = BloodDonationSerializer
-    queryset = BloodDonation.objects.select_related("user").all()
+    queryset = BloodDonation.objects.all()
     lookup_field = "id"
 
 
@@ -330,7 +438,8 @@ class AdminVaccineInventoryDetailView(generics.RetrieveUpdateDestroyAPIView):
     lookup_field = "id"
 
 
-class AdminBlogCommentListCreateView(generics.ListCreateAPIView):
+class AdminBlogCommentListCreateView(QueryPlanMixin, generics.ListCreateAPIView):
+    select_related_fields = ("user",)
     queryset = BlogComment.objects.all()
     serializer_class = BlogCommentSerializer
     permission_classes = [IsAdminUser]
@@ -339,30 +448,38 @@ class AdminBlogCommentListCreateView(generics.ListCreateAPIView):
         serializer.save(user=self.request.user)
 
 
-class AdminBlogCommentDetailView(generics.RetrieveUpdateDestroyAPIView):
+class AdminBlogCommentDetailView(QueryPlanMixin, generics.RetrieveUpdateDestroyAPIView):
+    select_related_fields = ("user",)
     queryset = BlogComment.objects.all()
     serializer_class = BlogCommentSerializer
     permission_classes = [IsAdminUser]
     lookup_field = "id"
 
 
-class AdminBloodRequestListCreateView(generics.ListCreateAPIView):
+class AdminBloodRequestListCreateView(QueryPlanMixin, generics.ListCreateAPIView):
+    select_related_fields = ("user",)
     queryset = BloodRequest.objects.all()
-    serializer_class = BloodRequestSerializer
+    serializer_class = AdminBloodRequestSerializer
     permission_classes = [IsAdminUser]
 
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
 
 
-class AdminBloodRequestDetailView(generics.RetrieveUpdateDestroyAPIView):
+class AdminBloodRequestDetailView(
+    QueryPlanMixin, generics.RetrieveUpdateDestroyAPIView
+):
+    select_related_fields = ("user",)
     queryset = BloodRequest.objects.all()
-    serializer_class = BloodRequestSerializer
+    serializer_class = AdminBloodRequestSerializer
     permission_classes = [IsAdminUser]
     lookup_field = "id"
 
 
-class AdminBloodDonationInterestListCreateView(generics.ListCreateAPIView):
+class AdminBloodDonationInterestListCreateView(
+    QueryPlanMixin, generics.ListCreateAPIView
+):
+    select_related_fields = ("user",)
     queryset = BloodDonationInterest.objects.all()
     serializer_class = BloodDonationInterestSerializer
     permission_classes = [IsAdminUser]
@@ -371,7 +488,10 @@ class AdminBloodDonationInterestListCreateView(generics.ListCreateAPIView):
         serializer.save(user=self.request.user)
 
 
-class AdminBloodDonationInterestDetailView(generics.RetrieveUpdateDestroyAPIView):
+class AdminBloodDonationInterestDetailView(
+    QueryPlanMixin, generics.RetrieveUpdateDestroyAPIView
+):
+    select_related_fields = ("user",)
     queryset = BloodDonationInterest.objects.all()
     serializer_class = BloodDonationInterestSerializer
     permission_classes = [IsAdminUser]
@@ -384,6 +504,46 @@ class AdminBloodDonorListCreateView(generics.ListCreateAPIView):
     permission_classes = [IsAdminUser]
 
 
+class AdminBloodDonorImportView(APIView):
+    """
+    Bulk-add donors from an uploaded CSV (multipart field ``file``) or a JSON
+    array of objects. Columns: name, batch, blood_group, phone,
+    last_donated_date, gender. ``?dry_run=true`` validates without saving.
+    Valid rows are inserted; the response lists the rejected rows.
+    """
+
+    permission_classes = [IsAdminUser]
+    parser_classes = [JSONParser, MultiPartParser, FormParser]
+
+    def post(self, request):
+        if "file" in request.FILES:
+            try:
+                rows = read_csv(request.FILES["file"])
+            except (UnicodeDecodeError, csv.Error):
+                raise ValidationError({"file": "Upload a UTF-8 encoded CSV file."})
+        elif isinstance(request.data, list):
+            rows = request.data
+        else:
+            raise ValidationError(
+                {"detail": "Send a CSV file in 'file' or a JSON array of donors."}
+            )
+
+        dry_run = request.query_params.get("dry_run", "").lower() in [
+            "1",
+            "true",
+            "yes",
+            "on",
+        ]
+        report = import_donors(rows, dry_run=dry_run)
+        if report["created"]:
+            code = status.HTTP_201_CREATED
+        elif report["errors"]:
+            code = status.HTTP_400_BAD_REQUEST
+        else:
+            code = status.HTTP_200_OK
+        return Response(report, status=code)
+
+
 class AdminBloodDonorDetailView(generics.RetrieveUpdateDestroyAPIView):
     queryset = BloodDonor.objects.all()
     serializer_class = BloodDonorSerializer
@@ -391,6 +551,65 @@ class AdminBloodDonorDetailView(generics.RetrieveUpdateDestroyAPIView):
     lookup_field = "id"
 
 
+def _search_donors(queryset, params, last_donation_field):
+    """
+    Apply the donor-matching query parameters shared by the search views:
+      - blood_group: recipient group; matches every compatible donor group
+        (``exact=true`` matches that group only)
+      - eligible: defaults to true, i.e. last donation at least 90 days ago
+    Results are ordered longest-since-donation first, never-donated on top.
+    """
+    blood_group = params.get("blood_group")
+    if blood_group:
+        # an unencoded "+" arrives as a space
+        blood_group = blood_group.lstrip().replace(" ", "+").upper()
+        if blood_group not in COMPATIBLE_DONOR_GROUPS:
+            raise ValidationError({"blood_group": "Unknown blood group."})
+        if params.get("exact", "").lower() in ["1", "true", "yes", "on"]:
+            queryset = queryset.filter(blood_group=blood_group)
+        else:
+            queryset = queryset.filter(
+                blood_group__in=COMPATIBLE_DONOR_GROUPS[blood_group]
+            )
+
+    if params.get("eligible", "true").lower() not in ["0", "false", "no", "off"]:
+        queryset = queryset.filter(eligible_donor_filter(last_donation_field))
+
+    return queryset.order_by(F(last_donation_field).asc(nulls_first=True), "id")
+
+
+class AdminDonorSearchView(generics.ListAPIView):
+    """
+    Find BloodDonor rows for a patient, e.g.
+    ``?blood_group=O-&batch=K-70&gender=Female`` (see ``_search_donors``).
+    """
+
+    serializer_class = BloodDonorSerializer
+    permission_classes = [IsAdminUser]
+    pagination_class = SearchResultsPagination
+
+    def get_queryset(self):
+        params = self.request.query_params
+        queryset = BloodDonor.objects.all()
+        if params.get("batch"):
+            queryset = queryset.filter(batch=params["batch"])
+        if params.get("gender"):
+            queryset = queryset.filter(gender__iexact=params["gender"])
+        return _search_donors(queryset, params, "last_donated_date")
+
+
+class AdminUserDonorSearchView(generics.ListAPIView):
+    """Same matching as AdminDonorSearchView over registered users."""
+
+    serializer_class = UserSummarySerializer
+    permission_classes = [IsAdminUser]
+    pagination_class = SearchResultsPagination
+
+    def get_queryset(self):
+        queryset = User.objects.filter(is_active=True).exclude(blood_group="")
+        return _search_donors(queryset, self.request.query_params, "last_donation_date")
+
+
 class AdminPDFDocumentListCreateView(generics.ListCreateAPIView):
     queryset = PDFDocument.objects.all()
     serializer_class = PDFDocumentSerializer
@@ -407,38 +626,112 @@ class AdminPDFDocumentDetailView(generics.RetrieveUpdateDestroyAPIView):
 
 
 class ConvertDueInterestsView(APIView):
+    """
+    Convert due donation interests into donations in set-based batches.
+    Optional body field ``batch_size`` overrides DONATION_CONVERSION_BATCH_SIZE.
+    """
+
     permission_classes = [IsAdminUser]
 
     def post(self, request):
-        today = timezone.now().date()
-        due = BloodDonationInterest.objects.select_related("user").filter(
-            available_date__lte=today, donation__isnull=True
+        batch_size = request.data.get("batch_size")
+        if batch_size is not None:
+            try:
+                batch_size = int(batch_size)
+            except (TypeError, ValueError):
+                batch_size = 0
+            if batch_size < 1:
+                raise ValidationError({"batch_size": "Must be a positive integer."})
+
+        converted = convert_due_interests(batch_size=batch_size)
+        return Response({"converted": converted})
+
+
+class BloodRequestMatchesView(APIView):
+    """
+    Ranked donor candidates for a blood request (see ``api.matching``).
+    ``?limit=`` caps the number returned.
+    """
+
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, id):
+        blood_request = get_object_or_404(BloodRequest, id=id)
+        try:
+            limit = int(request.query_params.get("limit", settings.API_PAGE_SIZE))
+        except ValueError:
+            raise ValidationError({"limit": "Must be a positive integer."})
+        if limit < 1:
+            raise ValidationError({"limit": "Must be a positive integer."})
+        limit = min(limit, settings.API_MAX_PAGE_SIZE)
+
+        results = []
+        for match in match_blood_request(blood_request, limit=limit):
+            match = dict(match)
+            if match["available_from"] == date.min:
+                match["available_from"] = None
+            results.append(match)
+        return Response(
+            {
+                "request": blood_request.id,
+                "blood_group": blood_request.blood_group,
+                "date_required": blood_request.date_required,
+                "results": results,
+            }
+        )
+
+
+class MetricsView(APIView):
+    """Per-route request histograms in Prometheus text format (api.metrics)."""
+
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return HttpResponse(
+            registry.render(), content_type="text/plain; version=0.0.4; charset=utf-8"
         )
 
-        created = 0
-        with transaction.atomic():
-            for interest in due:
-                donation = BloodDonation.objects.create(
-                    user=interest.user,
-                    blood_group=interest.blood_group or interest.user.blood_group or "",
-                    donation_date=interest.available_date,
-                    contact_info=interest.contact_info,
-                    notes=f"Auto-converted from donation interest on {interest.available_date}",
-                )
-                # link back to the interest & update user's last_donation_date
-                interest.donation = donation
-                interest.save(update_fields=["donation"])
 
-                if (
-                    not interest.user.last_donation_date
-                    or donation.donation_date > interest.user.last_donation_date
-                ):
-                    interest.user.last_donation_date = donation.donation_date
-                    interest.user.save(update_fields=["last_donation_date"])
+class AdminExportView(APIView):
+    """
+    Stream a dataset as CSV or NDJSON without building it in memory:
+    ``admin/export/donations.csv?from=2025-01-01&to=2025-06-30&blood_group=O-``
+    """
 
-                created += 1
+    permission_classes = [IsAdminUser]
 
-        return Response({"converted": created})
+    def perform_content_negotiation(self, request, force=False):
+        # the body is never rendered by DRF, so don't 406 on "Accept: text/csv"
+        return super().perform_content_negotiation(request, force=True)
+
+    def get(self, request, dataset, fmt):
+        if dataset not in EXPORTS or fmt not in STREAMERS:
+            raise NotFound()
+        model, fields, date_field = EXPORTS[dataset]
+        queryset = model.objects.all()
+
+        params = request.query_params
+        for param, lookup in (("from", "gte"), ("to", "lte")):
+            if params.get(param):
+                try:
+                    value = parse_date(params[param])
+                except ValueError:
+                    value = None
+                if value is None:
+                    raise ValidationError({param: "Use YYYY-MM-DD."})
+                queryset = queryset.filter(**{f"{date_field}__{lookup}": value})
+        if params.get("blood_group"):
+            queryset = queryset.filter(
+                blood_group=params["blood_group"].lstrip().replace(" ", "+").upper()
+            )
+
+        response = StreamingHttpResponse(
+            STREAMERS[fmt](queryset, fields), content_type=CONTENT_TYPES[fmt]
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="{dataset}-{date.today().isoformat()}.{fmt}"'
+        )
+        return response
 
 
 class AdminUserListCreateView(generics.ListCreateAPIView):
@@ -498,14 +791,16 @@ class AdminImageDetailView(generics.RetrieveUpdateDestroyAPIView):
     lookup_field = "id"
 
 
-class AdminAboutListCreateView(generics.ListCreateAPIView):
+class AdminAboutListCreateView(QueryPlanMixin, generics.ListCreateAPIView):
+    prefetch_related_fields = (ADMIN_IMAGES_PREFETCH,)
     queryset = About.objects.all()
     serializer_class = AboutSerializer
     permission_classes = [IsAdminUser]
     parser_classes = [MultiPartParser, FormParser]
 
 
-class AdminAboutDetailView(generics.RetrieveUpdateDestroyAPIView):
+class AdminAboutDetailView(QueryPlanMixin, generics.RetrieveUpdateDestroyAPIView):
+    prefetch_related_fields = (ADMIN_IMAGES_PREFETCH,)
     queryset = About.objects.all()
     serializer_class = AboutSerializer
     permission_classes = [IsAdminUser]
@@ -526,14 +821,16 @@ class AdminAchievementDetailView(generics.RetrieveUpdateDestroyAPIView):
     lookup_field = "id"
 
 
-class AdminTeamMemberListCreateView(generics.ListCreateAPIView):
+class AdminTeamMemberListCreateView(QueryPlanMixin, generics.ListCreateAPIView):
+    prefetch_related_fields = (ADMIN_IMAGES_PREFETCH,)
     queryset = TeamMember.objects.all()
     serializer_class = TeamMemberSerializer
     permission_classes = [IsAdminUser]
     parser_classes = [MultiPartParser, FormParser]
 
 
-class AdminTeamMemberDetailView(generics.RetrieveUpdateDestroyAPIView):
+class AdminTeamMemberDetailView(QueryPlanMixin, generics.RetrieveUpdateDestroyAPIView):
+    prefetch_related_fields = (ADMIN_IMAGES_PREFETCH,)
     queryset = TeamMember.objects.all()
     serializer_class = TeamMemberSerializer
     permission_classes = [IsAdminUser]
@@ -9,5 +9,10 @@ class PasswordResetToken(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     expires_at = models.DateTimeField()
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["expires_at"], name="reset_token_expires_idx"),
+        ]
+
     def is_valid(self):
         return timezone.now() <= self.expires_at
@@ -11,6 +11,8 @@ from .serializers import (
     ResetPasswordSerializer,
 )
 from core.models import User
+from api.eligibility import can_donate
+from api.mail import enqueue
 from .models import PasswordResetToken
 from django.core.mail import send_mail
 from django.conf import settings
@@ -136,7 +138,8 @@ class ForgotPasswordView(APIView):
             subject, text_body, settings.DEFAULT_FROM_EMAIL, [email]
         )
         msg.attach_alternative(html_body, "text/html")
-        msg.send(fail_silently=False)
+        # delivered in the background after commit (api.mail)
+        enqueue(msg)
 
         return Response(
             {"detail": "If the email exists, a reset link was sent."},
@@ -192,7 +195,4 @@ class ProfileView(APIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
     def can_donate(self, user):
-        if not user.last_donation_date:
-            return True
-        three_months_ago = timezone.now().date() - timedelta(days=90)
-        return user.last_donation_date <= three_months_ago
+        return can_donate(user)
@@ -22,6 +22,9 @@ from .models import (
     BloodDonationInterest,
     BloodDonation,
     BloodDonor,
+    OutboundEmail,
+    Notification,
+    NotificationDelivery,
 )
 
 
@@ -134,8 +137,10 @@ class BloodRequestAdmin(admin.ModelAdmin):
         "reason",
         "contact",
         "date_required",
+        "approved",
     )
-    list_filter = ("blood_group", "date_required")
+    list_filter = ("approved", "blood_group", "date_required")
+    actions = ["approve"]
     search_fields = (
         "user__email",
         "blood_group",
@@ -144,6 +149,13 @@ class BloodRequestAdmin(admin.ModelAdmin):
         "reason",
     )
 
+    @admin.action(description="Approve and notify eligible donors")
+    def approve(self, request, queryset):
+        # save() so the notification signal runs for each request
+        for blood_request in queryset.filter(approved=False):
+            blood_request.approved = True
+            blood_request.save(update_fields=["approved"])
+
 
 @admin.register(BloodDonationInterest)
 class BloodDonationInterestAdmin(ModelAdmin):
@@ -233,3 +245,30 @@ class PDFDocumentAdmin(ModelAdmin):
     list_display = ["description", "file", "created_at", "updated_at"]
     search_fields = ["description", "file"]
     list_filter = ["created_at", "updated_at"]
+
+
+@admin.register(OutboundEmail)
+class OutboundEmailAdmin(ModelAdmin):
+    list_display = ["subject", "to", "status", "attempts", "next_attempt_at"]
+    search_fields = ["subject"]
+    list_filter = ["status", "created_at"]
+    readonly_fields = ["claim", "claimed_at", "created_at", "sent_at", "last_error"]
+    # may contain live password reset links
+    exclude = ["body", "html_body"]
+
+
+@admin.register(Notification)
+class NotificationAdmin(ModelAdmin):
+    list_display = ["subject", "kind", "object_id", "created_at"]
+    search_fields = ["subject"]
+    list_filter = ["kind", "created_at"]
+
+
+@admin.register(NotificationDelivery)
+class NotificationDeliveryAdmin(ModelAdmin):
+    list_display = ["address", "channel", "notification", "status", "attempts"]
+    search_fields = ["address"]
+    list_filter = ["status", "channel"]
+    list_select_related = ["notification"]
+    raw_id_fields = ["notification", "user"]
+    readonly_fields = ["claim", "claimed_at", "sent_at", "last_error"]
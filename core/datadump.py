@@ -0,0 +1,210 @@
+"""
+Chunked, resumable NDJSON dump/restore used by the ``dump_chunks`` and
+``load_chunks`` management commands.
+
+Layout of a dump directory::
+
+    progress.json                       per-model dump state (resume point)
+    core.user/000001.ndjson.gz          one gzip'd NDJSON file per chunk
+    core.user/000002.ndjson.gz
+    ...
+
+Rows keep their primary keys and raw foreign key ids, and models are
+processed in foreign-key order so a restore can insert them as they come.
+Foreign keys to models left out of the dump (auth.Permission from the
+User/Group M2M tables) are written as natural keys and looked up again on
+load, since their ids differ between databases.
+"""
+
+import datetime
+import gzip
+import json
+import os
+from contextlib import contextmanager
+
+from django.apps import apps
+from django.core.serializers.json import DjangoJSONEncoder
+
+DUMP_APPS = ["core", "authentication", "social_django"]
+# dumped along with the apps: the groups User.groups points at
+EXTRA_MODELS = ["auth.group"]
+PROGRESS_FILE = "progress.json"
+LOAD_PROGRESS_FILE = "load-progress.json"
+
+
+class DumpEncoder(DjangoJSONEncoder):
+    """DjangoJSONEncoder without its millisecond rounding of times."""
+
+    def default(self, o):
+        if isinstance(o, (datetime.datetime, datetime.time)):
+            return o.isoformat()
+        return super().default(o)
+
+
+def dump_models(app_labels=None):
+    """
+    Concrete models of ``app_labels`` and ``EXTRA_MODELS``, plus the
+    auto-created M2M tables of any of them, parents before children.
+    """
+    selected = []
+    for label in app_labels or DUMP_APPS:
+        try:
+            app_config = apps.get_app_config(label)
+        except LookupError:
+            continue
+        selected.extend(m for m in app_config.get_models() if not m._meta.proxy)
+    for label in EXTRA_MODELS:
+        try:
+            model = apps.get_model(label)
+        except LookupError:
+            continue
+        if model not in selected:
+            selected.append(model)
+    chosen = set(selected)
+    # an M2M table's other end must be dumped too, or have a natural key
+    for model in apps.get_models(include_auto_created=True):
+        if not model._meta.auto_created or model in chosen:
+            continue
+        ends = [f.related_model for f in model._meta.concrete_fields if f.is_relation]
+        if any(end in chosen for end in ends) and all(
+            end in chosen or hasattr(end, "natural_key") for end in ends
+        ):
+            selected.append(model)
+    return sort_by_dependencies(selected)
+
+
+def natural_key_fields(model, models):
+    """Foreign keys of ``model`` to models outside ``models``: attname -> model."""
+    return {
+        f.attname: f.related_model
+        for f in model._meta.concrete_fields
+        if f.is_relation and f.related_model not in models
+    }
+
+
+def to_natural_keys(rows, natural_fields):
+    """Swap the ids in ``natural_fields`` for natural keys (a query per field)."""
+    for attname, related in natural_fields.items():
+        ids = {row[attname] for row in rows if row[attname] is not None}
+        keys = {
+            obj.pk: list(obj.natural_key())
+            for obj in related._base_manager.select_related().filter(pk__in=ids)
+        }
+        for row in rows:
+            if row[attname] is not None:
+                row[attname] = keys[row[attname]]
+    return rows
+
+
+def from_natural_keys(rows, natural_fields, resolved):
+    """
+    Rows with natural keys swapped back for this database's ids, leaving out
+    rows whose target doesn't exist here. ``resolved`` caches lookups.
+    """
+    kept = []
+    for row in rows:
+        for attname, related in natural_fields.items():
+            key = row.get(attname)
+            if key is None:
+                continue
+            cache_key = (related, tuple(key))
+            if cache_key not in resolved:
+                try:
+                    obj = related._default_manager.get_by_natural_key(*key)
+                except related.DoesNotExist:
+                    obj = None
+                resolved[cache_key] = obj and obj.pk
+            row[attname] = resolved[cache_key]
+            if row[attname] is None:
+                break
+        else:
+            kept.append(row)
+    return kept
+
+
+def sort_by_dependencies(models):
+    pending = list(models)
+    chosen = set(models)
+    ordered = []
+    while pending:
+        for model in pending:
+            deps = {
+                f.related_model
+                for f in model._meta.concrete_fields
+                if f.is_relation and f.related_model is not model
+            }
+            if not (deps & chosen) - set(ordered):
+                ordered.append(model)
+                pending.remove(model)
+                break
+        else:
+            # a dependency cycle; keep the remaining models in app order
+            ordered.extend(pending)
+            break
+    return ordered
+
+
+def model_dir(root, model):
+    return os.path.join(root, model._meta.label_lower)
+
+
+def read_json(path, default):
+    if not os.path.exists(path):
+        return default
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def write_json(path, data):
+    """Write ``data`` to ``path`` atomically so a crash never leaves half a file."""
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp, path)
+
+
+def write_chunk(path, rows):
+    tmp = f"{path}.tmp"
+    with gzip.open(tmp, "wt", encoding="utf-8") as f:
+        for row in rows:
+            f.write(json.dumps(row, cls=DumpEncoder, ensure_ascii=False))
+            f.write("\n")
+    os.replace(tmp, path)
+
+
+def read_chunk(path):
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def chunk_files(root, model):
+    directory = model_dir(root, model)
+    if not os.path.isdir(directory):
+        return []
+    return sorted(
+        os.path.join(directory, name)
+        for name in os.listdir(directory)
+        if name.endswith(".ndjson.gz")
+    )
+
+
+@contextmanager
+def keep_timestamps(model):
+    """
+    Stop auto_now/auto_now_add fields from overwriting the dumped values
+    while rows are bulk inserted (``loaddata`` gets the same from raw saves).
+    """
+    flags = [
+        (f, f.auto_now, f.auto_now_add)
+        for f in model._meta.concrete_fields
+        if getattr(f, "auto_now", False) or getattr(f, "auto_now_add", False)
+    ]
+    for field, _, _ in flags:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in flags:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
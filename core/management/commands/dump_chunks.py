@@ -0,0 +1,81 @@
+import os
+
+from django.core.management.base import BaseCommand
+
+from core.datadump import (
+    DUMP_APPS,
+    PROGRESS_FILE,
+    dump_models,
+    model_dir,
+    natural_key_fields,
+    read_json,
+    to_natural_keys,
+    write_chunk,
+    write_json,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Dump core, authentication and social auth tables, user groups and "
+        "permissions as gzip'd NDJSON chunks, paging on the primary key. "
+        "Re-running resumes where an "
+        "interrupted dump stopped; load with `load_chunks`."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("output", help="Directory to write the dump into")
+        parser.add_argument("--chunk-size", type=int, default=5000)
+        parser.add_argument("--apps", nargs="+", default=DUMP_APPS)
+        parser.add_argument(
+            "--restart",
+            action="store_true",
+            help="Ignore recorded progress and dump everything again",
+        )
+
+    def handle(self, *args, **options):
+        root = options["output"]
+        chunk_size = options["chunk_size"]
+        os.makedirs(root, exist_ok=True)
+        progress_path = os.path.join(root, PROGRESS_FILE)
+        progress = {} if options["restart"] else read_json(progress_path, {})
+
+        models = dump_models(options["apps"])
+        for model in models:
+            label = model._meta.label_lower
+            state = progress.setdefault(
+                label, {"last_pk": None, "chunks": 0, "rows": 0, "done": False}
+            )
+            if state["done"]:
+                self.stdout.write(f"{label}: already dumped ({state['rows']} rows)")
+                continue
+
+            os.makedirs(model_dir(root, model), exist_ok=True)
+            pk_name = model._meta.pk.attname
+            fields = [f.attname for f in model._meta.concrete_fields]
+            queryset = model._base_manager.order_by("pk").values(*fields)
+            natural_fields = natural_key_fields(model, set(models))
+
+            while True:
+                chunk = queryset
+                if state["last_pk"] is not None:
+                    chunk = queryset.filter(pk__gt=state["last_pk"])
+                rows = list(chunk[:chunk_size])
+                if not rows:
+                    state["done"] = True
+                    write_json(progress_path, progress)
+                    break
+                state["chunks"] += 1
+                write_chunk(
+                    os.path.join(
+                        model_dir(root, model), f"{state['chunks']:06d}.ndjson.gz"
+                    ),
+                    to_natural_keys(rows, natural_fields),
+                )
+                state["last_pk"] = rows[-1][pk_name]
+                state["rows"] += len(rows)
+                write_json(progress_path, progress)
+
+            self.stdout.write(f"{label}: {state['rows']} rows")
+
+        self.stdout.write(self.style.SUCCESS(f"Dump written to {root}"))
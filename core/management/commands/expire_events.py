@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from core.models import Event
+
+
+class Command(BaseCommand):
+    help = (
+        "Persist is_active=False for events whose date has passed. "
+        "Listing endpoints already hide them at query time; run this "
+        "periodically (e.g. from cron) to keep the stored flag in sync."
+    )
+
+    def handle(self, *args, **options):
+        expired = Event.objects.expire()
+        self.stdout.write(self.style.SUCCESS(f"Deactivated {expired} past event(s)."))
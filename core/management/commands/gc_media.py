@@ -0,0 +1,61 @@
+import os
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.storage import managed_directories, media_storage, reference_counts
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete media files no row references any more (e.g. images dropped "
+        "by QuerySet.delete() or replaced uploads) from the directories of "
+        "content-addressed fields. Files younger than --min-age are kept so "
+        "uploads still being saved are never collected."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--min-age",
+            type=int,
+            default=3600,
+            help="Only delete files older than this many seconds (default 3600)",
+        )
+        parser.add_argument(
+            "--dry-run", action="store_true", help="List what would be deleted"
+        )
+
+    def handle(self, *args, **options):
+        storage = media_storage()
+        counts = reference_counts()
+        cutoff = time.time() - options["min_age"]
+
+        deleted = freed = kept = shared = 0
+        for directory in managed_directories():
+            root = storage.path(directory)
+            for dirpath, _, filenames in os.walk(root):
+                for filename in filenames:
+                    path = os.path.join(dirpath, filename)
+                    name = os.path.relpath(path, storage.location).replace(os.sep, "/")
+                    references = counts.get(name, 0)
+                    if references:
+                        kept += 1
+                        shared += references > 1
+                        continue
+                    if os.path.getmtime(path) > cutoff:
+                        continue
+                    size = os.path.getsize(path)
+                    if options["dry_run"]:
+                        self.stdout.write(f"would delete {name}")
+                    else:
+                        os.remove(path)
+                    deleted += 1
+                    freed += size
+
+        verb = "Would delete" if options["dry_run"] else "Deleted"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{verb} {deleted} unreferenced file(s) ({freed / 1048576:.1f} MiB); "
+                f"{kept} in use, {shared} shared by several rows."
+            )
+        )
@@ -0,0 +1,98 @@
+import os
+
+from django.core.cache import caches
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, transaction
+
+from core.datadump import (
+    LOAD_PROGRESS_FILE,
+    PROGRESS_FILE,
+    chunk_files,
+    dump_models,
+    from_natural_keys,
+    keep_timestamps,
+    natural_key_fields,
+    read_chunk,
+    read_json,
+    write_json,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Load a `dump_chunks` directory with bulk_create, parents before "
+        "children, one transaction per chunk. bulk_create sends no model "
+        "signals. Re-running skips chunks that were already loaded, and rows "
+        "whose primary key is already present."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("input", help="Directory written by dump_chunks")
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        root = options["input"]
+        dumped = read_json(os.path.join(root, PROGRESS_FILE), None)
+        if dumped is None:
+            raise CommandError(f"{root} does not contain a dump_chunks dump.")
+        incomplete = [label for label, state in dumped.items() if not state["done"]]
+        if incomplete:
+            raise CommandError(
+                f"The dump is incomplete ({', '.join(incomplete)}); "
+                "re-run dump_chunks first."
+            )
+
+        progress_path = os.path.join(root, LOAD_PROGRESS_FILE)
+        progress = read_json(progress_path, {"loaded": []})
+        loaded = set(progress["loaded"])
+        app_labels = sorted({label.split(".")[0] for label in dumped})
+        models = [m for m in dump_models(app_labels) if m._meta.label_lower in dumped]
+        resolved = {}
+
+        for model in models:
+            fields = {f.attname: f for f in model._meta.concrete_fields}
+            natural_fields = natural_key_fields(model, set(models))
+            batch_size = options["batch_size"]
+            rows_loaded = 0
+            for path in chunk_files(root, model):
+                name = os.path.relpath(path, root)
+                if name in loaded:
+                    continue
+                objs = [
+                    model(
+                        **{
+                            key: fields[key].to_python(value)
+                            for key, value in row.items()
+                            if key in fields
+                        }
+                    )
+                    for row in from_natural_keys(
+                        list(read_chunk(path)), natural_fields, resolved
+                    )
+                ]
+                with transaction.atomic(), keep_timestamps(model):
+                    for start in range(0, len(objs), batch_size):
+                        batch = objs[start : start + batch_size]
+                        # a crash after the commit but before the progress
+                        # write leaves this chunk loaded but not recorded
+                        existing = set(
+                            model._base_manager.filter(
+                                pk__in=[obj.pk for obj in batch]
+                            ).values_list("pk", flat=True)
+                        )
+                        batch = [obj for obj in batch if obj.pk not in existing]
+                        model._base_manager.bulk_create(batch)
+                        rows_loaded += len(batch)
+                loaded.add(name)
+                progress["loaded"].append(name)
+                write_json(progress_path, progress)
+            self.stdout.write(f"{model._meta.label_lower}: {rows_loaded} rows")
+
+        # rows were inserted with explicit ids; move sequences past them
+        with connection.cursor() as cursor:
+            for sql in connection.ops.sequence_reset_sql(no_style(), models):
+                cursor.execute(sql)
+        # cached responses and donor match buckets describe the old data
+        caches["default"].clear()
+        self.stdout.write(self.style.SUCCESS("Load complete."))
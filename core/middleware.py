@@ -0,0 +1,49 @@
+"""
+Async-capable versions of third-party middleware that only support sync.
+
+A single sync-only middleware makes Django run the rest of the chain, view
+included, in a thread for every ASGI request; with these the async public
+views (api.async_views) never hold one. Under WSGI they behave exactly like
+the originals.
+"""
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.utils.deprecation import MiddlewareMixin
+from social_django import middleware as social_middleware
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+
+class StaticFilesMiddleware(WhiteNoiseMiddleware):
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None, *args, **kwargs):
+        super().__init__(get_response, *args, **kwargs)
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            static_file = await sync_to_async(self.find_file)(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            # opens the file and stats it; the body is streamed by the server
+            return await sync_to_async(self.serve)(static_file, request)
+        return await self.get_response(request)
+
+
+class SocialAuthExceptionMiddleware(
+    social_middleware.SocialAuthExceptionMiddleware, MiddlewareMixin
+):
+    # all the work happens in process_exception, which Django adapts itself
+    def __init__(self, get_response):
+        MiddlewareMixin.__init__(self, get_response)
+
+    __call__ = MiddlewareMixin.__call__
@@ -0,0 +1,46 @@
+# Generated by Django 5.2 on 2026-10-17 14:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0018_blog_event_teammember_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='blog',
+            index=models.Index(
+                fields=['created_at', 'published'], name='blog_created_published_idx'
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='blooddonation',
+            index=models.Index(
+                fields=['user', 'donation_date'], name='donation_user_date_idx'
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='blooddonationinterest',
+            index=models.Index(
+                fields=['donation', 'available_date'],
+                name='interest_donation_avail_idx',
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='blooddonor',
+            index=models.Index(fields=['created_at'], name='donor_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='blooddonor',
+            index=models.Index(fields=['blood_group'], name='donor_blood_group_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(
+                fields=['date', 'is_active'], name='event_date_active_idx'
+            ),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2 on 2026-10-17 14:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('core', '0019_hot_query_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='blooddonor',
+            name='donor_blood_group_idx',
+        ),
+        migrations.AddIndex(
+            model_name='blooddonor',
+            index=models.Index(
+                fields=['blood_group', 'last_donated_date'],
+                name='donor_group_last_donated_idx',
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(
+                fields=['blood_group', 'last_donation_date'],
+                name='user_group_last_donation_idx',
+            ),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2 on 2026-10-17 15:06
+
+import core.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0022_image_upload_status'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='about',
+            name='image',
+            field=models.ImageField(
+                blank=True,
+                null=True,
+                storage=core.storage.media_storage,
+                upload_to='about/',
+            ),
+        ),
+        migrations.AlterField(
+            model_name='image',
+            name='image',
+            field=models.ImageField(
+                blank=True, storage=core.storage.media_storage, upload_to='images/'
+            ),
+        ),
+        migrations.AlterField(
+            model_name='pdfdocument',
+            name='file',
+            field=models.FileField(
+                storage=core.storage.media_storage, upload_to='pdfs/'
+            ),
+        ),
+    ]
@@ -0,0 +1,141 @@
+# Generated by Django 5.2 on 2026-10-17 15:09
+
+from django.db import OperationalError, migrations, models
+from django.utils.html import strip_tags
+
+# FTS5 index over core_searchdocument, kept in sync by triggers
+SQLITE_FTS = [
+    '''CREATE VIRTUAL TABLE core_searchdocument_fts USING fts5(
+        title, body, content='core_searchdocument', content_rowid='id'
+    )''',
+    '''CREATE TRIGGER core_searchdocument_ai AFTER INSERT ON core_searchdocument
+    BEGIN
+        INSERT INTO core_searchdocument_fts(rowid, title, body)
+        VALUES (new.id, new.title, new.body);
+    END''',
+    '''CREATE TRIGGER core_searchdocument_ad AFTER DELETE ON core_searchdocument
+    BEGIN
+        INSERT INTO core_searchdocument_fts(core_searchdocument_fts, rowid, title, body)
+        VALUES ('delete', old.id, old.title, old.body);
+    END''',
+    '''CREATE TRIGGER core_searchdocument_au AFTER UPDATE ON core_searchdocument
+    BEGIN
+        INSERT INTO core_searchdocument_fts(core_searchdocument_fts, rowid, title, body)
+        VALUES ('delete', old.id, old.title, old.body);
+        INSERT INTO core_searchdocument_fts(rowid, title, body)
+        VALUES (new.id, new.title, new.body);
+    END''',
+]
+SQLITE_FTS_DROP = [
+    'DROP TRIGGER IF EXISTS core_searchdocument_ai',
+    'DROP TRIGGER IF EXISTS core_searchdocument_ad',
+    'DROP TRIGGER IF EXISTS core_searchdocument_au',
+    'DROP TABLE IF EXISTS core_searchdocument_fts',
+]
+MYSQL_FULLTEXT = [
+    'ALTER TABLE core_searchdocument '
+    'ADD FULLTEXT INDEX searchdoc_title_ft (title), '
+    'ADD FULLTEXT INDEX searchdoc_text_ft (title, body)',
+]
+MYSQL_FULLTEXT_DROP = [
+    'ALTER TABLE core_searchdocument '
+    'DROP INDEX searchdoc_title_ft, DROP INDEX searchdoc_text_ft',
+]
+
+
+def create_fulltext_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        try:
+            for sql in SQLITE_FTS:
+                schema_editor.execute(sql)
+        except OperationalError:
+            # SQLite built without FTS5: api.search falls back to Python
+            for sql in SQLITE_FTS_DROP:
+                schema_editor.execute(sql)
+    elif vendor == 'mysql':
+        for sql in MYSQL_FULLTEXT:
+            schema_editor.execute(sql)
+
+
+def drop_fulltext_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        for sql in SQLITE_FTS_DROP:
+            schema_editor.execute(sql)
+    elif vendor == 'mysql':
+        for sql in MYSQL_FULLTEXT_DROP:
+            schema_editor.execute(sql)
+
+
+def index_existing_content(apps, schema_editor):
+    SearchDocument = apps.get_model('core', 'SearchDocument')
+    Blog = apps.get_model('core', 'Blog')
+    Event = apps.get_model('core', 'Event')
+    documents = [
+        SearchDocument(
+            kind='blog',
+            object_id=blog.pk,
+            title=blog.title,
+            body=strip_tags(blog.content),
+            slug=blog.slug,
+            date=blog.created_at,
+            visible=blog.published,
+        )
+        for blog in Blog.objects.all()
+    ] + [
+        SearchDocument(
+            kind='event',
+            object_id=event.pk,
+            title=event.title,
+            body=f'{strip_tags(event.description)}\n{event.location}',
+            date=event.date,
+        )
+        for event in Event.objects.all()
+    ]
+    SearchDocument.objects.bulk_create(documents, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0023_content_addressed_media'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchDocument',
+            fields=[
+                (
+                    'id',
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name='ID',
+                    ),
+                ),
+                (
+                    'kind',
+                    models.CharField(
+                        choices=[('blog', 'Blog'), ('event', 'Event')], max_length=10
+                    ),
+                ),
+                ('object_id', models.PositiveBigIntegerField()),
+                ('title', models.CharField(max_length=255)),
+                ('body', models.TextField(blank=True)),
+                ('slug', models.CharField(blank=True, max_length=80)),
+                ('date', models.DateTimeField(blank=True, null=True)),
+                ('visible', models.BooleanField(default=True)),
+            ],
+            options={
+                'constraints': [
+                    models.UniqueConstraint(
+                        fields=('kind', 'object_id'), name='searchdoc_kind_object_uniq'
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(create_fulltext_index, drop_fulltext_index),
+        migrations.RunPython(index_existing_content, migrations.RunPython.noop),
+    ]
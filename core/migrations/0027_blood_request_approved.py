@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-17 15:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0026_notifications'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='bloodrequest',
+            name='approved',
+            field=models.BooleanField(default=False),
+        ),
+    ]
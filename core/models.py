@@ -3,6 +3,8 @@ from django.contrib.auth.models import AbstractUser, BaseUserManager
 from django.utils.text import slugify
 from django.utils import timezone
 
+from .storage import media_storage
+
 
 class UserManager(BaseUserManager):
     def create_user(self, email, password=None, **extra_fields):
@@ -63,12 +65,29 @@ class User(AbstractUser):
     address = models.TextField(blank=True)
     last_donation_date = models.DateField(null=True, blank=True)
 
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            models.Index(
+                fields=["blood_group", "last_donation_date"],
+                name="user_group_last_donation_idx",
+            ),
+        ]
+
     def __str__(self):
         return self.email
 
 
 class Image(models.Model):
-    image = models.ImageField(upload_to="images/")
+    STATUS_PENDING = "pending"
+    STATUS_READY = "ready"
+    STATUS_FAILED = "failed"
+    STATUS_CHOICES = [
+        (STATUS_PENDING, "Pending"),
+        (STATUS_READY, "Ready"),
+        (STATUS_FAILED, "Failed"),
+    ]
+
+    image = models.ImageField(upload_to="images/", storage=media_storage, blank=True)
     blog = models.ForeignKey(
         "Blog", on_delete=models.CASCADE, related_name="images", null=True, blank=True
     )
@@ -85,6 +104,14 @@ class Image(models.Model):
     about = models.ForeignKey(
         "About", on_delete=models.CASCADE, null=True, blank=True, related_name="images"
     )
+    # resized WebP/JPEG copies, filled in the background by api.images
+    variants = models.JSONField(default=dict, blank=True, editable=False)
+    # uploads through the API are stored in the background (api.uploads)
+    status = models.CharField(
+        max_length=10, choices=STATUS_CHOICES, default=STATUS_READY, editable=False
+    )
+    staged_file = models.CharField(max_length=500, blank=True, editable=False)
+    checksum = models.CharField(max_length=64, blank=True, editable=False)
 
     def __str__(self):
         return f"Image for {self.blog or self.event}"
@@ -96,8 +123,16 @@ class Blog(models.Model):
     slug = models.SlugField(unique=True, blank=True, max_length=80)
     content = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     published = models.BooleanField(default=False)
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["created_at", "published"], name="blog_created_published_idx"
+            ),
+        ]
+
     def __str__(self):
         return self.title
 
@@ -120,16 +155,46 @@ class Blog(models.Model):
         super().save(*args, **kwargs)
 
 
+class EventQuerySet(models.QuerySet):
+    # Expiry is decided against the clock at query time; the stored is_active
+    # flag is only persisted in bulk by the ``expire_events`` command.
+    def upcoming(self):
+        return self.filter(is_active=True, date__gte=timezone.now())
+
+    def past(self):
+        return self.filter(
+            models.Q(is_active=False) | models.Q(date__lt=timezone.now())
+        )
+
+    def expire(self):
+        now = timezone.now()
+        return self.filter(is_active=True, date__lt=now).update(
+            is_active=False, updated_at=now
+        )
+
+
 class Event(models.Model):
     title = models.CharField(max_length=255)
     description = models.TextField()
     location = models.CharField(max_length=255)
     date = models.DateTimeField()
     is_active = models.BooleanField(default=True)  # NEW
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = EventQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["date", "is_active"], name="event_date_active_idx"),
+        ]
 
     def __str__(self):
         return self.title
 
+    @property
+    def is_expired(self):
+        return bool(self.date) and self.date < timezone.now()
+
     def save(self, *args, **kwargs):
         # Auto-deactivate if the date is already in the past
         if self.date and self.date < timezone.now():
@@ -189,6 +254,8 @@ class BloodRequest(models.Model):
     collection_location = models.CharField(max_length=255, blank=True, null=True)
     reason = models.TextField(blank=True, null=True)
     date_required = models.DateField()
+    # set by staff; donors are only notified of approved requests
+    approved = models.BooleanField(default=False)
 
     def __str__(self):
         return f"Request by {self.user} for {self.blood_group}"
@@ -208,6 +275,14 @@ class BloodDonationInterest(models.Model):
         related_name="source_interest",
     )
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["donation", "available_date"],
+                name="interest_donation_avail_idx",
+            ),
+        ]
+
     def __str__(self):
         return f"Interest by {self.user} for {self.blood_group}"
 
@@ -223,6 +298,11 @@ class BloodDonation(models.Model):
 
     class Meta:
         ordering = ["-donation_date", "-id"]
+        indexes = [
+            models.Index(
+                fields=["user", "donation_date"], name="donation_user_date_idx"
+            ),
+        ]
 
     def __str__(self):
         return f"Donation by {self.user.email} on {self.donation_date} ({self.blood_group})"
@@ -245,6 +325,13 @@ class BloodDonor(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["created_at"], name="donor_created_idx"),
+            models.Index(
+                fields=["blood_group", "last_donated_date"],
+                name="donor_group_last_donated_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.name} ({self.blood_group})"
@@ -252,7 +339,7 @@ class BloodDonor(models.Model):
 
 class PDFDocument(models.Model):
     description = models.TextField(blank=True)
-    file = models.FileField(upload_to="pdfs/")
+    file = models.FileField(upload_to="pdfs/", storage=media_storage)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -266,7 +353,9 @@ class About(models.Model):
     years_experience = models.PositiveIntegerField()
     patients_served = models.CharField(max_length=50)
     satisfaction_rate = models.CharField(max_length=50)
-    image = models.ImageField(upload_to="about/", blank=True, null=True)
+    image = models.ImageField(
+        upload_to="about/", storage=media_storage, blank=True, null=True
+    )
 
     def __str__(self):
         return self.title
@@ -285,6 +374,7 @@ class TeamMember(models.Model):
     name = models.CharField(max_length=255)
     role = models.CharField(max_length=100)
     session = models.CharField(max_length=100)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return self.name
@@ -357,3 +447,158 @@ class HomeAboutAchievement(models.Model):
 
     def __str__(self):
         return self.title
+
+
+class SearchDocument(models.Model):
+    """
+    Searchable text of one Blog or Event, kept in sync by signals in
+    ``api.signals`` and queried through ``api.search`` (FTS5 on SQLite,
+    FULLTEXT on MySQL, see migration 0024).
+    """
+
+    KIND_BLOG = "blog"
+    KIND_EVENT = "event"
+    KIND_CHOICES = [(KIND_BLOG, "Blog"), (KIND_EVENT, "Event")]
+
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    object_id = models.PositiveBigIntegerField()
+    title = models.CharField(max_length=255)
+    body = models.TextField(blank=True)
+    slug = models.CharField(max_length=80, blank=True)
+    date = models.DateTimeField(null=True, blank=True)
+    # unpublished blogs are indexed but never returned
+    visible = models.BooleanField(default=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["kind", "object_id"], name="searchdoc_kind_object_uniq"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.kind}: {self.title}"
+
+
+class OutboundEmail(models.Model):
+    """
+    A queued outgoing email, delivered in the background by ``api.mail``
+    (``manage.py send_queued_mail`` or the in-process task after commit).
+    """
+
+    STATUS_QUEUED = "queued"
+    STATUS_SENDING = "sending"
+    STATUS_SENT = "sent"
+    STATUS_FAILED = "failed"
+    STATUS_CHOICES = [
+        (STATUS_QUEUED, "Queued"),
+        (STATUS_SENDING, "Sending"),
+        (STATUS_SENT, "Sent"),
+        (STATUS_FAILED, "Failed"),
+    ]
+
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    html_body = models.TextField(blank=True)
+    from_email = models.CharField(max_length=254, blank=True)
+    to = models.JSONField(default=list)
+    status = models.CharField(
+        max_length=10, choices=STATUS_CHOICES, default=STATUS_QUEUED
+    )
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    # set by the worker that claimed the row while it is being sent
+    claim = models.CharField(max_length=32, blank=True)
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["status", "next_attempt_at"], name="outbound_email_due_idx"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} -> {', '.join(self.to)} ({self.status})"
+
+
+class Notification(models.Model):
+    """
+    A donor notification about a blood request or event, rendered once; one
+    ``NotificationDelivery`` per recipient and channel (api.notifications).
+    """
+
+    KIND_BLOOD_REQUEST = "blood_request"
+    KIND_EVENT = "event"
+    KIND_CHOICES = [
+        (KIND_BLOOD_REQUEST, "Blood request"),
+        (KIND_EVENT, "Event"),
+    ]
+
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    object_id = models.PositiveIntegerField()
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    html_body = models.TextField(blank=True)
+    sms_body = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["kind", "object_id"], name="notification_kind_object_uniq"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} #{self.object_id}: {self.subject}"
+
+
+class NotificationDelivery(models.Model):
+    CHANNEL_EMAIL = "email"
+    CHANNEL_SMS = "sms"
+    CHANNEL_CHOICES = [
+        (CHANNEL_EMAIL, "Email"),
+        (CHANNEL_SMS, "SMS"),
+    ]
+
+    STATUS_QUEUED = OutboundEmail.STATUS_QUEUED
+    STATUS_SENDING = OutboundEmail.STATUS_SENDING
+    STATUS_SENT = OutboundEmail.STATUS_SENT
+    STATUS_FAILED = OutboundEmail.STATUS_FAILED
+    STATUS_CHOICES = OutboundEmail.STATUS_CHOICES
+
+    notification = models.ForeignKey(
+        Notification, on_delete=models.CASCADE, related_name="deliveries"
+    )
+    user = models.ForeignKey("User", on_delete=models.SET_NULL, null=True, blank=True)
+    channel = models.CharField(max_length=5, choices=CHANNEL_CHOICES)
+    # email address or phone number, copied when the notification fanned out
+    address = models.CharField(max_length=254)
+    status = models.CharField(
+        max_length=10, choices=STATUS_CHOICES, default=STATUS_QUEUED
+    )
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    claim = models.CharField(max_length=32, blank=True)
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name_plural = "notification deliveries"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["notification", "channel", "address"],
+                name="delivery_recipient_uniq",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["status", "next_attempt_at"], name="delivery_due_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.channel} to {self.address} ({self.status})"
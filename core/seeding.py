@@ -0,0 +1,395 @@
+"""
+Deterministic synthetic data for benchmarks and scale tests.
+
+Every table is generated in chunks of ``chunk_size`` rows. Rows get explicit
+primary keys allocated above the table's current maximum, and every value is
+a pure function of (seed, row number), so:
+
+- the same seed always produces the same data;
+- foreign keys are computed, never read back from the database;
+- chunks do not depend on each other and can be written in any order, or
+  by several processes at once (``seed(processes=N)``).
+
+Donation histories respect the 90-day rule enforced by
+``BloodDonationSerializer.validate``: each user's donations are 91 days
+apart and the latest is 106-195 days old, so every seeded user may donate
+today and no seeded interest (at most 15 days overdue) comes too early.
+"""
+
+import multiprocessing
+from datetime import timedelta
+
+import django
+from django.core.management.color import no_style
+from django.db import connection, connections, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from .datadump import keep_timestamps
+from .models import (
+    Blog,
+    BlogComment,
+    BloodDonation,
+    BloodDonationInterest,
+    BloodDonor,
+    BloodRequest,
+    Event,
+    Image,
+    User,
+)
+
+DONATION_SPACING = timedelta(days=91)
+
+# rough share of each group among donors, in percent
+BLOOD_GROUP_WEIGHTS = [
+    ("O+", 34),
+    ("B+", 30),
+    ("A+", 20),
+    ("AB+", 8),
+    ("O-", 3),
+    ("B-", 2),
+    ("A-", 2),
+    ("AB-", 1),
+]
+BLOOD_GROUP_TABLE = [g for g, weight in BLOOD_GROUP_WEIGHTS for _ in range(weight)]
+
+FIRST_NAMES = [
+    "Rahim", "Karim", "Nadia", "Sumi", "Tanvir", "Farhana", "Arif", "Mitu",
+    "Sabbir", "Jannat", "Imran", "Tania", "Rakib", "Nusrat", "Shakil", "Ayesha",
+]  # fmt: skip
+LAST_NAMES = [
+    "Hossain", "Rahman", "Islam", "Ahmed", "Chowdhury", "Khan", "Akter",
+    "Sarker", "Uddin", "Begum", "Alam", "Das",
+]  # fmt: skip
+PLACES = [
+    "Dhaka Medical College", "Suhrawardy Hospital", "Mirpur", "Mohammadpur",
+    "Dhanmondi", "Uttara", "Shyamoli", "Farmgate",
+]  # fmt: skip
+WORDS = (
+    "blood donation camp health awareness volunteer student hospital patient "
+    "vaccine thalassemia emergency plasma platelet community service campus "
+    "screening donor drive medical college week program support"
+).split()
+
+# table order respects foreign keys; DEFAULT_COUNTS is a quick local run
+TABLES = [
+    "users",
+    "donors",
+    "donations",
+    "interests",
+    "requests",
+    "blogs",
+    "images",
+    "comments",
+    "events",
+]
+DEFAULT_COUNTS = {
+    "users": 2000,
+    "donors": 1000,
+    "donations": 6000,
+    "interests": 500,
+    "requests": 500,
+    "blogs": 500,
+    "images": 1000,
+    "comments": 1000,
+    "events": 200,
+}
+MODELS = {
+    "users": User,
+    "donors": BloodDonor,
+    "donations": BloodDonation,
+    "interests": BloodDonationInterest,
+    "requests": BloodRequest,
+    "blogs": Blog,
+    "images": Image,
+    "comments": BlogComment,
+    "events": Event,
+}
+
+
+def _mix(seed, table, n):
+    """Cheap, well-spread deterministic integer for row ``n`` of ``table``."""
+    x = (seed * 0x9E3779B1 + _table_hash(table) * 0x85EBCA6B + n * 0xC2B2AE35) & (
+        2**64 - 1
+    )
+    x ^= x >> 33
+    x = (x * 0xFF51AFD7ED558CCD) & (2**64 - 1)
+    x ^= x >> 33
+    return x
+
+
+def _table_hash(table):
+    # str hash() is salted per process; this one is stable
+    return sum((i + 1) * ord(c) for i, c in enumerate(table))
+
+
+def _pick(options, seed, table, n, salt=0):
+    return options[_mix(seed, table, n * 8 + salt) % len(options)]
+
+
+def _sentence(seed, table, n, words):
+    return " ".join(_pick(WORDS, seed, table, n, salt=i) for i in range(words))
+
+
+class SeedPlan:
+    """
+    Row counts per table plus the first primary key each table will use.
+    Build it once, then generate/write any chunk of it.
+    """
+
+    def __init__(self, counts=None, seed=0, chunk_size=5000, today=None):
+        self.counts = {table: 0 for table in TABLES}
+        self.counts.update(counts or DEFAULT_COUNTS)
+        self.seed = seed
+        self.chunk_size = chunk_size
+        self.today = today or timezone.now().date()
+        self.now = timezone.now()
+        self.base = {
+            table: (model.objects.aggregate(m=Max("pk"))["m"] or 0) + 1
+            for table, model in MODELS.items()
+        }
+
+    def chunks(self, table):
+        """(start, stop) row ranges covering ``table``."""
+        total = self.counts[table]
+        return [
+            (start, min(start + self.chunk_size, total))
+            for start in range(0, total, self.chunk_size)
+        ]
+
+    # row n of a table -> primary key
+    def pk(self, table, n):
+        return self.base[table] + n
+
+    def blood_group(self, user_n):
+        return _pick(BLOOD_GROUP_TABLE, self.seed, "users", user_n, salt=3)
+
+    def last_donation_offset(self, user_n):
+        # 106..195 days ago: eligible again even for interests 15 days overdue
+        return DONATION_SPACING.days + 15 + _mix(self.seed, "offset", user_n) % 90
+
+    def donations_of(self, user_n):
+        users = self.counts["users"]
+        count, extra = divmod(self.counts["donations"], users) if users else (0, 0)
+        return count + (1 if user_n < extra else 0)
+
+    def last_donation_date(self, user_n):
+        if not self.donations_of(user_n):
+            return None
+        return self.today - timedelta(days=self.last_donation_offset(user_n))
+
+    def phone(self, user_n):
+        return f"01{7 + user_n % 3}{(user_n * 7919) % 100000000:08d}"
+
+    # generators: one model instance per row n in [start, stop)
+    def users(self, start, stop):
+        for n in range(start, stop):
+            yield User(
+                pk=self.pk("users", n),
+                email=f"seed{self.seed}-{n}@example.com",
+                password="!",  # unusable; hashing would dominate seeding time
+                first_name=_pick(FIRST_NAMES, self.seed, "users", n, 1),
+                last_name=_pick(LAST_NAMES, self.seed, "users", n, 2),
+                phone=self.phone(n),
+                blood_group=self.blood_group(n),
+                last_donation_date=self.last_donation_date(n),
+                date_joined=self.now,
+            )
+
+    def donors(self, start, stop):
+        for n in range(start, stop):
+            # a tenth never donated; the rest up to two years ago
+            days = _mix(self.seed, "donors", n) % 730
+            yield BloodDonor(
+                pk=self.pk("donors", n),
+                name=f"{_pick(FIRST_NAMES, self.seed, 'donors', n, 1)} "
+                f"{_pick(LAST_NAMES, self.seed, 'donors', n, 2)}",
+                batch=f"K-{60 + n % 20}",
+                blood_group=_pick(BLOOD_GROUP_TABLE, self.seed, "donors", n, 3),
+                phone=f"019{(n * 104729) % 100000000:08d}",
+                last_donated_date=(
+                    None if n % 10 == 0 else self.today - timedelta(days=days)
+                ),
+                gender=_pick(["Male", "Female"], self.seed, "donors", n, 4),
+                created_at=self.now,
+            )
+
+    def donations(self, start, stop):
+        users = self.counts["users"]
+        for n in range(start, stop):
+            # donation n is the k-th most recent one of user n % users
+            user_n, k = n % users, n // users
+            date = self.last_donation_date(user_n) - DONATION_SPACING * k
+            yield BloodDonation(
+                pk=self.pk("donations", n),
+                user_id=self.pk("users", user_n),
+                blood_group=self.blood_group(user_n),
+                donation_date=date,
+                contact_info=self.phone(user_n),
+                notes="Seeded donation",
+                created_at=self.now,
+            )
+
+    def interests(self, start, stop):
+        for n in range(start, stop):
+            # 7919 is prime: one interest per user until there are more
+            # interests than users
+            user_n = (n * 7919) % self.counts["users"]
+            yield BloodDonationInterest(
+                pk=self.pk("interests", n),
+                user_id=self.pk("users", user_n),
+                blood_group=self.blood_group(user_n),
+                # a third are due now, the rest spread over the next weeks
+                available_date=self.today
+                + timedelta(days=_mix(self.seed, "interests", n) % 45 - 15),
+                contact_info=self.phone(user_n),
+            )
+
+    def requests(self, start, stop):
+        for n in range(start, stop):
+            user_n = (n * 104729) % self.counts["users"]
+            yield BloodRequest(
+                pk=self.pk("requests", n),
+                user_id=self.pk("users", user_n),
+                blood_group=_pick(BLOOD_GROUP_TABLE, self.seed, "requests", n),
+                location=_pick(PLACES, self.seed, "requests", n, 1),
+                contact=self.phone(user_n),
+                collection_location=_pick(PLACES, self.seed, "requests", n, 2),
+                reason=_sentence(self.seed, "requests", n, 6),
+                date_required=self.today
+                + timedelta(days=_mix(self.seed, "requests", n) % 30),
+            )
+
+    def blogs(self, start, stop):
+        for n in range(start, stop):
+            yield Blog(
+                pk=self.pk("blogs", n),
+                title=_sentence(self.seed, "blogs", n, 5).capitalize(),
+                slug=f"seed{self.seed}-post-{n}",
+                content=_sentence(self.seed, "blog-body", n, 120),
+                # nine in ten published
+                published=n % 10 != 0,
+                created_at=self.now - timedelta(hours=n),
+                updated_at=self.now,
+            )
+
+    def images(self, start, stop):
+        blogs = self.counts["blogs"]
+        for n in range(start, stop):
+            yield Image(
+                pk=self.pk("images", n),
+                blog_id=self.pk("blogs", n % blogs) if blogs else None,
+                image=f"images/seed/{n % 50}.jpg",
+            )
+
+    def comments(self, start, stop):
+        blogs = self.counts["blogs"]
+        for n in range(start, stop):
+            yield BlogComment(
+                pk=self.pk("comments", n),
+                user_id=self.pk("users", (n * 31) % self.counts["users"]),
+                blog_id=self.pk("blogs", n % blogs),
+                comment=_sentence(self.seed, "comments", n, 12),
+                created_at=self.now,
+            )
+
+    def events(self, start, stop):
+        for n in range(start, stop):
+            # half in the past, half upcoming
+            offset = timedelta(days=n % 120 - 60, hours=n % 24)
+            date = self.now + offset
+            yield Event(
+                pk=self.pk("events", n),
+                title=_sentence(self.seed, "events", n, 4).capitalize(),
+                description=_sentence(self.seed, "event-body", n, 40),
+                location=_pick(PLACES, self.seed, "events", n),
+                date=date,
+                is_active=date >= self.now,
+                updated_at=self.now,
+            )
+
+    def build_chunk(self, table, start, stop):
+        return list(getattr(self, table)(start, stop))
+
+    def insert(self, table, rows, batch_size=1000):
+        """bulk_create ``rows`` in one transaction; returns the row count."""
+        with keep_timestamps(MODELS[table]), transaction.atomic():
+            MODELS[table].objects.bulk_create(rows, batch_size=batch_size)
+        return len(rows)
+
+    def write_chunk(self, table, start, stop, batch_size=1000):
+        """Insert rows [start, stop) of ``table``; returns the row count."""
+        return self.insert(table, self.build_chunk(table, start, stop), batch_size)
+
+    def validate(self):
+        for table, parent in [
+            ("donations", "users"),
+            ("interests", "users"),
+            ("requests", "users"),
+            ("comments", "users"),
+            ("comments", "blogs"),
+        ]:
+            if self.counts[table] and not self.counts[parent]:
+                raise ValueError(f"Seeding {table} needs at least one of {parent}.")
+
+
+def reset_sequences():
+    """Move auto-increment sequences past the explicit keys (PostgreSQL etc.)."""
+    statements = connection.ops.sequence_reset_sql(no_style(), list(MODELS.values()))
+    if statements:
+        with connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
+
+
+def _init_worker():
+    # spawned workers start from scratch; forked ones must not share the
+    # parent's database connections
+    django.setup()
+    connections.close_all()
+
+
+def _run_chunk(job):
+    plan, table, start, stop, write = job
+    if write:
+        count = plan.write_chunk(table, start, stop)
+        connections.close_all()
+        return count
+    return plan.build_chunk(table, start, stop)
+
+
+def seed(counts=None, seed=0, chunk_size=5000, processes=1, progress=None):
+    """
+    Generate every table of a plan, parents before children; returns the plan.
+
+    With ``processes`` > 1 the chunks of each table are spread over a process
+    pool. Workers insert their own chunks, except on SQLite, which allows a
+    single writer: there they only build the rows and this process inserts.
+    """
+    plan = SeedPlan(counts, seed=seed, chunk_size=chunk_size)
+    plan.validate()
+    if processes > 1:
+        _seed_parallel(plan, processes, progress)
+    else:
+        for table in TABLES:
+            for start, stop in plan.chunks(table):
+                plan.write_chunk(table, start, stop)
+                if progress:
+                    progress(table, stop, plan.counts[table])
+    reset_sequences()
+    return plan
+
+
+def _seed_parallel(plan, processes, progress):
+    write = connection.vendor != "sqlite"
+    connections.close_all()
+    with multiprocessing.Pool(processes, initializer=_init_worker) as pool:
+        for table in TABLES:
+            jobs = [
+                (plan, table, start, stop, write) for start, stop in plan.chunks(table)
+            ]
+            done = 0
+            for result in pool.imap_unordered(_run_chunk, jobs):
+                done += result if write else plan.insert(table, result)
+                if progress:
+                    progress(table, done, plan.counts[table])
@@ -0,0 +1,109 @@
+"""
+Content-addressed media storage.
+
+Uploads to the fields using ``media_storage`` are stored under the SHA-256
+of their content, inside the directory the field would have used anyway::
+
+    images/3f/3f2a...c9.jpg
+
+so the same photo uploaded twice (or to a blog and an event) is written
+once and shared. Since a file may back several rows, ``delete()`` leaves
+content-addressed files alone; ``manage.py gc_media`` counts the references
+to every file and removes the ones nothing points at any more.
+"""
+
+import hashlib
+import os
+import re
+from collections import Counter
+
+from django.apps import apps
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage, storages
+from django.db import models
+
+CONTENT_NAME_RE = re.compile(r"(?:^|/)([0-9a-f]{2})/\1[0-9a-f]{62}(?:\.[0-9a-z]+)?$")
+
+
+def media_storage():
+    return storages["media"]
+
+
+def is_content_addressed(name):
+    return bool(CONTENT_NAME_RE.search(name or ""))
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    def content_name(self, name, digest):
+        directory = os.path.dirname(name)
+        extension = os.path.splitext(name)[1].lower()
+        if not re.fullmatch(r"\.[0-9a-z]{1,10}", extension):
+            extension = ""
+        return os.path.join(directory, digest[:2], f"{digest}{extension}")
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, "chunks"):
+            content = File(content, name)
+        digest = hashlib.sha256()
+        for chunk in content.chunks():
+            digest.update(chunk)
+        target = self.content_name(name, digest.hexdigest())
+        if self.exists(target):
+            try:
+                # a reused file is as young as the upload, so gc_media
+                # (--min-age) can't collect it before our row is committed
+                os.utime(self.path(target))
+                return target
+            except FileNotFoundError:
+                # collected in the meantime: write it again
+                pass
+        return super().save(target, content, max_length=max_length)
+
+    def delete(self, name):
+        # shared between rows; unreferenced copies are removed by gc_media
+        if not is_content_addressed(name):
+            super().delete(name)
+
+
+def file_fields():
+    """(model, field) for every FileField/ImageField in the project."""
+    return [
+        (model, field)
+        for model in apps.get_models()
+        for field in model._meta.concrete_fields
+        if isinstance(field, models.FileField)
+    ]
+
+
+def reference_counts():
+    """How many rows point at each stored file name, variants included."""
+    counts = Counter()
+    for model, field in file_fields():
+        names = (
+            model._default_manager.exclude(**{field.attname: ""})
+            .exclude(**{f"{field.attname}__isnull": True})
+            .values_list(field.attname, flat=True)
+        )
+        counts.update(names.iterator())
+
+    Image = apps.get_model("core", "Image")
+    for variants in (
+        Image.objects.exclude(variants={}).values_list("variants", flat=True).iterator()
+    ):
+        for key, widths in variants.items():
+            if key != "source":
+                counts.update(widths.values())
+    return counts
+
+
+def managed_directories():
+    """Top-level media directories written by content-addressed fields."""
+    return sorted(
+        {
+            str(field.upload_to).split("/")[0]
+            for _, field in file_fields()
+            if isinstance(field.storage, ContentAddressedStorage)
+        }
+    )
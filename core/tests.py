@@ -1,3 +1,264 @@
-from django.test import TestCase
+import json
+import os
+import shutil
+import tempfile
+from datetime import date
+from io import StringIO
 
-# Create your tests here.
+from django.contrib.auth.models import Group, Permission
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from authentication.models import PasswordResetToken
+from core.models import (
+    Blog,
+    BloodDonation,
+    BloodDonationInterest,
+    BloodDonor,
+    Event,
+    PDFDocument,
+    User,
+)
+from core.storage import is_content_addressed, media_storage
+
+
+class HotQueryIndexTests(TestCase):
+    """EXPLAIN the hot filter/ordering queries and check they hit an index."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email="donor@example.com")
+
+    def assertUsesIndex(self, queryset, index_name):
+        if connection.vendor != "sqlite":
+            self.skipTest("plan format checked against SQLite only")
+        plan = queryset.explain()
+        self.assertIn(index_name, plan, f"{index_name} not used:\n{plan}")
+
+    def test_donations_by_user_and_date(self):
+        self.assertUsesIndex(
+            BloodDonation.objects.filter(
+                user=self.user, donation_date__lt=date.today()
+            ).order_by("-donation_date"),
+            "donation_user_date_idx",
+        )
+
+    def test_due_interests(self):
+        self.assertUsesIndex(
+            BloodDonationInterest.objects.filter(
+                available_date__lte=date.today(), donation__isnull=True
+            ),
+            "interest_donation_avail_idx",
+        )
+
+    def test_upcoming_events(self):
+        self.assertUsesIndex(Event.objects.upcoming(), "event_date_active_idx")
+
+    def test_published_blogs(self):
+        self.assertUsesIndex(
+            Blog.objects.filter(published=True).order_by("-created_at"),
+            "blog_created_published_idx",
+        )
+
+    def test_donors_newest_first(self):
+        self.assertUsesIndex(BloodDonor.objects.all()[:50], "donor_created_idx")
+
+    def test_donors_by_blood_group(self):
+        self.assertUsesIndex(
+            BloodDonor.objects.filter(blood_group="O-").order_by(),
+            "donor_group_last_donated_idx",
+        )
+
+    def test_expired_reset_tokens(self):
+        self.assertUsesIndex(
+            PasswordResetToken.objects.filter(expires_at__lt=timezone.now()),
+            "reset_token_expires_idx",
+        )
+
+
+class ChunkedDumpLoadTests(TestCase):
+    def test_round_trip_and_resume(self):
+        user = User.objects.create_user(email="donor@example.com", blood_group="O+")
+        for i in range(5):
+            BloodDonation.objects.create(
+                user=user, blood_group="O+", donation_date=date(2024, 1 + i, 1)
+            )
+        blog = Blog.objects.create(title="Post", content="বাংলা", published=True)
+        editors = Group.objects.create(name="Editors")
+        editors.permissions.add(Permission.objects.get(codename="change_blog"))
+        user.groups.add(editors)
+        user.user_permissions.add(Permission.objects.get(codename="view_blooddonor"))
+
+        with tempfile.TemporaryDirectory() as root:
+            out = StringIO()
+            call_command("dump_chunks", root, "--chunk-size", "2", stdout=out)
+            donation_dir = os.path.join(root, "core.blooddonation")
+            self.assertEqual(len(os.listdir(donation_dir)), 3)
+            # a second run finds nothing left to dump
+            call_command("dump_chunks", root, stdout=out)
+            self.assertEqual(len(os.listdir(donation_dir)), 3)
+
+            BloodDonation.objects.all().delete()
+            Blog.objects.all().delete()
+            User.objects.all().delete()
+            Group.objects.all().delete()
+
+            call_command("load_chunks", root, stdout=out)
+            # already-loaded chunks are skipped on a re-run
+            call_command("load_chunks", root, stdout=out)
+
+            # a crash between a chunk's commit and its progress write
+            progress_path = os.path.join(root, "load-progress.json")
+            with open(progress_path) as f:
+                progress = json.load(f)
+            progress["loaded"] = progress["loaded"][:-3]
+            with open(progress_path, "w") as f:
+                json.dump(progress, f)
+            call_command("load_chunks", root, stdout=out)
+
+        self.assertEqual(BloodDonation.objects.filter(user_id=user.id).count(), 5)
+        restored = Blog.objects.get(pk=blog.pk)
+        self.assertEqual(restored.content, "বাংলা")
+        self.assertEqual(restored.created_at, blog.created_at)
+        restored_user = User.objects.get(pk=user.pk)
+        self.assertEqual(restored_user.password, user.password)
+        self.assertEqual(list(restored_user.groups.all()), [editors])
+        self.assertTrue(restored_user.has_perm("core.change_blog"))
+        self.assertTrue(restored_user.has_perm("core.view_blooddonor"))
+
+
+class ContentAddressedStorageTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        settings_override = override_settings(
+            MEDIA_ROOT=self.media_root, BACKGROUND_TASKS_EAGER=True
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def test_identical_uploads_are_stored_once(self):
+        first = PDFDocument.objects.create(
+            file=SimpleUploadedFile("report.PDF", b"%PDF-1.4 same bytes")
+        )
+        second = PDFDocument.objects.create(
+            file=SimpleUploadedFile("report (1).pdf", b"%PDF-1.4 same bytes")
+        )
+        other = PDFDocument.objects.create(
+            file=SimpleUploadedFile("other.pdf", b"%PDF-1.4 other bytes")
+        )
+        self.assertEqual(first.file.name, second.file.name)
+        self.assertNotEqual(first.file.name, other.file.name)
+        self.assertTrue(is_content_addressed(first.file.name))
+        self.assertTrue(first.file.name.startswith("pdfs/"))
+        self.assertTrue(first.file.name.endswith(".pdf"))
+        self.assertEqual(len(os.listdir(os.path.dirname(first.file.path))), 1)
+
+        # deleting one row must not take the shared file with it
+        first.file.delete(save=False)
+        self.assertTrue(media_storage().exists(second.file.name))
+
+    def test_gc_removes_only_old_unreferenced_files(self):
+        storage = media_storage()
+        kept = PDFDocument.objects.create(
+            file=SimpleUploadedFile("kept.pdf", b"kept")
+        ).file.name
+        orphan = storage.save("pdfs/orphan.pdf", ContentFile(b"orphan"))
+        young = storage.save("pdfs/young.pdf", ContentFile(b"young"))
+        outside = storage.save("documents/orphan.pdf", ContentFile(b"other app"))
+        old = os.path.getmtime(storage.path(orphan)) - 7200
+        os.utime(storage.path(orphan), (old, old))
+
+        out = StringIO()
+        call_command("gc_media", "--dry-run", stdout=out)
+        self.assertIn(f"would delete {orphan}", out.getvalue())
+        self.assertTrue(storage.exists(orphan))
+
+        call_command("gc_media", stdout=StringIO())
+        self.assertFalse(storage.exists(orphan))
+        for name in (kept, young, outside):
+            self.assertTrue(storage.exists(name), name)
+
+    def test_reused_file_is_protected_from_gc(self):
+        storage = media_storage()
+        name = storage.save("pdfs/a.pdf", ContentFile(b"same bytes"))
+        old = os.path.getmtime(storage.path(name)) - 7200
+        os.utime(storage.path(name), (old, old))
+
+        # an upload of the same bytes whose row isn't committed yet
+        self.assertEqual(storage.save("pdfs/b.pdf", ContentFile(b"same bytes")), name)
+        call_command("gc_media", stdout=StringIO())
+        self.assertTrue(storage.exists(name))
+
+
+class MediaServingTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        os.makedirs(os.path.join(self.media_root, "pdfs"))
+        with open(os.path.join(self.media_root, "pdfs", "guide.pdf"), "wb") as f:
+            f.write(b"0123456789")
+        self.url = reverse("media", args=["pdfs/guide.pdf"])
+
+    def body(self, response):
+        return b"".join(response.streaming_content)
+
+    def test_full_file_with_validators(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.body(response), b"0123456789")
+        self.assertEqual(response["Content-Type"], "application/pdf")
+        self.assertEqual(response["Accept-Ranges"], "bytes")
+
+        cached = self.client.get(self.url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(cached.status_code, 304)
+
+    def test_byte_ranges(self):
+        response = self.client.get(self.url, HTTP_RANGE="bytes=2-5")
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(self.body(response), b"2345")
+        self.assertEqual(response["Content-Range"], "bytes 2-5/10")
+        self.assertEqual(response["Content-Length"], "4")
+
+        response = self.client.get(self.url, HTTP_RANGE="bytes=-3")
+        self.assertEqual(self.body(response), b"789")
+        response = self.client.get(self.url, HTTP_RANGE="bytes=8-")
+        self.assertEqual(self.body(response), b"89")
+
+        response = self.client.get(self.url, HTTP_RANGE="bytes=20-")
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response["Content-Range"], "bytes */10")
+
+        # a range against an outdated copy gets the whole current file
+        response = self.client.get(
+            self.url, HTTP_RANGE="bytes=2-5", HTTP_IF_RANGE='"stale"'
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_content_addressed_files_are_immutable(self):
+        name = media_storage().save("pdfs/guide.pdf", ContentFile(b"%PDF"))
+        response = self.client.get(reverse("media", args=[name]))
+        digest = os.path.splitext(os.path.basename(name))[0]
+        self.assertEqual(response["ETag"], f'"{digest}"')
+        self.assertIn("immutable", response["Cache-Control"])
+
+    @override_settings(
+        MEDIA_SENDFILE="x-accel-redirect", MEDIA_ACCEL_REDIRECT_PREFIX="/internal/"
+    )
+    def test_delegates_to_front_end_server(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response["X-Accel-Redirect"], "/internal/pdfs/guide.pdf")
+        self.assertEqual(response.content, b"")
+
+    def test_outside_media_root_is_not_found(self):
+        self.assertEqual(self.client.get("/media/../manage.py").status_code, 404)
+        self.assertEqual(self.client.get("/media/pdfs/").status_code, 404)
+        self.assertEqual(self.client.post(self.url).status_code, 405)
@@ -0,0 +1,149 @@
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from django.views.decorators.http import require_safe
+
+from .storage import CONTENT_NAME_RE
+
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def parse_range(header, size):
+    """
+    (start, end) inclusive for a single-range ``Range`` header, None to send
+    the whole file (no/malformed/multi-range header), or "unsatisfiable".
+    """
+    match = RANGE_RE.match((header or "").strip())
+    if not match or not any(match.groups()):
+        return None
+    first, last = match.groups()
+    if not first:
+        # suffix range: the last N bytes
+        length = int(last)
+        if length == 0:
+            return "unsatisfiable"
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        return "unsatisfiable"
+    return start, end
+
+
+class RangeFile:
+    """Read-only view of ``length`` bytes of ``file`` starting at ``start``."""
+
+    def __init__(self, file, start, length):
+        self.file = file
+        self.remaining = length
+        file.seek(start)
+
+    def read(self, size=-1):
+        if self.remaining <= 0:
+            return b""
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def close(self):
+        self.file.close()
+
+
+def media_etag(name, stat):
+    # content-addressed names carry the file's SHA-256: a true strong validator
+    if CONTENT_NAME_RE.search(name):
+        return quote_etag(os.path.splitext(os.path.basename(name))[0])
+    return quote_etag(f"{stat.st_mtime_ns:x}-{stat.st_size:x}")
+
+
+@require_safe
+def serve_media(request, path):
+    """
+    Serve a file under MEDIA_ROOT with ETag/Last-Modified revalidation and
+    single byte-range requests, so large PDFs open progressively.
+
+    With ``MEDIA_SENDFILE`` set the body is left to the front-end server
+    (``X-Sendfile`` for Apache/Passenger, ``X-Accel-Redirect`` for nginx),
+    which also handles ranges; otherwise the file is streamed in chunks.
+    """
+    try:
+        full_path = safe_join(settings.MEDIA_ROOT, path)
+    except SuspiciousFileOperation:
+        raise Http404("File not found.")
+    try:
+        stat = os.stat(full_path)
+    except OSError:
+        raise Http404("File not found.")
+    if not os.path.isfile(full_path):
+        raise Http404("File not found.")
+
+    name = path.replace(os.sep, "/")
+    etag = media_etag(name, stat)
+    last_modified = int(stat.st_mtime)
+    content_type, encoding = mimetypes.guess_type(full_path)
+    content_type = content_type or "application/octet-stream"
+
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is not None:
+        return _add_validators(response, name, etag, last_modified)
+
+    backend = settings.MEDIA_SENDFILE
+    if backend == "x-sendfile":
+        response = HttpResponse(content_type=content_type)
+        response["X-Sendfile"] = full_path
+    elif backend == "x-accel-redirect":
+        response = HttpResponse(content_type=content_type)
+        response["X-Accel-Redirect"] = settings.MEDIA_ACCEL_REDIRECT_PREFIX + quote(
+            name
+        )
+    else:
+        response = _file_response(request, full_path, stat.st_size, etag, content_type)
+    if encoding:
+        response.headers["Content-Encoding"] = encoding
+    response["Accept-Ranges"] = "bytes"
+    return _add_validators(response, name, etag, last_modified)
+
+
+def _file_response(request, full_path, size, etag, content_type):
+    byte_range = None
+    if_range = request.headers.get("If-Range")
+    # a stale If-Range (the file changed) asks for the whole new file
+    if not if_range or if_range == etag:
+        byte_range = parse_range(request.headers.get("Range"), size)
+
+    if byte_range == "unsatisfiable":
+        response = HttpResponse(status=416)
+        response["Content-Range"] = f"bytes */{size}"
+        return response
+
+    file = open(full_path, "rb")
+    if byte_range is None:
+        return FileResponse(file, content_type=content_type)
+
+    start, end = byte_range
+    length = end - start + 1
+    response = FileResponse(
+        RangeFile(file, start, length), status=206, content_type=content_type
+    )
+    response["Content-Length"] = str(length)
+    response["Content-Range"] = f"bytes {start}-{end}/{size}"
+    return response
+
+
+def _add_validators(response, name, etag, last_modified):
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(last_modified)
+    if CONTENT_NAME_RE.search(name):
+        # the name changes whenever the content does
+        response["Cache-Control"] = "public, max-age=31536000, immutable"
+    return response
@@ -1,5 +1,10 @@
 # dump_sqlite.py
+# Shortcut for `python manage.py dump_chunks [dir]` (default "dump/"), which
+# replaced the old `dumpdata > data.json`; restore on the target database with
+#   python manage.py load_chunks dump/
 import os
+import sys
+
 import django
 from django.core.management import call_command
 
@@ -12,19 +17,5 @@ os.environ["PYTHONIOENCODING"] = "utf-8"
 
 django.setup()
 
-with open("data.json", "w", encoding="utf-8", newline="\n") as f:
-    call_command(
-        "dumpdata",
-        use_natural_primary_keys=True,
-        use_natural_foreign_keys=True,
-        exclude=[
-            "contenttypes",
-            "auth.permission",
-            "admin.logentry",
-            "sessions.session",
-        ],
-        indent=2,
-        stdout=f,
-    )
-
-print("Wrote data.json")
+output = sys.argv[1] if len(sys.argv) > 1 else "dump"
+call_command("dump_chunks", output)
@@ -1,5 +1,5 @@
 from pathlib import Path
-from decouple import config
+from decouple import Csv, config
 from datetime import timedelta
 
 
@@ -41,18 +41,30 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # first, so its timings cover the other middleware too
+    "api.metrics.RequestMetricsMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
-    "whitenoise.middleware.WhiteNoiseMiddleware",
+    # async-capable wrappers of whitenoise/social_django (core/middleware.py)
+    "core.middleware.StaticFilesMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
-    "social_django.middleware.SocialAuthExceptionMiddleware",
+    "core.middleware.SocialAuthExceptionMiddleware",
 ]
 
+# Per-route latency/query histograms (api/metrics.py), scraped from
+# /api/admin/metrics/; Server-Timing headers expose them to the browser too
+METRICS_ENABLED = config("METRICS_ENABLED", default=True, cast=bool)
+METRICS_SERVER_TIMING = config("METRICS_SERVER_TIMING", default=DEBUG, cast=bool)
+
+# Serve the public read-only endpoints with async views (api/async_views.py).
+# Turn on when running asgi.py under uvicorn/daphne; leave off for Passenger
+ASYNC_PUBLIC_VIEWS = config("ASYNC_PUBLIC_VIEWS", default=False, cast=bool)
+
 CORS_ALLOWED_ORIGINS = [
     "https://sandhanishsmcu.com",
     "https://www.sandhanishsmcu.com",
@@ -110,6 +122,54 @@ else:
         }
     }
 
+CACHES = {
+    "default": {
+        "BACKEND": config(
+            "CACHE_BACKEND", default="django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": config("CACHE_LOCATION", default="suhrawardy-medical"),
+    }
+}
+
+# Rendered JSON of public content endpoints (see api/cache.py). LocMemCache is
+# per process, so use a shared backend (file/db/redis) when running several
+# workers; the timeout bounds how stale another worker's copy can get.
+CONTENT_CACHE_ALIAS = "default"
+CONTENT_CACHE_TIMEOUT = config("CONTENT_CACHE_TIMEOUT", default=300, cast=int)
+
+# Per blood group donor buckets used by blood request matching (api/matching.py)
+DONOR_MATCH_INDEX_TIMEOUT = config("DONOR_MATCH_INDEX_TIMEOUT", default=3600, cast=int)
+
+# Rows fetched per query by the streaming admin exports (see api/exports.py)
+EXPORT_CHUNK_SIZE = config("EXPORT_CHUNK_SIZE", default=2000, cast=int)
+
+# Rows per INSERT for bulk donor imports (see api/imports.py)
+DONOR_IMPORT_BATCH_SIZE = config("DONOR_IMPORT_BATCH_SIZE", default=500, cast=int)
+
+# Rows per transaction in ConvertDueInterestsView (see api/conversions.py)
+DONATION_CONVERSION_BATCH_SIZE = config(
+    "DONATION_CONVERSION_BATCH_SIZE", default=1000, cast=int
+)
+
+# Full-text search index: "auto" picks FTS5 (SQLite) or FULLTEXT (MySQL),
+# falling back to an in-process index; see api/search.py
+SEARCH_BACKEND = config("SEARCH_BACKEND", default="auto")
+
+# Responsive copies of uploaded images (see api/images.py)
+IMAGE_VARIANT_WIDTHS = config(
+    "IMAGE_VARIANT_WIDTHS", default="320,640,1280", cast=Csv(cast=int)
+)
+IMAGE_VARIANT_FORMATS = config("IMAGE_VARIANT_FORMATS", default="webp,jpeg", cast=Csv())
+
+# Local directory holding API uploads until a worker stores them (api/uploads.py)
+UPLOAD_STAGING_DIR = config(
+    "UPLOAD_STAGING_DIR", default=str(BASE_DIR / "upload_staging")
+)
+
+# Thread pool running work queued with api.tasks.submit; eager runs it inline
+BACKGROUND_TASK_WORKERS = config("BACKGROUND_TASK_WORKERS", default=2, cast=int)
+BACKGROUND_TASKS_EAGER = config("BACKGROUND_TASKS_EAGER", default=False, cast=bool)
+
 AUTH_USER_MODEL = "core.User"
 
 AUTHENTICATION_BACKENDS = [
@@ -127,8 +187,14 @@ REST_FRAMEWORK = {
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticatedOrReadOnly",
     ],
+    "DEFAULT_PAGINATION_CLASS": "api.pagination.KeysetCursorPagination",
 }
 
+# Cursor pagination for list endpoints (see api/pagination.py)
+API_PAGE_SIZE = config("API_PAGE_SIZE", default=50, cast=int)
+API_MAX_PAGE_SIZE = config("API_MAX_PAGE_SIZE", default=500, cast=int)
+API_PAGINATE_BY_DEFAULT = config("API_PAGINATE_BY_DEFAULT", default=False, cast=bool)
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=180),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=7),
@@ -144,7 +210,11 @@ SOCIAL_AUTH_FACEBOOK_KEY = config("FACEBOOK_APP_ID", default="")
 SOCIAL_AUTH_FACEBOOK_SECRET = config("FACEBOOK_APP_SECRET", default="")
 SOCIAL_AUTH_JSONFIELD_ENABLED = True
 
-EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
+# e.g. django.core.mail.backends.filebased.EmailBackend + EMAIL_FILE_PATH locally
+EMAIL_BACKEND = config(
+    "EMAIL_BACKEND", default="django.core.mail.backends.smtp.EmailBackend"
+)
+EMAIL_FILE_PATH = config("EMAIL_FILE_PATH", default=str(BASE_DIR / "sent_emails"))
 EMAIL_HOST = config("EMAIL_HOST", default="smtp.gmail.com")
 EMAIL_PORT = config("EMAIL_PORT", default=587, cast=int)
 EMAIL_USE_TLS = config("EMAIL_USE_TLS", default=True, cast=bool)
@@ -153,6 +223,22 @@ EMAIL_HOST_USER = config("EMAIL_HOST_USER", default="")
 EMAIL_HOST_PASSWORD = config("EMAIL_HOST_PASSWORD", default="")
 DEFAULT_FROM_EMAIL = config("DEFAULT_FROM_EMAIL", default="")
 
+# Outbound mail queue (api/mail.py): batch size per connection, retry backoff
+# in seconds (doubling up to the max), attempts before giving up, and how long
+# a "sending" row may stay claimed before another sender takes it over
+MAIL_QUEUE_BATCH_SIZE = config("MAIL_QUEUE_BATCH_SIZE", default=50, cast=int)
+MAIL_RETRY_DELAY = config("MAIL_RETRY_DELAY", default=60, cast=int)
+MAIL_RETRY_MAX_DELAY = config("MAIL_RETRY_MAX_DELAY", default=3600, cast=int)
+MAIL_MAX_ATTEMPTS = config("MAIL_MAX_ATTEMPTS", default=6, cast=int)
+MAIL_CLAIM_TIMEOUT = config("MAIL_CLAIM_TIMEOUT", default=600, cast=int)
+
+# Notify eligible donors of staff-approved blood requests and new events
+# (api/notifications.py), through the mail queue's batch size and retry
+# settings. SMS_BACKEND is a class like api.sms.ConsoleBackend (local) or a
+# provider's; empty sends no SMS
+DONOR_NOTIFICATIONS = config("DONOR_NOTIFICATIONS", default=False, cast=bool)
+SMS_BACKEND = config("SMS_BACKEND", default="")
+
 FRONTEND_RESET_URL = config(
     "FRONTEND_RESET_URL", default="http://localhost:8080/reset-password"
 )
@@ -179,6 +265,26 @@ STATICFILES_STORAGE = "whitenoise.storage.CompressedManifestStaticFilesStorage"
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
+# core.views.serve_media: Django serves media itself (byte ranges, ETags) when
+# SERVE_MEDIA is on, handing the body to the web server if MEDIA_SENDFILE is
+# "x-sendfile" (Apache/Passenger) or "x-accel-redirect" (nginx, which maps
+# MEDIA_ACCEL_REDIRECT_PREFIX to an internal location aliasing MEDIA_ROOT)
+SERVE_MEDIA = config("SERVE_MEDIA", default=DEBUG, cast=bool)
+MEDIA_SENDFILE = config("MEDIA_SENDFILE", default="")
+MEDIA_ACCEL_REDIRECT_PREFIX = config(
+    "MEDIA_ACCEL_REDIRECT_PREFIX", default="/protected-media/"
+)
+
+# "media" backs Image, About.image and PDFDocument.file: identical uploads are
+# stored once under their SHA-256 (see core/storage.py, `manage.py gc_media`)
+STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {
+        "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"
+    },
+    "media": {"BACKEND": "core.storage.ContentAddressedStorage"},
+}
+
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 UNFOLD = {